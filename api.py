@@ -5,15 +5,56 @@ API module for Weather Dashboard.
 
 Provides functions to interact with the OpenWeatherMap API:
 - search_city_options(query): Retrieve a list of matching cities with formatted display names and coordinates.
-- fetch_weather_by_coords(lat, lon): Fetch current weather data (temperature, humidity, wind, sunrise/sunset, etc.).
-- fetch_5day_forecast_by_coords(lat, lon): Retrieve 5-day forecast data and summarize it into daily entries (min/max temps, humidity, wind, visibility).
+- fetch_weather_by_coords(lat, lon): Fetch current weather as a WeatherReading (temperature, humidity, wind, sunrise/sunset, etc.).
+- fetch_5day_forecast_by_coords(lat, lon): Retrieve 5-day forecast data and summarize it into daily ForecastDay entries (min/max temps, humidity, wind, visibility).
+- fetch_weather_many(coords): Fetch current weather for many coordinates concurrently, streaming results as they finish.
+- get_last_known_weather(lat, lon) / get_last_known_forecast(lat, lon): Last cached result and its age,
+  even if expired, for stale-while-revalidate rendering and offline fallback.
+
+All requests go through one pooled keep-alive session (see get_session), with
+jittered exponential retries for transient failures:
+- warm_up_connections(): Open connections to the API hosts ahead of the first real request.
+- get_connection_stats(): Report request/connection counters for the pooled session.
+
+Every HTTP attempt spends a token from a client-side rate limiter (see rate_limiter)
+with priority lanes, so interactive calls go ahead of background refreshes and
+low-priority calls are dropped with RateLimitedError instead of exceeding the quota.
+A per-endpoint circuit breaker (see get_circuit_states) fails fast with
+CircuitOpenError while the API is down, probing recovery with one request.
+Per-attempt timeouts adapt to each endpoint's recent latencies (see get_latency_stats),
+and an attempt still unanswered at the observed p95 is hedged with one duplicate
+request when a spare rate-limit token is available; the first response wins.
+
+Current weather and forecast payloads are cached per coordinate (see response_cache)
+with per-endpoint TTLs, so repeated refreshes and tab switches skip the network.
+City suggestions are answered from a persisted prefix index (see geocode_index)
+whenever it already holds enough matches, and the API only fills the gaps.
+If a bundled offline city index exists (see offline_geocoder.py), it is searched
+first and the network is used only when it has no match at all.
 """
 
 import os                             # For accessing environment variables
+import random                         # For jittering retry backoff delays
+import threading                      # For guarding lazy session creation
+import time                           # For sleeping between retry attempts
+import logging                        # For reporting retries and warm-up failures
+import atexit                         # For persisting the response cache on exit
 import requests                       # To make HTTP requests to the weather API
-from datetime import datetime         # For formatting UNIX timestamps into readable times
-import collections                    # For grouping forecast data by day
+from requests.adapters import HTTPAdapter    # Connection-pooling transport adapter
+import collections                    # For grouping batch coordinates by cache key
+from concurrent.futures import ThreadPoolExecutor, as_completed    # Worker pool for batch fetches
+from concurrent.futures import wait, FIRST_COMPLETED, TimeoutError as FuturesTimeout    # Hedged requests
 from dotenv import load_dotenv        # To load API keys from a .env file
+from cache import ResponseCache       # TTL + LRU cache for API payloads
+from geocache import GeocodeIndex     # Prefix index of previously seen city suggestions
+from offline_geocoder import OfflineGeocoder    # Memory-mapped bulk city index
+from resilience import SingleFlight   # Coalesces concurrent identical requests
+from resilience import RateLimiter, PRIORITY_INTERACTIVE, PRIORITY_BACKGROUND, PRIORITY_PREFETCH    # Quota budget
+from resilience import CircuitBreaker, CLOSED, OPEN, HALF_OPEN    # Per-endpoint fail-fast
+from resilience import LatencyTracker    # Per-endpoint latency window for adaptive timeouts
+from urllib.parse import urlsplit     # For naming circuit breakers by host and path
+from models import WeatherReading    # Typed record returned to the UI
+from forecast_engine import summarize_days    # Vectorized daily forecast summaries
 
 # Load environment variables from .env file
 load_dotenv()
@@ -21,39 +62,517 @@ load_dotenv()
 # Fetch the OpenWeatherMap API key from environment variables
 API_KEY = os.getenv("OPENWEATHER_API_KEY")
 
+# Optional base URL replacing api.openweathermap.org, e.g. a local stand-in (see owm_stub.py)
+API_BASE = os.getenv("WEATHER_API_BASE", "").rstrip("/")
+
+# OpenWeatherMap endpoints
+GEO_DIRECT_URL = (API_BASE or "http://api.openweathermap.org") + "/geo/1.0/direct"
+WEATHER_URL = (API_BASE or "http://api.openweathermap.org") + "/data/2.5/weather"
+FORECAST_URL = (API_BASE or "https://api.openweathermap.org") + "/data/2.5/forecast"
+
+# HTTP session settings (pool size and retry count can be overridden via .env)
+POOL_SIZE = int(os.getenv("WEATHER_POOL_SIZE", "10"))        # Max keep-alive connections kept per host
+MAX_RETRIES = int(os.getenv("WEATHER_MAX_RETRIES", "2"))     # Extra attempts after the first failure
+REQUEST_TIMEOUT = 5                                          # Upper bound (seconds) for a single attempt
+MIN_TIMEOUT = float(os.getenv("WEATHER_MIN_TIMEOUT", "1.0"))  # Lower bound for the adaptive timeout
+BACKOFF_BASE = 0.3                                           # First retry waits up to this many seconds
+BACKOFF_MAX = 4.0                                            # Upper bound for any single backoff delay
+RETRY_STATUSES = {429, 500, 502, 503, 504}                   # Transient HTTP statuses worth retrying
+
+# Hosts contacted at startup so the first search/refresh skips the TCP/TLS handshake
+WARMUP_URLS = (API_BASE + "/",) if API_BASE else (
+    "http://api.openweathermap.org/",
+    "https://api.openweathermap.org/",
+)
+
+# Shared session, created lazily on first use
+_session = None
+_session_lock = threading.Lock()
+
+# Concurrent identical GETs (same URL and params) share one HTTP call
+request_coalescer = SingleFlight()
+
+# Client-side call budget (free tier allows 60 calls/minute); every HTTP attempt spends one token
+RATE_LIMIT_PER_MINUTE = int(os.getenv("WEATHER_RATE_LIMIT", "60"))
+RATE_LIMIT_BURST = int(os.getenv("WEATHER_RATE_BURST", "10"))
+rate_limiter = RateLimiter(rate_per_minute=RATE_LIMIT_PER_MINUTE, burst=RATE_LIMIT_BURST)
+
+# Circuit breaker settings: open after this many consecutive failed requests, probe again after the cooldown
+BREAKER_FAILURES = int(os.getenv("WEATHER_BREAKER_FAILURES", "3"))
+BREAKER_COOLDOWN = float(os.getenv("WEATHER_BREAKER_COOLDOWN", "30"))
+
+# One breaker per endpoint (host + path), created on first use
+_circuit_breakers = {}
+_circuit_lock = threading.Lock()
+_circuit_hook = None
+
+# Adaptive timeouts: each endpoint's attempts time out at 3x its recent p99 (within
+# [MIN_TIMEOUT, REQUEST_TIMEOUT]); set WEATHER_HEDGING=0 to never send hedged duplicates
+HEDGE_REQUESTS = os.getenv("WEATHER_HEDGING", "1") != "0"
+_latency_trackers = {}
+_latency_lock = threading.Lock()
+
+# Threads running hedged attempts, created on first use
+_hedge_pool = None
+_hedge_pool_lock = threading.Lock()
+
+# Seconds each endpoint's payload stays fresh. OpenWeatherMap refreshes current
+# conditions about every 10 minutes and issues forecasts every 3 hours (at an
+# unknown phase relative to our fetch, hence the shorter forecast TTL).
+CACHE_TTLS = {
+    "weather": 600,
+    "forecast": 3600,
+}
+
+# Response cache shared by all callers; set WEATHER_CACHE_FILE to "" to keep it in memory only
+CACHE_FILE = os.getenv("WEATHER_CACHE_FILE", os.path.join("data", "api_cache.json"))
+response_cache = ResponseCache(
+    max_entries=int(os.getenv("WEATHER_CACHE_SIZE", "256")),
+    path=CACHE_FILE or None
+)
+response_cache.load()
+atexit.register(response_cache.save)
+
+# Worker threads used by fetch_weather_many (kept small to stay within the API quota)
+BATCH_WORKERS = int(os.getenv("WEATHER_BATCH_WORKERS", "8"))
+
+# Number of city suggestions requested from (and served instead of) the geocoding API
+SUGGESTION_LIMIT = 5
+
+# Prefix index of every geocoding answer seen, persisted between runs
+GEOCODE_CACHE_FILE = os.getenv("WEATHER_GEOCODE_CACHE_FILE", os.path.join("data", "geocode_cache.json"))
+geocode_index = GeocodeIndex(path=GEOCODE_CACHE_FILE or None)
+geocode_index.load()
+atexit.register(geocode_index.save)
+
+# Optional offline city index built with `python offline_geocoder.py city.list.json`
+OFFLINE_INDEX_FILE = os.getenv("WEATHER_CITY_INDEX", os.path.join("data", "city_index.bin"))
+offline_geocoder = OfflineGeocoder.open_if_exists(OFFLINE_INDEX_FILE)
+
 
 class APIError(Exception):
     """Custom exception for API-related errors."""
     pass
 
 
-def _get_json(url, params=None):
+class RateLimitedError(APIError):
+    """Raised when a low-priority call is dropped to stay within the API quota."""
+
+    def __init__(self, message, priority=None):
+        super().__init__(message)
+        self.priority = priority    # rate_limiter lane the dropped call was waiting in
+
+
+class CircuitOpenError(APIError):
+    """Raised without contacting the network while an endpoint's circuit breaker is open."""
+    pass
+
+
+def get_session():
+
+    """
+    Return the shared requests.Session, creating it on first use.
+
+    The session mounts a pooled HTTPAdapter for both schemes so connections are
+    kept alive and reused across searches, refreshes and forecast fetches.
+    Retries are handled by _get_json (with jitter), so the adapter itself never retries.
+
+    Returns:
+        requests.Session: The module-wide pooled session.
+    """
+
+    global _session
+
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=POOL_SIZE, max_retries=0)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+
+            # Ask for compressed payloads and keep the socket open between calls
+            session.headers.update({
+                "Accept-Encoding": "gzip, deflate",
+                "Connection": "keep-alive",
+            })
+            _session = session
+
+    return _session
+
+
+def warm_up_connections(urls=WARMUP_URLS):
+
+    """
+    Open a pooled connection to each API host so later requests reuse it.
+
+    Failures are logged and ignored: warm-up is only an optimization. Meant to be
+    run once at startup on a background thread.
+
+    Args:
+        urls (iterable of str): Host URLs to contact with a lightweight HEAD request.
+    """
+
+    session = get_session()
+    for url in urls:
+        try:
+            session.head(url, timeout=REQUEST_TIMEOUT)
+        except requests.RequestException as e:
+            logging.warning("Connection warm-up for %s failed: %s", url, e)
+
+
+def get_connection_stats():
+
+    """
+    Summarize connection reuse across the pooled session.
+
+    Returns:
+        dict: 'requests' sent, 'connections' opened, and 'reused' requests that
+              rode on an existing keep-alive connection (live pools only).
+    """
+
+    pools = get_session().get_adapter("https://").poolmanager.pools
+    total_requests = 0
+    total_connections = 0
+    for key in pools.keys():
+        pool = pools.get(key)
+        if pool is None:
+            continue
+        total_requests += pool.num_requests
+        total_connections += pool.num_connections
+
+    return {
+        "requests": total_requests,
+        "connections": total_connections,
+        "reused": max(total_requests - total_connections, 0),
+    }
+
+
+def _on_circuit_change(endpoint, old_state, new_state):
+
+    """
+    Log circuit breaker transitions and forward them to the metrics hook, if any.
+    """
+
+    logging.warning("Circuit for %s: %s -> %s", endpoint, old_state, new_state)
+    if _circuit_hook is not None:
+        _circuit_hook(endpoint, old_state, new_state)
+
+
+def set_circuit_metrics_hook(hook):
+
+    """
+    Register hook(endpoint, old_state, new_state), called on every breaker transition.
+    Pass None to remove it.
+    """
+
+    global _circuit_hook
+    _circuit_hook = hook
+
+
+def _endpoint_name(url):
+
+    """
+    Return the endpoint name (host + path) used to key breakers and latency trackers.
+    """
+
+    parts = urlsplit(url)
+    return parts.netloc + parts.path
+
+
+def get_circuit_breaker(url):
+
+    """
+    Return the CircuitBreaker for url's endpoint (host + path), creating it on first use.
+    """
+
+    endpoint = _endpoint_name(url)
+    with _circuit_lock:
+        breaker = _circuit_breakers.get(endpoint)
+        if breaker is None:
+            breaker = _circuit_breakers[endpoint] = CircuitBreaker(
+                endpoint,
+                failure_threshold=BREAKER_FAILURES,
+                reset_timeout=BREAKER_COOLDOWN,
+                on_state_change=_on_circuit_change
+            )
+    return breaker
+
+
+def get_circuit_states():
+
+    """
+    Return {endpoint: snapshot dict} for every endpoint contacted so far.
+    Each snapshot holds 'state' (closed/open/half_open), 'failures', 'rejected' and 'retry_in'.
+    """
+
+    with _circuit_lock:
+        breakers = list(_circuit_breakers.values())
+    return {b.name: b.snapshot() for b in breakers}
+
+
+def get_latency_tracker(url):
+
+    """
+    Return the LatencyTracker for url's endpoint (host + path), creating it on first use.
+    """
+
+    endpoint = _endpoint_name(url)
+    with _latency_lock:
+        tracker = _latency_trackers.get(endpoint)
+        if tracker is None:
+            tracker = _latency_trackers[endpoint] = LatencyTracker(
+                endpoint,
+                min_timeout=MIN_TIMEOUT,
+                max_timeout=REQUEST_TIMEOUT
+            )
+    return tracker
+
+
+def get_latency_stats():
+
+    """
+    Return {endpoint: snapshot dict} for every endpoint contacted so far.
+    Each snapshot holds 'samples', 'p50'/'p95'/'p99' (None until warmed up), the current
+    'timeout', and 'timeouts', 'hedged' and 'hedge_wins' counters.
+    """
+
+    with _latency_lock:
+        trackers = list(_latency_trackers.values())
+    return {t.name: t.snapshot() for t in trackers}
+
+
+def _get_hedge_pool():
+
+    """
+    Return the thread pool that runs hedged attempts, creating it on first use.
+    """
+
+    global _hedge_pool
+
+    with _hedge_pool_lock:
+        if _hedge_pool is None:
+            _hedge_pool = ThreadPoolExecutor(max_workers=POOL_SIZE * 2, thread_name_prefix="hedge")
+    return _hedge_pool
+
+
+def _close_response(future):
+
+    """
+    Done-callback that closes the response of a hedged attempt that lost the race.
+    """
+
+    if not future.cancelled() and future.exception() is None:
+        future.result().close()
+
+
+def _send(session, url, params, timeout, tracker):
+
+    """
+    Send one attempt (hedged if the endpoint is slow) and record the latency the caller saw.
+
+    Recording the answered latency rather than each request's keeps the rare slow
+    responses that hedging absorbed from inflating the endpoint's p95/p99.
+    A timed-out attempt is recorded at the timeout it hit.
+
+    Args:
+        session (requests.Session): Pooled session to send on.
+        url (str): Endpoint URL.
+        params (dict, optional): Query parameters to include in the request.
+        timeout (float): Per-request timeout in seconds.
+        tracker (LatencyTracker): The endpoint's latency window.
+
+    Returns:
+        requests.Response: The first response received.
+
+    Raises:
+        requests.RequestException: If no request produced a response.
+    """
+
+    start = time.monotonic()
+    try:
+        response = _hedged_get(session, url, params, timeout, tracker)
+    except requests.Timeout:
+        tracker.record(timeout, timed_out=True)
+        raise
+    tracker.record(time.monotonic() - start)
+    return response
+
+
+def _hedged_get(session, url, params, timeout, tracker):
+
+    """
+    GET url; if it has not answered by the endpoint's p95, race it against one duplicate.
+
+    Hedging starts once the tracker has enough samples, and a duplicate is only
+    sent when a rate-limit token is free right now. The first response wins and
+    the other is closed when it arrives.
+    """
+
+    hedge_after = tracker.hedge_delay() if HEDGE_REQUESTS else None
+    if hedge_after is None:
+        return session.get(url, params=params, timeout=timeout)
+
+    pool = _get_hedge_pool()
+    primary = pool.submit(session.get, url, params=params, timeout=timeout)
+    try:
+        return primary.result(timeout=hedge_after)
+    except FuturesTimeout:
+        pass
+
+    # Hedge only with spare quota: the prefetch lane never waits for a token
+    if not rate_limiter.acquire(PRIORITY_PREFETCH):
+        return primary.result()
+
+    hedge = pool.submit(session.get, url, params=params, timeout=timeout)
+    pending = {primary, hedge}
+    error = None
+    while pending:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            if future.exception() is None:
+                tracker.record_hedge(won=future is hedge)
+                for other in (done | pending) - {future}:
+                    other.add_done_callback(_close_response)
+                return future.result()
+            error = error or future.exception()
+
+    # Both attempts failed: surface the first error to the retry loop
+    tracker.record_hedge(won=False)
+    raise error
+
+
+def _backoff_delay(attempt):
+
+    """
+    Return a "full jitter" exponential backoff delay (seconds) for a retry attempt.
+    """
+
+    return random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * (2 ** attempt)))
+
+
+def _get_json(url, params=None, priority=PRIORITY_INTERACTIVE):
 
     """
     Internal helper to perform a GET request with timeout and HTTP-status checks.
 
+    Concurrent callers asking for the same URL and params share one in-flight
+    request (see request_coalescer) and all receive its payload or its APIError.
+    If the shared request was dropped by the rate limiter in a less urgent lane
+    than the caller's, the caller issues it again in its own lane, so e.g. an
+    interactive "Get Weather" never fails because a prefetch it joined did.
+
     Args:
         url (str): Endpoint URL.
         params (dict, optional): Query parameters to include in the request.
+        priority (int): rate_limiter lane (PRIORITY_INTERACTIVE, _BACKGROUND or _PREFETCH).
 
     Returns:
         dict or list: Parsed JSON payload on success.
 
     Raises:
         APIError: On timeout, network error, or non-200 HTTP status.
+        RateLimitedError: If a background/prefetch call is dropped to save quota.
     """
-    
-    try:
-        # Attempt the HTTP GET with a short timeout to avoid hanging the app
-        response = requests.get(url, params=params, timeout=5)
 
-    except requests.Timeout:
-        # Raised when the request exceeds the timeout limit
-        raise APIError(f"Request to {url} timed out after 5 seconds")
-    
-    except requests.RequestException as e:
-        # Catches other network-related errors (DNS failure, refused connection, etc.)
-        raise APIError(f"Network error contacting {url}: {e}")
+    key = (url, tuple(sorted((params or {}).items())))
+    while True:
+        try:
+            return request_coalescer.do(key, lambda: _request_json(url, params, priority))
+        except RateLimitedError as e:
+            # Only retry a drop that happened in a lower-priority leader's lane
+            if e.priority is None or e.priority <= priority:
+                raise
+            logging.info("Shared request to %s was dropped in a lower-priority lane; reissuing", url)
+
+
+def _request_json(url, params=None, priority=PRIORITY_INTERACTIVE):
+
+    """
+    Perform one logical GET request over the pooled session.
+
+    Fails fast with CircuitOpenError while the endpoint's circuit breaker is open.
+    Each attempt first takes a token from rate_limiter in the given priority lane,
+    then times out at the endpoint's adaptive timeout and may be hedged (see _send).
+    Retries timeouts, connection failures and transient statuses (429/5xx)
+    with jittered exponential backoff. The final outcome is reported to the
+    breaker: network failures, 429 and 5xx count against the endpoint, while
+    other responses (including 4xx client errors) show it is reachable.
+
+    Args:
+        url (str): Endpoint URL.
+        params (dict, optional): Query parameters to include in the request.
+        priority (int): rate_limiter lane for each attempt.
+
+    Returns:
+        dict or list: Parsed JSON payload on success.
+
+    Raises:
+        APIError: On timeout, network error, or non-200 HTTP status.
+    """
+
+    breaker = get_circuit_breaker(url)
+    ticket = breaker.allow()
+    if not ticket:
+        retry_in = breaker.snapshot()["retry_in"]
+        raise CircuitOpenError(f"{url} is unavailable; skipping request for another {retry_in:.0f} seconds")
+
+    session = get_session()
+    tracker = get_latency_tracker(url)
+
+    for attempt in range(MAX_RETRIES + 1):
+        last_attempt = attempt == MAX_RETRIES
+
+        # Wait for quota; low-priority calls are dropped rather than queued indefinitely
+        if not rate_limiter.acquire(priority):
+            breaker.cancel(ticket)
+            raise RateLimitedError(f"Request to {url} dropped to stay within the API rate limit", priority)
+
+        try:
+            # Attempt the HTTP GET with an adaptive timeout (hedged if slow) to avoid hanging the app
+            timeout = tracker.timeout()
+            response = _send(session, url, params, timeout, tracker)
+
+        except requests.Timeout:
+            # Raised when the request exceeds the timeout limit
+            if last_attempt:
+                breaker.record_failure()
+                raise APIError(f"Request to {url} timed out after {timeout:.1f} seconds")
+            logging.warning("Timeout contacting %s, retrying (attempt %d)", url, attempt + 1)
+            time.sleep(_backoff_delay(attempt))
+            continue
+
+        except requests.ConnectionError as e:
+            # DNS failure, refused or dropped connection: worth another try
+            if last_attempt:
+                breaker.record_failure()
+                raise APIError(f"Network error contacting {url}: {e}")
+            logging.warning("Connection error contacting %s, retrying (attempt %d)", url, attempt + 1)
+            time.sleep(_backoff_delay(attempt))
+            continue
+
+        except requests.RequestException as e:
+            # Catches other request errors (invalid URL, etc.) that a retry will not fix
+            breaker.cancel(ticket)
+            raise APIError(f"Network error contacting {url}: {e}")
+
+        # Retry throttling and server-side errors, honoring a short Retry-After if given
+        if response.status_code in RETRY_STATUSES and not last_attempt:
+            delay = _backoff_delay(attempt)
+            retry_after = response.headers.get("Retry-After", "")
+            if retry_after.isdigit():
+                delay = min(float(retry_after), BACKOFF_MAX)
+            logging.warning("%s returned %s, retrying in %.2fs", url, response.status_code, delay)
+            response.close()
+            time.sleep(delay)
+            continue
+
+        break
+
+    # Report endpoint health: only throttling and server errors count as failures
+    if response.status_code in RETRY_STATUSES:
+        breaker.record_failure()
+    else:
+        breaker.record_success()
 
     # If the status code is not 200 OK, extract the API's error message if possible
     if response.status_code != 200:
@@ -69,24 +588,105 @@ def _get_json(url, params=None):
     return response.json()
 
 
-def search_city_options(query):
+def _get_cached_json(endpoint, lat, lon, url, params=None, priority=PRIORITY_INTERACTIVE):
+
+    """
+    Return the payload for a coordinate-based endpoint, serving it from response_cache while fresh.
+
+    Args:
+        endpoint (str): Cache namespace and CACHE_TTLS key (e.g. "weather").
+        lat (float): Latitude used for the cache key.
+        lon (float): Longitude used for the cache key.
+        url (str): Endpoint URL, fetched on a cache miss.
+        params (dict, optional): Query parameters for the request.
+        priority (int): rate_limiter lane used on a cache miss.
+
+    Returns:
+        dict: Parsed JSON payload.
+
+    Raises:
+        APIError: If the payload is not cached and the request fails.
+    """
+
+    key = ResponseCache.make_key(endpoint, lat, lon)
+    data = response_cache.get(key)
+    if data is None:
+        data = _get_json(url, params, priority)
+        response_cache.put(key, data, CACHE_TTLS[endpoint])
+    return data
+
+
+def search_city_options(query, on_update=None):
 
     '''
     Get city options from Geocoding API, return list of dicts:
     { 'display': formatted string, 'lat': ..., 'lon': ... }
+
+    Tries the offline city index first (prefix, then one-typo fuzzy match).
+    Otherwise answers straight from geocode_index when the exact query was seen before or
+    enough cached cities share the prefix; otherwise asks the API and merges its
+    answer with the cached matches. If on_update is given and the index has some
+    (but not enough) matches, those are returned immediately and the API lookup
+    runs in the background, passing the merged list to on_update(options).
     '''
 
-    # Define the geocoding endpoint for searching cities
-    url = "http://api.openweathermap.org/geo/1.0/direct"
+    # Bundled offline index: any local hit avoids the network entirely
+    if offline_geocoder is not None:
+        local = offline_geocoder.search(query, SUGGESTION_LIMIT)
+        if local:
+            return local
+
+    # Serve from the local index when it can fully answer the query
+    cached = geocode_index.lookup(query, SUGGESTION_LIMIT)
+    if len(cached) >= SUGGESTION_LIMIT or geocode_index.is_answered(query):
+        return cached
+
+    # Partial hit: show cached matches now, fill the gaps in the background
+    if cached and on_update is not None:
+        def _fill():
+            try:
+                options = _search_city_options_remote(query, cached)
+            except APIError:
+                logging.exception("Background city search failed")
+                return
+            if options != cached:
+                on_update(options)
+
+        threading.Thread(target=_fill, daemon=True).start()
+        return cached
+
+    return _search_city_options_remote(query, cached)
+
+
+def _search_city_options_remote(query, cached):
+
+    '''
+    Ask the Geocoding API for query, index its answer, and merge in cached matches.
+    '''
 
     # Set request parameters: city query, limit results to 5, include API key
     params = {
         "q": query,
-        "limit": 5,
+        "limit": SUGGESTION_LIMIT,
         "appid": API_KEY
     }
 
-    data = _get_json(url, params)
+    data = _get_json(GEO_DIRECT_URL, params)
+    options = _parse_city_options(data)
+    geocode_index.add(query, options)
+
+    # API answers first, then cached prefix matches it did not include
+    returned = {opt["display"] for opt in options}
+    options.extend(opt for opt in cached if opt["display"] not in returned)
+    return options[:SUGGESTION_LIMIT]
+
+
+def _parse_city_options(data):
+
+    '''
+    Convert a Geocoding API payload into a list of
+    { 'display': formatted string, 'lat': ..., 'lon': ... } dicts.
+    '''
 
     options = []     # Store city suggestions
 
@@ -112,99 +712,174 @@ def search_city_options(query):
         })
     return options     # Return list of location choices
 
-def fetch_weather_by_coords(lat, lon):
+
+def fetch_weather_by_coords(lat, lon, priority=PRIORITY_INTERACTIVE):
 
     '''
     Fetch current weather data for given latitude and longitude.
-    Returns a dict with temperature, humidity, wind, sunrise/sunset, etc.
+    Returns a WeatherReading with temperature, humidity, wind, sunrise/sunset, etc.
+    Pass priority=PRIORITY_BACKGROUND for auto-refresh style calls.
     '''
 
-    # Build API URL for current weather based on coordinates
-    url = f"http://api.openweathermap.org/data/2.5/weather?lat={lat}&lon={lon}&appid={API_KEY}&units=metric"
+    # Query current weather based on coordinates, in metric units
+    params = {"lat": lat, "lon": lon, "appid": API_KEY, "units": "metric"}
 
-    data = _get_json(url)
+    data = _get_cached_json("weather", lat, lon, WEATHER_URL, params, priority)
+    return _parse_current_weather(data)
 
-    # Get wind direction in degrees (if available)
-    wind_deg = data["wind"].get("deg")
-    wind_deg_str = f"{wind_deg:.0f}°" if wind_deg is not None else "N/A"
 
-    # Return a dictionary of cleaned and formatted weather info
-    return {
-        "temp": data["main"]["temp"],
-        "feels_like": data["main"]["feels_like"],
-        "humidity": data["main"]["humidity"],
-        "pressure": data["main"]["pressure"],
-        "visibility": data.get("visibility", "N/A"),
-        "wind": f"{data['wind']['speed']:.2f} m/s, {wind_deg_str}",
-        "wind_gust": data["wind"].get("gust", "N/A"),
-        "sea_level": data["main"].get("sea_level", "N/A"),
-        "grnd_level": data["main"].get("grnd_level", "N/A"),
-        "sunrise": datetime.fromtimestamp(data["sys"]["sunrise"]).strftime('%H:%M'),
-        "sunset": datetime.fromtimestamp(data["sys"]["sunset"]).strftime('%H:%M'),
-        "weather": data["weather"][0]["description"]
-    }
+def _parse_current_weather(data):
+
+    '''
+    Convert a current-weather API payload into a WeatherReading (raw numbers, formatted at render time).
+    '''
+
+    return WeatherReading.from_owm(data)
 
-def fetch_5day_forecast_by_coords(lat, lon):
+
+def get_last_known_weather(lat, lon):
+
+    '''
+    Return (WeatherReading, age in seconds, fresh) for the last payload cached for
+    these coordinates, even if it has expired, or (None, None, False) if none.
+    Never touches the network.
+    '''
+
+    hit = response_cache.get_stale(ResponseCache.make_key("weather", lat, lon))
+    if hit is None:
+        return None, None, False
+    data, age, fresh = hit
+    return _parse_current_weather(data), age, fresh
+
+
+def fetch_5day_forecast_by_coords(lat, lon, priority=PRIORITY_INTERACTIVE):
 
     '''
     Fetch 5-day weather forecast (in 3-hour intervals) for given latitude and longitude.
-    Groups data by day and returns a list of 5 daily summaries.
+    Groups data by day and returns a list of 5 daily ForecastDay summaries.
+    Pass priority=PRIORITY_BACKGROUND for auto-refresh style calls.
     '''
 
-    # Build URL for 5-day forecast
-    url = f"https://api.openweathermap.org/data/2.5/forecast?lat={lat}&lon={lon}&appid={API_KEY}&units=metric"
+    # Query the 5-day forecast based on coordinates, in metric units
+    params = {"lat": lat, "lon": lon, "appid": API_KEY, "units": "metric"}
 
-    data = _get_json(url)
+    data = _get_cached_json("forecast", lat, lon, FORECAST_URL, params, priority)
+    return _summarize_forecast(data)
 
-    # Raise exception if forecast data is missing
-    if "list" not in data:
-        raise Exception("Forecast data unavailable")
 
-    # Group entries by date using defaultdict
-    daily_data = collections.defaultdict(list)
-    for entry in data["list"]:
-        date_str = entry["dt_txt"].split(" ")[0]
-        daily_data[date_str].append(entry)
+def get_last_known_forecast(lat, lon):
 
-    forecast_days = []     # Final list of daily forecasts
+    '''
+    Return (daily summaries, age in seconds, fresh) for the last forecast cached
+    for these coordinates, even if it has expired, or (None, None, False) if none.
+    Never touches the network.
+    '''
 
-    # Process up to 5 days of forecast
-    for date, entries in list(daily_data.items())[:5]:
-        temps = [e["main"]["temp"] for e in entries]
-        hums = [e["main"]["humidity"] for e in entries]
-        weather_desc = entries[0]["weather"][0]["description"]
+    hit = response_cache.get_stale(ResponseCache.make_key("forecast", lat, lon))
+    if hit is None:
+        return None, None, False
+    data, age, fresh = hit
+    return _summarize_forecast(data), age, fresh
 
-        # Compute average visibility in km if available
-        visibilities = [e["visibility"] for e in entries if "visibility" in e]
-        if visibilities:
-            avg_visibility = round(sum(visibilities) / len(visibilities) / 1000, 1)
-            visibility_str = f"{avg_visibility}"
-        else:
-            visibility_str = "N/A"
-
-        # Compute average wind speed and direction
-        wind_speeds = [e["wind"]["speed"] for e in entries if "wind" in e]
-        wind_degs = [e["wind"].get("deg") for e in entries if "wind" in e and e["wind"].get("deg") is not None]
-        if wind_speeds and wind_degs:
-            avg_speed = round(sum(wind_speeds) / len(wind_speeds), 2)
-            avg_deg = round(sum(wind_degs) / len(wind_degs))
-            wind_str = f"{avg_speed} m/s, {avg_deg}°"
-        else:
-            wind_str = "N/A"
-
-        # Format date for display (e.g., Fri, Jul 18)
-        formatted_date = datetime.strptime(date, "%Y-%m-%d").strftime("%a, %b %d")
-
-        # Build the day's forecast summary
-        day = {
-            "date": formatted_date,
-            "temp_min": min(temps),
-            "temp_max": max(temps),
-            "humidity": round(sum(hums) / len(hums)),
-            "weather": weather_desc,
-            "wind": wind_str,
-            "visibility": visibility_str,
-        }
-        forecast_days.append(day)
 
-    return forecast_days     # Return list of 5-day summaries
+def _summarize_forecast(data):
+
+    '''
+    Group a 5-day/3-hour forecast payload by the city's local calendar day into up
+    to 5 daily ForecastDay summaries (see forecast_engine for other bucketings).
+    '''
+
+    return summarize_days(data, limit=5)
+
+
+def fetch_weather_many(coords, max_workers=BATCH_WORKERS, report=None, priority=PRIORITY_BACKGROUND):
+
+    '''
+    Fetch current weather for many coordinates over a worker pool.
+
+    Identical or near-identical points (equal once rounded like cache keys) are
+    fetched once. Results are yielded in completion order, one per unique point,
+    as dicts:
+        { 'lat', 'lon', 'inputs': [(lat, lon), ...], 'weather': WeatherReading or None,
+          'error': exception or None, 'elapsed': seconds, 'waited': seconds }
+    A failing point yields its error (an APIError, or any unexpected exception
+    such as a malformed payload) instead of aborting the batch. 'elapsed'
+    excludes the time spent waiting for rate-limit tokens, which is 'waited'.
+
+    Args:
+        coords (iterable): (lat, lon) pairs.
+        max_workers (int): Maximum concurrent requests.
+        report (dict, optional): Filled in once the batch finishes with counts,
+            'wall_time', 'serial_time' (sum of per-point latencies without
+            rate-limit waits), 'limiter_wait' (sum of those waits) and 'speedup'
+            (serial_time / wall_time; the wall time still includes any waits).
+        priority (int): rate_limiter lane for the batch (background by default).
+    '''
+
+    # Group input coordinates by their normalized cache key
+    unique = collections.OrderedDict()
+    requested = 0
+    for lat, lon in coords:
+        requested += 1
+        key = ResponseCache.make_key("weather", lat, lon)
+        unique.setdefault(key, []).append((lat, lon))
+
+    def _fetch_one(lat, lon):
+        start = time.perf_counter()
+        waited = rate_limiter.thread_wait()
+        weather, error = None, None
+        try:
+            weather = fetch_weather_by_coords(lat, lon, priority)
+        except APIError as e:
+            error = e
+        except Exception as e:
+            # Malformed payloads and other bugs are reported for this point only
+            logging.exception("Unexpected error fetching weather for %s, %s", lat, lon)
+            error = e
+        waited = rate_limiter.thread_wait() - waited
+        return weather, error, time.perf_counter() - start - waited, waited
+
+    batch_start = time.perf_counter()
+    serial_time = 0.0
+    limiter_wait = 0.0
+    failed = 0
+    executor = ThreadPoolExecutor(max_workers=max(1, max_workers))
+    try:
+        futures = {
+            executor.submit(_fetch_one, *inputs[0]): inputs
+            for inputs in unique.values()
+        }
+        for future in as_completed(futures):
+            inputs = futures[future]
+            weather, error, elapsed, waited = future.result()
+            serial_time += elapsed
+            limiter_wait += waited
+            if error is not None:
+                failed += 1
+            yield {
+                "lat": inputs[0][0],
+                "lon": inputs[0][1],
+                "inputs": inputs,
+                "weather": weather,
+                "error": error,
+                "elapsed": elapsed,
+                "waited": waited,
+            }
+    finally:
+        # Stop queued work if the caller abandons the generator early
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    wall_time = time.perf_counter() - batch_start
+    summary = {
+        "requested": requested,
+        "unique": len(unique),
+        "succeeded": len(unique) - failed,
+        "failed": failed,
+        "wall_time": wall_time,
+        "serial_time": serial_time,
+        "limiter_wait": limiter_wait,
+        "speedup": serial_time / wall_time if wall_time else 0.0,
+    }
+    logging.info("Batch weather fetch: %s", summary)
+    if report is not None:
+        report.update(summary)
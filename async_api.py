@@ -0,0 +1,276 @@
+"""
+async_api.py
+
+asyncio counterpart of api.py for fetching many locations from one event loop.
+
+Provides AsyncWeatherClient, built on one aiohttp session with a global concurrency limit:
+- search_city_options(query): City suggestions as { 'display', 'lat', 'lon' } dicts.
+- fetch_weather_by_coords(lat, lon): Current weather as a WeatherReading, like api.fetch_weather_by_coords.
+- fetch_5day_forecast_by_coords(lat, lon): Up to 5 daily forecast summaries.
+
+Every call accepts an optional per-request timeout and can be cancelled like any
+asyncio task; a cancelled call releases its concurrency slot immediately.
+Module-level *_async helpers share one client per event loop.
+
+Requests obey the same quota and outage protection as api.py: every attempt
+takes a token from api.rate_limiter (in the caller's priority lane) and each
+endpoint's api circuit breaker is checked and updated, so bulk async fetches
+cannot exceed the per-minute budget or keep hitting an API that is down.
+
+Parsing, caching and the geocode index are shared with api.py, so both clients
+return identical results and warm the same caches.
+"""
+
+import asyncio                        # Event loop, semaphore and sleeps between retries
+import json                           # For extracting error messages from failed responses
+import weakref                        # For per-event-loop shared clients
+import aiohttp                        # Non-blocking HTTP client
+import api                            # Shared settings, parsers and caches
+from api import APIError              # Same error type as the synchronous client
+from api import RateLimitedError, CircuitOpenError, PRIORITY_INTERACTIVE    # Quota and outage handling
+from cache import ResponseCache       # For building shared cache keys
+
+
+# Default cap on requests in flight at once across the whole client
+MAX_CONCURRENCY = 20
+
+
+class AsyncWeatherClient:
+
+    '''
+    Shared asyncio client for the OpenWeatherMap API.
+
+    Use as an async context manager, or call close() when done:
+
+        async with AsyncWeatherClient(max_concurrency=50) as client:
+            results = await asyncio.gather(*(client.fetch_weather_by_coords(lat, lon) for lat, lon in coords))
+    '''
+
+    def __init__(self, max_concurrency=MAX_CONCURRENCY, timeout=api.REQUEST_TIMEOUT):
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._session = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    def _get_session(self):
+
+        '''
+        Return the aiohttp session, creating it (inside the running loop) on first use.
+        '''
+
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(limit=self.max_concurrency, limit_per_host=self.max_concurrency)
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                headers={"Accept-Encoding": "gzip, deflate"},
+            )
+        return self._session
+
+    async def close(self):
+
+        '''
+        Close the underlying aiohttp session and its pooled connections.
+        '''
+
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+
+    async def _get_json(self, url, params=None, timeout=None, priority=PRIORITY_INTERACTIVE):
+
+        '''
+        GET url and return its JSON payload, under the concurrency limit.
+
+        Like api._request_json: fails fast while the endpoint's circuit breaker
+        is open, takes a rate-limit token in the given lane before each attempt,
+        retries timeouts, connection errors and 429/5xx statuses with the same
+        jittered backoff, and reports the outcome to the breaker.
+
+        Raises:
+            APIError: On timeout, network error, or non-200 HTTP status.
+            CircuitOpenError: While the endpoint's circuit breaker is open.
+            RateLimitedError: If a background/prefetch call is dropped to save quota.
+        '''
+
+        breaker = api.get_circuit_breaker(url)
+        ticket = breaker.allow()
+        if not ticket:
+            retry_in = breaker.snapshot()["retry_in"]
+            raise CircuitOpenError(f"{url} is unavailable; skipping request for another {retry_in:.0f} seconds")
+        try:
+            status, body = await self._send(url, params, timeout, priority, breaker)
+        except BaseException:
+            # Cancelled, dropped for quota or failed: free the half-open probe slot if this
+            # call held it (network failures were already recorded and reopened the circuit)
+            breaker.cancel(ticket)
+            raise
+
+        # Report endpoint health: only throttling and server errors count as failures
+        if status in api.RETRY_STATUSES:
+            breaker.record_failure()
+        else:
+            breaker.record_success()
+        if status == 200:
+            return body
+
+        # Extract the API's error message if possible, else fall back to raw text
+        try:
+            error_info = json.loads(body).get("message", body)
+        except (ValueError, AttributeError):
+            error_info = body
+        raise APIError(f"API returned status {status} for {url}: {error_info}")
+
+    async def _send(self, url, params, timeout, priority, breaker):
+
+        '''
+        Run the attempts of one request; returns (status, parsed JSON if 200 else body text).
+
+        Network failures on the last attempt are recorded on breaker and raised as APIError.
+        '''
+
+        timeout = self.timeout if timeout is None else timeout
+
+        # Like requests, leave out unset parameters (aiohttp rejects None values)
+        if params:
+            params = {k: v for k, v in params.items() if v is not None}
+
+        client_timeout = aiohttp.ClientTimeout(total=timeout)
+        session = self._get_session()
+
+        for attempt in range(api.MAX_RETRIES + 1):
+            last_attempt = attempt == api.MAX_RETRIES
+
+            async with self._semaphore:
+                # Wait for quota; low-priority calls are dropped rather than queued indefinitely
+                # (taken only when granted, so cancelled or timed-out waits spend no quota)
+                if not await api.rate_limiter.acquire_async(priority):
+                    raise RateLimitedError(f"Request to {url} dropped to stay within the API rate limit", priority)
+
+                try:
+                    async with session.get(url, params=params, timeout=client_timeout) as response:
+                        status = response.status
+                        if status == 200:
+                            return status, await response.json(content_type=None)
+                        body = await response.text()
+
+                except asyncio.TimeoutError:
+                    if last_attempt:
+                        breaker.record_failure()
+                        raise APIError(f"Request to {url} timed out after {timeout} seconds")
+                    status = None
+
+                except aiohttp.ClientError as e:
+                    if last_attempt:
+                        breaker.record_failure()
+                        raise APIError(f"Network error contacting {url}: {e}")
+                    status = None
+
+            # Back off outside the semaphore so waiting retries do not hold a slot
+            if status is None or (status in api.RETRY_STATUSES and not last_attempt):
+                await asyncio.sleep(api._backoff_delay(attempt))
+                continue
+            break
+
+        return status, body
+
+    async def _get_cached_json(self, endpoint, lat, lon, url, params, timeout=None, priority=PRIORITY_INTERACTIVE):
+
+        '''
+        Async twin of api._get_cached_json, sharing api.response_cache.
+        '''
+
+        key = ResponseCache.make_key(endpoint, lat, lon)
+        data = api.response_cache.get(key)
+        if data is None:
+            data = await self._get_json(url, params, timeout, priority)
+            api.response_cache.put(key, data, api.CACHE_TTLS[endpoint])
+        return data
+
+    async def search_city_options(self, query, timeout=None, priority=PRIORITY_INTERACTIVE):
+
+        '''
+        Return city suggestions for query, consulting the offline and cached indexes first.
+        '''
+
+        if api.offline_geocoder is not None:
+            local = api.offline_geocoder.search(query, api.SUGGESTION_LIMIT)
+            if local:
+                return local
+
+        cached = api.geocode_index.lookup(query, api.SUGGESTION_LIMIT)
+        if len(cached) >= api.SUGGESTION_LIMIT or api.geocode_index.is_answered(query):
+            return cached
+
+        params = {"q": query, "limit": api.SUGGESTION_LIMIT, "appid": api.API_KEY}
+        data = await self._get_json(api.GEO_DIRECT_URL, params, timeout, priority)
+        options = api._parse_city_options(data)
+        api.geocode_index.add(query, options)
+
+        returned = {opt["display"] for opt in options}
+        options.extend(opt for opt in cached if opt["display"] not in returned)
+        return options[:api.SUGGESTION_LIMIT]
+
+    async def fetch_weather_by_coords(self, lat, lon, timeout=None, priority=PRIORITY_INTERACTIVE):
+
+        '''
+        Return the current WeatherReading for the given coordinates.
+        '''
+
+        params = {"lat": lat, "lon": lon, "appid": api.API_KEY, "units": "metric"}
+        data = await self._get_cached_json("weather", lat, lon, api.WEATHER_URL, params, timeout, priority)
+        return api._parse_current_weather(data)
+
+    async def fetch_5day_forecast_by_coords(self, lat, lon, timeout=None, priority=PRIORITY_INTERACTIVE):
+
+        '''
+        Return up to 5 daily forecast summaries for the given coordinates.
+        '''
+
+        params = {"lat": lat, "lon": lon, "appid": api.API_KEY, "units": "metric"}
+        data = await self._get_cached_json("forecast", lat, lon, api.FORECAST_URL, params, timeout, priority)
+        return api._summarize_forecast(data)
+
+
+# One shared client per event loop for the module-level helpers below
+_clients = weakref.WeakKeyDictionary()
+
+
+def get_client():
+
+    '''
+    Return the shared AsyncWeatherClient for the running event loop.
+    '''
+
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None:
+        client = _clients[loop] = AsyncWeatherClient()
+    return client
+
+
+async def close_client():
+
+    '''
+    Close and forget the shared client of the running event loop.
+    '''
+
+    client = _clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.close()
+
+
+async def search_city_options_async(query, timeout=None, priority=PRIORITY_INTERACTIVE):
+    return await get_client().search_city_options(query, timeout, priority)
+
+
+async def fetch_weather_by_coords_async(lat, lon, timeout=None, priority=PRIORITY_INTERACTIVE):
+    return await get_client().fetch_weather_by_coords(lat, lon, timeout, priority)
+
+
+async def fetch_5day_forecast_by_coords_async(lat, lon, timeout=None, priority=PRIORITY_INTERACTIVE):
+    return await get_client().fetch_5day_forecast_by_coords(lat, lon, timeout, priority)
@@ -0,0 +1,70 @@
+"""
+benchmarks/bench_batch_fetch.py
+
+Measure the speedup of api.fetch_weather_many over fetching one city at a time:
+- Starts the local API stand-in (owm_stub.py) with ~150 ms responses.
+- Fetches the same number of distinct points with max_workers=1 (serial) and
+  with the default worker pool, each run on a cold response cache.
+- The client-side rate limiter is replaced by an unlimited one, so both modes
+  measure network time only and not quota waits.
+
+Usage:
+    python benchmarks/bench_batch_fetch.py [--points 80] [--workers 8]
+"""
+
+import os
+import sys
+import time
+
+# Keep the benchmark's responses out of the on-disk caches
+os.environ.setdefault("WEATHER_CACHE_FILE", "")
+os.environ.setdefault("WEATHER_GEOCODE_CACHE_FILE", "")
+
+# Allow running from the repo root or the benchmarks folder
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import api
+from resilience import RateLimiter
+from owm_stub import start_stub
+
+
+def run(points, workers, offset):
+
+    '''
+    Fetch points distinct coordinates; returns (wall seconds, fetch_weather_many report).
+    '''
+
+    api.response_cache.clear()
+    coords = [(10.0 + offset + i * 0.1, 20.0) for i in range(points)]
+    report = {}
+    start = time.perf_counter()
+    for result in api.fetch_weather_many(coords, max_workers=workers, report=report):
+        if result["error"] is not None:
+            print(f"  {result['lat']}, {result['lon']} failed: {result['error']}")
+    return time.perf_counter() - start, report
+
+
+def main():
+    args = sys.argv[1:]
+    points = int(args[args.index("--points") + 1]) if "--points" in args else 80
+    workers = int(args[args.index("--workers") + 1]) if "--workers" in args else api.BATCH_WORKERS
+
+    server = start_stub(latency="normal:0.15,0.02", seed=5)
+    api.WEATHER_URL = server.base_url + "/data/2.5/weather"
+
+    # The stub has no quota, so never let the client-side limiter skew the timings
+    api.rate_limiter = RateLimiter(rate_per_minute=1_000_000, burst=1_000)
+    api.HEDGE_REQUESTS = False
+
+    serial, _ = run(points, 1, offset=0)
+    parallel, report = run(points, workers, offset=50)
+    print(f"{points} points, ~150 ms per response")
+    print(f"serial (1 worker)     {serial:7.2f} s")
+    print(f"batch ({workers} workers)     {parallel:7.2f} s   speedup {serial / parallel:5.1f}x")
+    print(f"batch report: serial_time {report['serial_time']:.2f} s, limiter_wait {report['limiter_wait']:.2f} s, "
+          f"speedup {report['speedup']:.1f}x, failed {report['failed']}")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""
+benchmarks/bench_db_writer.py
+
+Measure weather-row ingest throughput and read latency while ingesting:
+- legacy: one connection, rollback journal, synchronous=FULL, a commit per row
+  (how WeatherDB.insert_weather used to write).
+- writer: WeatherDB with WAL and the queued group-commit writer, fed by several
+  producer threads.
+
+During the writer run a reader thread keeps calling get_all_history and get_stats;
+the latency of those reads is reported.
+
+Usage:
+    python benchmarks/bench_db_writer.py [--rows 2000,20000] [--producers 4] [--synchronous NORMAL]
+"""
+
+import os
+import sys
+import time
+import sqlite3
+import tempfile
+import threading
+
+# Allow running from the repo root or the benchmarks folder
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from db import WeatherDB, INSERT_SQL
+
+
+def synthetic_row(i):
+
+    '''
+    Return a plausible weather row (matching INSERT_COLUMNS) for reading number i.
+    '''
+
+    now = 1_700_000_000 + i
+    return (now, f"City {i % 50}", -10 + (i * 7) % 45, -12 + (i * 5) % 45, "Clear Sky", 800,
+            40 + i % 60, 1000 + i % 30, 10000, (i % 200) / 10, i % 360, None,
+            1013.0, 1001.0, now - 20000, now + 20000, 3600 * (i % 5))
+
+
+def percentile(values, q):
+    if not values:
+        return float("nan")
+    ordered = sorted(values)
+    return ordered[int(q * (len(ordered) - 1))]
+
+
+def reader_loop(db_path, stop, latencies):
+
+    '''
+    Read history and stats until stop is set, recording each call's latency in seconds.
+    '''
+
+    db = WeatherDB(db_path)
+    while not stop.is_set():
+        start = time.perf_counter()
+        db.get_all_history()
+        db.get_stats()
+        latencies.append(time.perf_counter() - start)
+        time.sleep(0.005)
+    db.close()
+
+
+def run_legacy(path, rows):
+
+    '''
+    Insert rows one commit at a time through a single rollback-journal connection.
+    '''
+
+    # Create the schema, then switch the file back to the rollback journal
+    WeatherDB(path).close()
+    conn = sqlite3.connect(path, timeout=30)
+    conn.execute("PRAGMA journal_mode = DELETE")
+    conn.execute("PRAGMA synchronous = FULL")
+    start = time.perf_counter()
+    for i in range(rows):
+        conn.execute(INSERT_SQL, synthetic_row(i))
+        conn.commit()
+    elapsed = time.perf_counter() - start
+    conn.close()
+    return elapsed
+
+
+def run_writer(path, rows, producers, synchronous):
+
+    '''
+    Insert rows from several producer threads through WeatherDB's queued writer, then flush.
+    '''
+
+    db = WeatherDB(path, synchronous=synchronous)
+    per_thread = rows // producers
+
+    def produce(offset):
+        for i in range(offset, offset + per_thread):
+            db.writer.put(synthetic_row(i))
+
+    start = time.perf_counter()
+    threads = [threading.Thread(target=produce, args=(n * per_thread,)) for n in range(producers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    db.flush()
+    elapsed = time.perf_counter() - start
+    commits = db.writer.commits
+    db.close()
+    return elapsed, per_thread * producers, commits
+
+
+def main():
+    args = sys.argv[1:]
+    sizes = [2000, 20000]
+    if "--rows" in args:
+        sizes = [int(n) for n in args[args.index("--rows") + 1].split(",")]
+    producers = int(args[args.index("--producers") + 1]) if "--producers" in args else 4
+    synchronous = args[args.index("--synchronous") + 1] if "--synchronous" in args else "NORMAL"
+
+    print(f"{'mode':>8} {'rows':>7} {'seconds':>9} {'rows/s':>10} {'commits':>8} {'read p50':>10} {'read p99':>10}")
+    with tempfile.TemporaryDirectory(prefix="weather-writer-") as folder:
+        for rows in sizes:
+            for mode in ("legacy", "writer"):
+                path = os.path.join(folder, f"{mode}-{rows}.db")
+                stop, latencies = threading.Event(), []
+                reader = threading.Thread(target=reader_loop, args=(path, stop, latencies))
+                if mode == "writer":
+                    reader.start()
+
+                if mode == "legacy":
+                    elapsed = run_legacy(path, rows)
+                    written, commits = rows, rows
+                else:
+                    elapsed, written, commits = run_writer(path, rows, producers, synchronous)
+                    stop.set()
+                    reader.join()
+
+                read_info = (f"{percentile(latencies, 0.5) * 1000:>8.2f}ms {percentile(latencies, 0.99) * 1000:>8.2f}ms"
+                             if latencies else f"{'-':>10} {'-':>10}")
+                print(f"{mode:>8} {written:>7} {elapsed:>9.3f} {written / elapsed:>10.0f} {commits:>8} {read_info}")
+    print(f"writer: {producers} producer threads, synchronous={synchronous}, WAL; "
+          "legacy: commit per row, rollback journal, synchronous=FULL (no concurrent reader: it would block on locks)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""
+benchmarks/bench_dispatcher.py
+
+Compare two ways for worker threads to hand results to the Tk thread while a
+burst of results arrives (several workers posting forecast, suggestion and
+weather updates, each costing some main-thread time to apply):
+- per-result: every result is applied as its own event as soon as possible,
+  like a root.after(0, ...) call from the worker
+- dispatcher: results go through UIDispatcher (coalesced per view, drained
+  under a per-tick budget)
+
+The per-result mode is emulated with a UIDispatcher without keys or budget
+on a 1 ms tick: calling root.after from a worker thread deadlocks on a plain
+Tcl interpreter, which is the hazard the dispatcher removes.
+
+Reported per mode:
+- applied: callbacks that actually ran on the Tk thread
+- latency: time from posting the result that was applied to applying it
+  (p50 / p95 / max); the dispatcher's own metrics, also printed, count from
+  the first post of a coalesced update instead
+- stall: worst lateness of a 5 ms heartbeat timer on the Tk thread, which
+  stands in for keystrokes and scrolling waiting behind the updates
+
+Runs on a plain Tcl interpreter (no display needed); the event loop and the
+after queue are the same as in a Tk root.
+
+Usage:
+    python benchmarks/bench_dispatcher.py [--results 300] [--cost-ms 1.0]
+"""
+
+import os
+import sys
+import time
+import threading
+import tkinter as tk
+
+# Allow running from the repo root or the benchmarks folder
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from dispatcher import UIDispatcher
+
+
+# Views updated by the workers; results for the same view may be coalesced
+VIEWS = ("forecast", "suggestions", "weather")
+HEARTBEAT_MS = 5
+
+
+def percentile(values, q):
+    ordered = sorted(values)
+    return ordered[int(q * (len(ordered) - 1))] if ordered else 0.0
+
+
+def run(mode, results, cost):
+
+    '''
+    Post results from one worker per view and run the event loop until all are handled.
+
+    Returns:
+        tuple: (callbacks applied, latencies in seconds, worst heartbeat lateness in seconds, dispatcher metrics)
+    '''
+
+    root = tk.Tcl()
+    if mode == "per-result":
+        dispatcher = UIDispatcher(root, interval_ms=1, budget_ms=float("inf"))
+    else:
+        dispatcher = UIDispatcher(root)
+    dispatcher.start()
+    latencies = []
+    stalls = [0.0]
+    done = threading.Event()
+
+    def apply(posted_at):
+        latencies.append(time.perf_counter() - posted_at)
+        end = time.perf_counter() + cost
+        while time.perf_counter() < end:    # Stand-in for configuring widgets
+            pass
+
+    def worker(view):
+        for _ in range(results // len(VIEWS)):
+            posted_at = time.perf_counter()
+            callback = lambda posted_at=posted_at: apply(posted_at)
+            dispatcher.post(callback, key=None if mode == "per-result" else view)
+            time.sleep(0.0002)
+
+    def heartbeat(expected):
+        stalls[0] = max(stalls[0], time.perf_counter() - expected)
+        if not done.is_set():
+            root.after(HEARTBEAT_MS, heartbeat, time.perf_counter() + HEARTBEAT_MS / 1000)
+
+    threads = [threading.Thread(target=worker, args=(view,), daemon=True) for view in VIEWS]
+    root.after(HEARTBEAT_MS, heartbeat, time.perf_counter() + HEARTBEAT_MS / 1000)
+    for thread in threads:
+        thread.start()
+
+    # Run the event loop until the workers are finished and nothing is left to apply
+    # (mainloop returns at once without a Tk window, so events are processed here)
+    settle = None
+    while True:
+        root.tk.dooneevent(0)
+        if any(thread.is_alive() for thread in threads) or dispatcher.metrics()["queued"]:
+            settle = None
+        elif settle is None:
+            settle = time.perf_counter() + 0.1
+        elif time.perf_counter() > settle:
+            break
+    done.set()
+    dispatcher.stop()
+    return len(latencies), latencies, stalls[0], dispatcher.metrics()
+
+
+def main():
+    args = sys.argv[1:]
+    results = int(args[args.index("--results") + 1]) if "--results" in args else 300
+    cost = float(args[args.index("--cost-ms") + 1]) / 1000 if "--cost-ms" in args else 0.001
+
+    print(f"{'mode':>10} {'posted':>7} {'applied':>8} {'p50':>9} {'p95':>9} {'max':>9} {'stall':>9}")
+    for mode in ("per-result", "dispatcher"):
+        applied, latencies, stall, metrics = run(mode, results, cost)
+        print(f"{mode:>10} {results // len(VIEWS) * len(VIEWS):>7} {applied:>8} "
+              f"{percentile(latencies, 0.5) * 1000:>7.2f}ms {percentile(latencies, 0.95) * 1000:>7.2f}ms "
+              f"{max(latencies) * 1000:>7.2f}ms {stall * 1000:>7.2f}ms")
+    print(f"dispatcher metrics: {metrics}")
+    print(f"{cost * 1000:.1f} ms main-thread work per applied result; heartbeat every {HEARTBEAT_MS} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+benchmarks/bench_forecast_engine.py
+
+Compare forecast aggregation throughput:
+- legacy: the original per-payload defaultdict loop (UTC dt_txt days, arithmetic mean wind direction).
+- engine: forecast_engine.load_forecasts + aggregate over many stacked payloads at once.
+- engine (all buckets): one load, then aggregate for every bucketing in forecast_engine.BUCKETS.
+- engine (per payload): forecast_engine.summarize_days called once per payload, as api.py does.
+
+Payloads are synthetic 40-entry forecasts from owm_stub.py.
+
+Usage:
+    python benchmarks/bench_forecast_engine.py [--cities 1,100,1000,10000] [--bucket day]
+"""
+
+import os
+import sys
+import time
+import random
+import collections
+
+# Allow running from the repo root or the benchmarks folder
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from owm_stub import synthetic_forecast
+from forecast_engine import load_forecasts, aggregate, summarize_days, BUCKETS
+
+
+def legacy_summarize(data):
+
+    '''
+    The loop api._summarize_forecast used before forecast_engine (kept here as the baseline).
+    '''
+
+    daily_data = collections.defaultdict(list)
+    for entry in data["list"]:
+        daily_data[entry["dt_txt"].split(" ")[0]].append(entry)
+
+    days = []
+    for date, entries in list(daily_data.items())[:5]:
+        temps = [e["main"]["temp"] for e in entries]
+        hums = [e["main"]["humidity"] for e in entries]
+        visibilities = [e["visibility"] for e in entries if "visibility" in e]
+        wind_speeds = [e["wind"]["speed"] for e in entries if "wind" in e]
+        wind_degs = [e["wind"].get("deg") for e in entries if "wind" in e and e["wind"].get("deg") is not None]
+        days.append({
+            "date": date,
+            "temp_min": min(temps),
+            "temp_max": max(temps),
+            "humidity": round(sum(hums) / len(hums)),
+            "visibility": sum(visibilities) / len(visibilities) if visibilities else None,
+            "wind_speed": sum(wind_speeds) / len(wind_speeds) if wind_speeds else None,
+            "wind_deg": sum(wind_degs) / len(wind_degs) if wind_degs else None,
+            "weather": entries[0]["weather"][0]["description"],
+        })
+    return days
+
+
+def best_of(func, repeat=3):
+
+    '''
+    Return the fastest wall time of func() over repeat runs, in seconds.
+    '''
+
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    args = sys.argv[1:]
+    sizes = [1, 100, 1000, 10000]
+    if "--cities" in args:
+        sizes = [int(n) for n in args[args.index("--cities") + 1].split(",")]
+    bucket = args[args.index("--bucket") + 1] if "--bucket" in args else "day"
+
+    rng = random.Random(5)
+    now = int(time.time())
+    print(f"{'cities':>7} {'legacy':>12} {'engine':>12} {'(load)':>10} {'(aggregate)':>12} "
+          f"{'all buckets':>12} {'per-payload':>12}")
+    for count in sizes:
+        payloads = []
+        for _ in range(count):
+            lat, lon = rng.uniform(-60, 70), rng.uniform(-180, 180)
+            payload = synthetic_forecast(lat, lon, now=now)
+            payload["city"]["timezone"] = int(round(lon / 15)) * 3600
+            payloads.append(payload)
+
+        legacy = best_of(lambda: [legacy_summarize(p) for p in payloads])
+        load = best_of(lambda: load_forecasts(payloads))
+        arrays = load_forecasts(payloads)
+        agg = best_of(lambda: aggregate(arrays, bucket))
+        all_buckets = best_of(lambda: [aggregate(arrays, b) for b in BUCKETS])
+        per_payload = best_of(lambda: [summarize_days(p) for p in payloads])
+
+        print(
+            f"{count:>7} {legacy * 1000:>10.2f}ms {(load + agg) * 1000:>10.2f}ms "
+            f"{load * 1000:>8.2f}ms {agg * 1000:>10.2f}ms {(load + all_buckets) * 1000:>10.2f}ms "
+            f"{per_payload * 1000:>10.2f}ms"
+        )
+    print(f"engine = load + aggregate over all cities stacked ({bucket!r} buckets); all buckets = load + "
+          f"{len(BUCKETS)} aggregations; legacy and per-payload process one payload at a time")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+benchmarks/bench_hedging.py
+
+Measure how adaptive timeouts and hedged requests cut API tail latency:
+- Starts the local API stand-in (owm_stub.py) with responses that usually take ~150 ms,
+  and a small fraction of very slow (2-4 s) responses.
+- Sends the same sequence of requests through api._request_json with the static
+  5 s timeout and no hedging, then with adaptive timeouts and hedging enabled.
+  The first --warmup requests of each run fill the latency window and are not measured.
+- Prints p50/p95/p99/max latency for both runs and the hedge counters.
+
+Usage:
+    python benchmarks/bench_hedging.py [--requests N] [--warmup N] [--slow-rate 0.05]
+"""
+
+import os
+import sys
+import time
+
+# Keep the benchmark's responses out of the on-disk caches
+os.environ.setdefault("WEATHER_CACHE_FILE", "")
+os.environ.setdefault("WEATHER_GEOCODE_CACHE_FILE", "")
+
+# Allow running from the repo root or the benchmarks folder
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import api
+from resilience import RateLimiter, LatencyTracker
+from owm_stub import start_stub
+
+
+def percentile(samples, q):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def run(url, count, warmup, adaptive):
+
+    '''
+    Send warmup + count sequential requests and return the last count latencies in seconds.
+    '''
+
+    # Fresh tracker per run; the static run never collects enough samples to adapt
+    api.HEDGE_REQUESTS = adaptive
+    api._latency_trackers.clear()
+    if not adaptive:
+        api._latency_trackers[api._endpoint_name(url)] = LatencyTracker(
+            "static", min_samples=warmup + count + 1, max_timeout=api.REQUEST_TIMEOUT
+        )
+
+    latencies = []
+    for i in range(warmup + count):
+        start = time.perf_counter()
+        try:
+            api._request_json(url, {"lat": 1.0, "lon": float(i)})
+        except api.APIError as e:
+            print(f"  request {i} failed: {e}")
+        latencies.append(time.perf_counter() - start)
+    return latencies[warmup:]
+
+
+def report(label, latencies):
+    print(
+        f"{label:<22} p50 {percentile(latencies, 0.50) * 1000:7.0f} ms   "
+        f"p95 {percentile(latencies, 0.95) * 1000:7.0f} ms   "
+        f"p99 {percentile(latencies, 0.99) * 1000:7.0f} ms   "
+        f"max {max(latencies) * 1000:7.0f} ms"
+    )
+
+
+def main():
+    args = sys.argv[1:]
+    count = int(args[args.index("--requests") + 1]) if "--requests" in args else 300
+    warmup = int(args[args.index("--warmup") + 1]) if "--warmup" in args else 50
+    slow_rate = float(args[args.index("--slow-rate") + 1]) if "--slow-rate" in args else 0.05
+
+    server = start_stub(latency="normal:0.15,0.02", tail_rate=slow_rate, tail_latency="uniform:2,4", seed=3)
+    url = server.base_url + "/data/2.5/weather"
+
+    # The stub has no quota, so never let the client-side limiter skew the timings
+    api.rate_limiter = RateLimiter(rate_per_minute=1_000_000, burst=1_000)
+
+    print(f"{count} requests, {slow_rate:.0%} of responses delayed 2-4 s")
+    report("static 5 s timeout", run(url, count, warmup, adaptive=False))
+    report("adaptive + hedging", run(url, count, warmup, adaptive=True))
+
+    stats = api.get_latency_stats()[api._endpoint_name(url)]
+    print(
+        f"Adaptive timeout settled at {stats['timeout']:.2f} s; "
+        f"{stats['hedged']} hedges sent, {stats['hedge_wins']} answered first, "
+        f"{stats['timeouts']} attempts timed out"
+    )
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+benchmarks/bench_history_paging.py
+
+Compare fetching one 50-row history page at increasing depths:
+- keyset: WeatherDB.get_history_page(before=cursor), an index range scan of one page.
+- offset: the same page with LIMIT/OFFSET, which must skip every earlier row.
+
+Runs unfiltered and with the city and condition filters. The database is
+built like benchmarks/bench_stats.py (synthetic readings, 50 cities).
+
+Usage:
+    python benchmarks/bench_history_paging.py [--rows 1000000] [--keep DIR]
+"""
+
+import os
+import sys
+import time
+import shutil
+import tempfile
+
+# Allow running from the repo root or the benchmarks folder
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from db import WeatherDB, HISTORY_SELECT, CONDITION_GROUP, HISTORY_PAGE_SIZE
+from bench_stats import build
+
+
+# Filters benchmarked: (label, get_history_page keyword arguments, equivalent SQL filter and params)
+FILTERS = (
+    ("all", {}, "1", ()),
+    ("city", {"city": "City 7"}, "city = ?", ("City 7",)),
+    ("condition", {"condition": "Rain"}, f"{CONDITION_GROUP} = ?", ("Rain",)),
+)
+
+
+def best_of(func, repeat=5):
+
+    '''
+    Return the fastest wall time of func() over repeat runs, in seconds.
+    '''
+
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    args = sys.argv[1:]
+    rows = int(args[args.index("--rows") + 1]) if "--rows" in args else 1_000_000
+    keep = args[args.index("--keep") + 1] if "--keep" in args else None
+
+    folder = keep or tempfile.mkdtemp(prefix="weather-paging-")
+    os.makedirs(folder, exist_ok=True)
+    path = os.path.join(folder, f"weather-{rows}.db")
+    try:
+        if not os.path.exists(path):
+            build(path, rows, 50)
+        db = WeatherDB(path)
+
+        print(f"{'filter':>10} {'depth':>8} {'keyset':>10} {'offset':>12}")
+        for label, kwargs, where, params in FILTERS:
+            matching = db.conn.execute(f"SELECT COUNT(*) FROM weather WHERE {where}", params).fetchone()[0]
+            for fraction in (0.0, 0.01, 0.5, 0.99):
+                depth = int(matching * fraction)
+
+                # Cursor of the row just above the page (found once, outside the timing)
+                cursor = None
+                if depth:
+                    row = db.conn.execute(f"""
+                        SELECT timestamp, id FROM weather WHERE {where}
+                        ORDER BY timestamp DESC, id DESC LIMIT 1 OFFSET ?
+                    """, params + (depth - 1,)).fetchone()
+                    cursor = tuple(row)
+
+                keyset = best_of(lambda: db.get_history_page(before=cursor, **kwargs))
+                offset = best_of(lambda: db.conn.execute(f"""
+                    SELECT id, {HISTORY_SELECT} FROM weather WHERE {where}
+                    ORDER BY timestamp DESC, id DESC LIMIT ? OFFSET ?
+                """, params + (HISTORY_PAGE_SIZE + 1, depth)).fetchall(), repeat=2)
+                print(f"{label:>10} {depth:>8} {keyset * 1000:>8.3f}ms {offset * 1000:>10.3f}ms")
+        db.close()
+    finally:
+        if not keep:
+            shutil.rmtree(folder, ignore_errors=True)
+    print(f"{rows} rows; page = {HISTORY_PAGE_SIZE} rows; keyset includes the probe for newer pages")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""
+benchmarks/bench_history_view.py
+
+Measure the work behind the virtualized History tab at different table sizes:
+- window: fetch and format the visible rows (HistoryPager.rows + format_history_row)
+  for each step of a scroll pattern; the GUI does exactly this per redraw.
+- full: fetch and format every row at once, which is what showing the whole
+  table in a plain Treeview would take before a single item is inserted.
+
+Scroll patterns: mouse wheel (3 rows at a time), page down, and random jumps
+(scrollbar drags). Memory is the tracemalloc peak while scrolling.
+
+The Treeview itself is not driven (no display is needed); it holds the
+visible rows plus the overscan whatever the table size.
+
+Usage:
+    python benchmarks/bench_history_view.py [--rows 1000,1000000] [--keep DIR]
+"""
+
+import os
+import sys
+import time
+import random
+import shutil
+import tempfile
+import tracemalloc
+
+# Allow running from the repo root or the benchmarks folder
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from db import WeatherDB, HISTORY_SELECT
+from history_pager import HistoryPager
+from features.history import format_history_row, HISTORY_OVERSCAN
+from bench_stats import build
+
+
+# Rows on screen in the default window size
+VISIBLE = 18
+
+
+def percentile(values, q):
+    ordered = sorted(values)
+    return ordered[int(q * (len(ordered) - 1))]
+
+
+def scroll_steps(pattern, count, steps=500):
+
+    '''
+    Return the top positions visited by a scroll pattern.
+    '''
+
+    last = max(0, count - VISIBLE)
+    if pattern == "wheel":
+        return [min(i * 3, last) for i in range(steps)]
+    if pattern == "page":
+        return [min(i * VISIBLE, last) for i in range(steps)]
+    rng = random.Random(7)
+    return [rng.randint(0, last) for _ in range(steps)]
+
+
+def run_window(db, pattern):
+
+    '''
+    Time each redraw of a scroll pattern; returns (latencies, peak bytes, pager).
+    '''
+
+    pager = HistoryPager(db)
+    tracemalloc.start()
+    latencies = []
+    for top in scroll_steps(pattern, pager.count):
+        start = time.perf_counter()
+        window = pager.rows(top, top + VISIBLE + HISTORY_OVERSCAN)
+        [format_history_row(entry, float, "°C") for _, entry in window]
+        latencies.append(time.perf_counter() - start)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return latencies, peak, pager
+
+
+def run_full(db):
+
+    '''
+    Fetch and format the whole table; returns (seconds, peak bytes).
+    '''
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    rows = db.conn.execute(f"SELECT {HISTORY_SELECT} FROM weather ORDER BY timestamp DESC, id DESC").fetchall()
+    [format_history_row(entry, float, "°C") for entry in rows]
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def main():
+    args = sys.argv[1:]
+    sizes = [1000, 1_000_000]
+    if "--rows" in args:
+        sizes = [int(n) for n in args[args.index("--rows") + 1].split(",")]
+    keep = args[args.index("--keep") + 1] if "--keep" in args else None
+
+    folder = keep or tempfile.mkdtemp(prefix="weather-view-")
+    os.makedirs(folder, exist_ok=True)
+    try:
+        print(f"{'rows':>8} {'pattern':>7} {'p50':>9} {'p99':>9} {'max':>9} {'peak mem':>10} {'loads':>6} {'seeks':>6}")
+        for rows in sizes:
+            path = os.path.join(folder, f"weather-{rows}.db")
+            if not os.path.exists(path):
+                build(path, rows, 50)
+            db = WeatherDB(path)
+
+            for pattern in ("wheel", "page", "random"):
+                latencies, peak, pager = run_window(db, pattern)
+                print(f"{rows:>8} {pattern:>7} {percentile(latencies, 0.5) * 1000:>7.3f}ms "
+                      f"{percentile(latencies, 0.99) * 1000:>7.3f}ms {max(latencies) * 1000:>7.3f}ms "
+                      f"{peak / 1024:>8.0f}KB {pager.page_loads:>6} {pager.seeks:>6}")
+
+            elapsed, peak = run_full(db)
+            print(f"{rows:>8} {'full':>7} {elapsed * 1000:>7.1f}ms {'':>9} {'':>9} {peak / 1024:>8.0f}KB")
+            db.close()
+    finally:
+        if not keep:
+            shutil.rmtree(folder, ignore_errors=True)
+    print(f"window = {VISIBLE} visible rows + {HISTORY_OVERSCAN} overscan; 500 steps per pattern")
+
+
+if __name__ == "__main__":
+    main()
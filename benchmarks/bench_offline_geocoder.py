@@ -0,0 +1,109 @@
+"""
+benchmarks/bench_offline_geocoder.py
+
+Measure the offline city index at scale:
+- Build time and on-disk size for a city list (synthetic 200k cities by default).
+- Cold-start open time and Python heap growth (tracemalloc) when opening the index.
+- Per-query latency for prefix and fuzzy (one-typo) searches.
+
+Usage:
+    python benchmarks/bench_offline_geocoder.py [city.list.json] [--cities N]
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import tempfile
+import tracemalloc
+
+# Allow running from the repo root or the benchmarks folder
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from offline_geocoder import build_index, OfflineGeocoder
+
+
+SYLLABLES = ["ka", "lo", "mi", "san", "ber", "to", "ri", "na", "vel", "do", "mar", "ston", "ville", "grad", "burg", "po"]
+
+
+def synthetic_city_list(count, seed=7):
+
+    '''
+    Return a city.list.json-style list of count random cities.
+    '''
+
+    rng = random.Random(seed)
+    cities = []
+    for i in range(count):
+        name = "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))).title()
+        cities.append({
+            "id": i,
+            "name": name,
+            "state": f"S{rng.randrange(60)}",
+            "country": rng.choice(["US", "GB", "DE", "FR", "IN", "BR", "JP"]),
+            "coord": {"lat": rng.uniform(-90, 90), "lon": rng.uniform(-180, 180)},
+        })
+    return cities
+
+
+def time_queries(func, queries, repeat=3):
+
+    '''
+    Return the mean latency in microseconds of func(query) over all queries.
+    '''
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for q in queries:
+            func(q)
+    return (time.perf_counter() - start) / (repeat * len(queries)) * 1e6
+
+
+def main():
+    args = sys.argv[1:]
+    count = 200_000
+    if "--cities" in args:
+        count = int(args[args.index("--cities") + 1])
+        del args[args.index("--cities"):args.index("--cities") + 2]
+
+    workdir = tempfile.mkdtemp()
+    if args:
+        source = args[0]
+    else:
+        source = os.path.join(workdir, "city.list.json")
+        with open(source, "w") as f:
+            json.dump(synthetic_city_list(count), f)
+
+    index_path = os.path.join(workdir, "city_index.bin")
+
+    start = time.perf_counter()
+    written = build_index(source, index_path)
+    build_s = time.perf_counter() - start
+    print(f"Built index: {written} cities, {os.path.getsize(index_path) / 1e6:.1f} MB in {build_s:.2f} s")
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    geocoder = OfflineGeocoder(index_path)
+    open_ms = (time.perf_counter() - start) * 1000
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"Cold start: {open_ms:.3f} ms, Python heap peak {peak / 1024:.1f} KiB (index stays in the page cache)")
+
+    # Sample real names from the index, then derive prefixes and one-typo variants
+    rng = random.Random(1)
+    names = [geocoder._option(rng.randrange(len(geocoder)))["display"].split(",")[0] for _ in range(200)]
+    prefixes = [n[:rng.randint(2, len(n))] for n in names]
+    typos = []
+    for n in names:
+        i = rng.randrange(1, len(n))
+        typos.append(n[:i] + n[i + 1:])
+
+    print(f"Prefix search: {time_queries(geocoder.prefix_search, prefixes):.1f} us/query")
+    print(f"Fuzzy search:  {time_queries(geocoder.fuzzy_search, typos):.1f} us/query")
+    print(f"search():      {time_queries(geocoder.search, typos):.1f} us/query (typo queries)")
+    geocoder.close()
+
+
+if __name__ == "__main__":
+    main()
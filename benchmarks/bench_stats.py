@@ -0,0 +1,152 @@
+"""
+benchmarks/bench_stats.py
+
+Compare the WeatherDB.get_stats methods on synthetic histories:
+- summary: read the trigger-maintained summary row.
+- indexed: one index lookup per extreme plus average and most-searched queries.
+- single_pass: one GROUP BY city traversal plus a point lookup per extreme.
+
+Each database is bulk-loaded with the trigger and indexes dropped, then the
+schema is restored and the summaries rebuilt (build and rebuild times are
+reported too). Results of the three methods are checked against each other.
+
+Usage:
+    python benchmarks/bench_stats.py [--rows 10000,1000000,10000000] [--cities 50] [--keep DIR]
+"""
+
+import os
+import sys
+import time
+import shutil
+import tempfile
+
+# Allow running from the repo root or the benchmarks folder
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from db import WeatherDB, WEATHER_INDEXES, STATS_METHODS
+
+
+# Readings one minute apart, random values in plausible ranges, about 30% missing sea/ground level
+GENERATE_SQL = """
+    WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM n WHERE i < :rows)
+    INSERT INTO weather (timestamp, city, temp, feels_like, weather, condition_id, humidity, pressure,
+                         visibility, wind_speed, wind_deg, wind_gust, sea_level, grnd_level,
+                         sunrise, sunset, tz_offset)
+    SELECT
+        :start + i * 60,
+        'City ' || (abs(random()) % :cities),
+        -30 + (abs(random()) % 7500) / 100.0,
+        -35 + (abs(random()) % 8000) / 100.0,
+        'Generated', CASE abs(random()) % 5 WHEN 0 THEN 500 WHEN 1 THEN 800 WHEN 2 THEN 801 WHEN 3 THEN 600 ELSE 701 END,
+        abs(random()) % 101,
+        950 + abs(random()) % 100,
+        abs(random()) % 10001,
+        (abs(random()) % 3000) / 100.0,
+        abs(random()) % 360,
+        NULL,
+        CASE WHEN abs(random()) % 10 < 3 THEN NULL ELSE 980 + (abs(random()) % 5000) / 100.0 END,
+        CASE WHEN abs(random()) % 10 < 3 THEN NULL ELSE 900 + (abs(random()) % 10000) / 100.0 END,
+        :start + i * 60 - 21600 + abs(random()) % 7200,
+        :start + i * 60 + 21600 + abs(random()) % 7200,
+        ((abs(random()) % 25) - 12) * 3600
+    FROM n
+"""
+
+
+def build(path, rows, cities):
+
+    '''
+    Create a database at path holding rows synthetic readings; returns (load seconds, rebuild seconds).
+    '''
+
+    db = WeatherDB(path)
+    db.conn.execute("DROP TRIGGER weather_totals_insert")
+    for index_sql in WEATHER_INDEXES:
+        db.conn.execute("DROP INDEX " + index_sql.split(" IF NOT EXISTS ")[1].split(" ")[0])
+
+    start = time.perf_counter()
+    db.conn.execute(GENERATE_SQL, {"rows": rows, "cities": cities, "start": 1_700_000_000})
+    db.conn.commit()
+    db.create_table()
+    loaded = time.perf_counter()
+    db.rebuild_stats()
+    rebuilt = time.perf_counter()
+    db.close()
+    return loaded - start, rebuilt - loaded
+
+
+def best_of(func, repeat):
+
+    '''
+    Return (fastest wall time in seconds, last result) of func() over repeat runs.
+    '''
+
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def same_stats(a, b):
+
+    '''
+    Compare two stats dicts, ignoring ties (cities/times of equal extremes) and float summation order.
+    '''
+
+    # Which reading wins a tie is not specified; the sun "times" are clock values and are compared
+    tie_keys = {k for k in a if k.endswith(("_city", "_time"))} - {"earliest_sunrise_time", "latest_sunset_time"}
+    for key, value in a.items():
+        if key in tie_keys or key == "most_searched":
+            continue
+        other = b[key]
+        if key == "strongest_wind":
+            value, other = value.split(",")[0], other.split(",")[0]
+        if isinstance(value, float) and isinstance(other, float):
+            if abs(value - other) > 1e-6 * max(1.0, abs(value)):
+                return False
+        elif value != other:
+            return False
+    return True
+
+
+def main():
+    args = sys.argv[1:]
+    sizes = [10_000, 1_000_000, 10_000_000]
+    if "--rows" in args:
+        sizes = [int(n) for n in args[args.index("--rows") + 1].split(",")]
+    cities = int(args[args.index("--cities") + 1]) if "--cities" in args else 50
+    keep = args[args.index("--keep") + 1] if "--keep" in args else None
+
+    folder = keep or tempfile.mkdtemp(prefix="weather-stats-")
+    os.makedirs(folder, exist_ok=True)
+    print(f"{'rows':>10} {'load':>9} {'rebuild':>9} " + " ".join(f"{m:>12}" for m in STATS_METHODS) + "  match")
+    try:
+        for rows in sizes:
+            path = os.path.join(folder, f"weather-{rows}.db")
+            load = rebuild = float("nan")
+            if not os.path.exists(path):
+                load, rebuild = build(path, rows, cities)
+
+            db = WeatherDB(path)
+            repeat = 5 if rows <= 1_000_000 else 2
+            timings, results = [], []
+            for method in STATS_METHODS:
+                seconds, result = best_of(lambda: db.get_stats(method=method), 100 if method == "summary" else repeat)
+                timings.append(seconds)
+                results.append(result)
+            db.close()
+
+            match = all(same_stats(results[0], r) for r in results[1:])
+            print(f"{rows:>10} {load:>8.2f}s {rebuild:>8.2f}s " +
+                  " ".join(f"{t * 1000:>10.3f}ms" for t in timings) + f"  {'yes' if match else 'NO'}")
+    finally:
+        if not keep:
+            shutil.rmtree(folder, ignore_errors=True)
+    print(f"{cities} cities; load = bulk insert + index build, rebuild = WeatherDB.rebuild_stats; "
+          "method times are the best of several warm runs")
+
+
+if __name__ == "__main__":
+    main()
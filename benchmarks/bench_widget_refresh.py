@@ -0,0 +1,218 @@
+"""
+benchmarks/bench_widget_refresh.py
+
+Count the Tcl calls (and widgets created/destroyed) behind each refresh of the
+Statistics grid, the forecast blocks and the current-weather card:
+- repeat: the same data again (auto-refresh, tab change)
+- unit: the temperature unit toggled
+- change: new data (another reading or forecast)
+
+Every tkinter operation is one call into the Tcl interpreter, so the count is
+a display-independent measure of refresh work.
+
+Without --display the widgets live in a plain Tcl interpreter whose widget
+commands (frame, label, pack, grid, winfo, destroy) are minimal stand-ins:
+tkinter issues exactly the same calls, nothing is drawn. With --display a
+real Tk root is used and the wall time per refresh is meaningful too.
+
+Usage:
+    python benchmarks/bench_widget_refresh.py [--display] [--repeat 50]
+"""
+
+import os
+import sys
+import time
+import types
+import tempfile
+import datetime
+import tkinter as tk
+
+# Allow running from the repo root or the benchmarks folder
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from db import WeatherDB
+from models import WeatherReading, ForecastDay
+from gui.main_app import WeatherApp
+from features.stats import create_stats_tab, refresh_stats
+from features.forecast import create_forecast_tab, show_forecast_days, update_forecast_units
+
+
+# Tcl stand-ins for the Tk commands these views use (see module docstring)
+HEADLESS_TK = r"""
+array set ::kids {. {}}
+proc _parent {w} {
+    set parent [string range $w 0 [expr {[string last . $w] - 1}]]
+    if {$parent eq ""} { return . }
+    return $parent
+}
+proc _widget {w args} {
+    lappend ::kids([_parent $w]) $w
+    set ::kids($w) {}
+    proc $w {args} { return "" }
+    return $w
+}
+foreach cls {frame label} { interp alias {} $cls {} _widget }
+proc winfo {cmd args} {
+    if {$cmd eq "children"} { return $::kids([lindex $args 0]) }
+    return 0
+}
+proc destroy {args} {
+    foreach w $args {
+        if {![info exists ::kids($w)]} continue
+        destroy {*}$::kids($w)
+        unset ::kids($w)
+        rename $w ""
+        set siblings $::kids([_parent $w])
+        set i [lsearch -exact $siblings $w]
+        set ::kids([_parent $w]) [lreplace $siblings $i $i]
+    }
+}
+proc pack {args} { return "" }
+proc grid {args} { return "" }
+"""
+
+
+class CountingTcl:
+
+    '''
+    Wrap a Tcl interpreter and count the calls made through it.
+    '''
+
+    def __init__(self, interp):
+        self.interp = interp
+        self.calls = 0
+        self.created = 0
+        self.destroyed = 0
+
+    def call(self, *args):
+        if len(args) == 1 and isinstance(args[0], tuple):
+            args = args[0]
+        self.calls += 1
+        if args and args[0] in ("frame", "label"):
+            self.created += 1
+        elif args and args[0] == "destroy":
+            self.destroyed += 1
+        return self.interp.call(*args)
+
+    def __getattr__(self, name):
+        return getattr(self.interp, name)
+
+
+def make_root(display):
+
+    '''
+    Return (root, counter): a Tk root (or a headless Tcl one) whose widgets call through counter.
+    '''
+
+    if display:
+        root = tk.Tk()
+    else:
+        root = tk.Tcl()
+        root.tk.eval(HEADLESS_TK)
+    counter = CountingTcl(root.tk)
+    root.tk = counter
+    return root, counter
+
+
+def make_app(root, db):
+
+    '''
+    Return a WeatherApp holding just what the three views use (its __init__ builds the whole window).
+    '''
+
+    app = WeatherApp.__new__(WeatherApp)
+    app.root = root
+    app.db = db
+    app.temp_unit = "C"
+    app.city_entry = types.SimpleNamespace(get=lambda: "Paris, FR")
+    for name in ("stats_frame", "forecast_frame", "weather_info_frame"):
+        frame = tk.Frame(root, bg="black")
+        setattr(app, name, frame)
+    create_stats_tab(app)
+    create_forecast_tab(app)
+    app.create_weather_card()
+    return app
+
+
+def reading(i):
+    return WeatherReading(temp=12.5 + i, feels_like=11.0 + i, humidity=60 + i % 30, pressure=1010 + i % 9,
+                          visibility=9000, wind_speed=3.5, wind_deg=200, wind_gust=None, sea_level=1012,
+                          grnd_level=1001, sunrise=1_700_000_000, sunset=1_700_040_000, tz_offset=3600,
+                          condition_id=500 + i % 2, description="light rain")
+
+
+def forecast(i):
+    start = datetime.date(2024, 5, 1) + datetime.timedelta(days=i)
+    return [ForecastDay(date=start + datetime.timedelta(days=d), temp_min=8.0 + d + i, temp_max=15.0 + d,
+                        humidity=70, wind_speed=4.0, wind_deg=90 * d, visibility=10000, condition_id=800 - d,
+                        description="scattered clouds") for d in range(5)]
+
+
+def measure(counter, func, repeat):
+
+    '''
+    Run func(i) repeat times; returns (Tcl calls, widgets created, widgets destroyed, seconds) per run.
+    '''
+
+    func(0)
+    calls, created, destroyed = counter.calls, counter.created, counter.destroyed
+    start = time.perf_counter()
+    for i in range(repeat):
+        func(i)
+    elapsed = time.perf_counter() - start
+    return ((counter.calls - calls) / repeat, (counter.created - created) / repeat,
+            (counter.destroyed - destroyed) / repeat, elapsed / repeat)
+
+
+def toggle(app):
+    app.temp_unit = "F" if app.temp_unit == "C" else "C"
+
+
+def main():
+    args = sys.argv[1:]
+    display = "--display" in args
+    repeat = int(args[args.index("--repeat") + 1]) if "--repeat" in args else 50
+
+    with tempfile.TemporaryDirectory(prefix="weather-widgets-") as folder:
+        db = WeatherDB(os.path.join(folder, "weather.db"))
+        for i in range(20):
+            db.insert_reading(f"City {i % 4}", reading(i))
+        db.flush()
+
+        root, counter = make_root(display)
+        app = make_app(root, db)
+        days = forecast(0)
+
+        def unit_stats(i):
+            toggle(app)
+            refresh_stats(app)
+
+        def unit_forecast(i):
+            toggle(app)
+            update_forecast_units(app)
+
+        def unit_card(i):
+            toggle(app)
+            app.refresh_display("Paris, FR", reading(0))
+
+        cases = (
+            ("stats", "repeat", lambda i: refresh_stats(app)),
+            ("stats", "unit", unit_stats),
+            ("forecast", "repeat", lambda i: show_forecast_days(app, "Paris, FR", days)),
+            ("forecast", "unit", unit_forecast),
+            ("forecast", "change", lambda i: show_forecast_days(app, "Paris, FR", forecast(i))),
+            ("card", "repeat", lambda i: app.refresh_display("Paris, FR", reading(0))),
+            ("card", "unit", unit_card),
+            ("card", "change", lambda i: app.refresh_display("Paris, FR", reading(i), age=i * 60 or None)),
+        )
+
+        print(f"{'view':>9} {'case':>7} {'tcl calls':>10} {'created':>8} {'destroyed':>10} {'time':>10}")
+        for view, case, func in cases:
+            calls, created, destroyed, seconds = measure(counter, func, repeat)
+            print(f"{view:>9} {case:>7} {calls:>10.1f} {created:>8.1f} {destroyed:>10.1f} {seconds * 1000:>8.3f}ms")
+        db.close()
+    print(f"per refresh, mean of {repeat}; {'real Tk' if display else 'headless Tcl (times are not drawing times)'}")
+
+
+if __name__ == "__main__":
+    main()
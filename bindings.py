@@ -0,0 +1,126 @@
+"""
+bindings.py
+
+Persistent widgets that are updated in place instead of rebuilt.
+
+Views such as the Statistics grid, the forecast blocks and the weather card
+build their widgets once; each refresh then only pushes the options that
+actually changed. Every configure is one Tcl call, so an unchanged refresh
+costs nothing and a changed one costs one call per changed widget - no
+widgets are created or destroyed and nothing flickers.
+
+Provides:
+- Binding: A widget plus the options it shows; set() sends only changed options, show()/hide() remember the layout.
+- bind_label: Create a tk.Label and its Binding in one step.
+- WidgetPool: Reusable instances of a composite widget (e.g. one forecast day), grown on demand and hidden when unused.
+"""
+
+import tkinter as tk    # Widgets created by bind_label
+
+
+class Binding:
+
+    '''
+    One persistent widget and the option values it currently displays.
+
+    The widget is laid out with layout() (e.g. layout("grid", row=0, column=1));
+    hide() and show() then take it out of and back into that layout without
+    repeating calls when it is already in the requested state.
+    '''
+
+    __slots__ = ("widget", "options", "manager", "geometry", "visible")
+
+    def __init__(self, widget, **options):
+        self.widget = widget
+        self.options = dict(options)    # Values the widget was created or last configured with
+        self.manager = None             # "pack" or "grid", set by layout()
+        self.geometry = {}
+        self.visible = False
+
+    def set(self, **options):
+
+        '''
+        Configure only the options whose value differs from what is displayed.
+
+        Returns:
+            bool: True if the widget was reconfigured.
+        '''
+
+        changed = {key: value for key, value in options.items() if self.options.get(key) != value}
+        if not changed:
+            return False
+        self.widget.configure(**changed)
+        self.options.update(changed)
+        return True
+
+    def layout(self, manager, visible=True, **geometry):
+
+        '''
+        Place the widget with the "pack" or "grid" geometry manager and remember how, for show().
+
+        With visible=False the layout is only recorded; the widget appears on the first show().
+        '''
+
+        self.manager = manager
+        self.geometry = geometry
+        self.visible = False
+        self.show(visible)
+        return self
+
+    def show(self, visible=True):
+
+        '''
+        Put the widget back into its layout (or take it out when visible is False).
+        '''
+
+        if not visible:
+            self.hide()
+        elif not self.visible:
+            getattr(self.widget, self.manager)(**self.geometry)
+            self.visible = True
+
+    def hide(self):
+
+        '''
+        Take the widget out of its layout, keeping it (and its children) for later.
+        '''
+
+        if self.visible:
+            getattr(self.widget, self.manager + "_forget")()
+            self.visible = False
+
+
+def bind_label(parent, **options):
+
+    '''
+    Create a tk.Label with the given options and return its Binding (not laid out yet).
+    '''
+
+    return Binding(tk.Label(parent, **options), **options)
+
+
+class WidgetPool:
+
+    '''
+    Reusable instances of one composite widget, created by factory(index) on first need.
+
+    Items must have a show(visible) method (e.g. delegating to a Binding laid
+    out at creation); items beyond the number requested are hidden rather
+    than destroyed.
+    '''
+
+    def __init__(self, factory):
+        self.factory = factory
+        self.items = []
+
+    def take(self, count):
+
+        '''
+        Return the first count items, creating missing ones, showing them and hiding the rest.
+        '''
+
+        while len(self.items) < count:
+            self.items.append(self.factory(len(self.items)))
+        for index, item in enumerate(self.items):
+            item.show(index < count)
+        return self.items[:count]
@@ -0,0 +1,196 @@
+"""
+cache.py
+
+Response cache for the Weather Dashboard API layer.
+
+Provides ResponseCache, a thread-safe TTL + LRU cache for parsed JSON payloads:
+- make_key(endpoint, lat, lon): Build a cache key from an endpoint name and normalized coordinates.
+- get(key) / put(key, value, ttl): Look up and store payloads with a per-entry time-to-live.
+- get_stale(key): Return the last stored payload and its age even after it expired (stale-while-revalidate).
+- load() / save(): Optionally persist entries to a JSON file so they survive restarts.
+- stats(): Report hits, misses, expirations and evictions.
+"""
+
+import os                             # For checking and replacing the cache file
+import json                           # For persisting entries to disk
+import time                           # For wall-clock expiry times (valid across restarts)
+import threading                      # For guarding the cache from concurrent workers
+import logging                        # For reporting unreadable cache files
+from collections import OrderedDict   # For least-recently-used ordering
+
+
+# Coordinates are rounded to this many decimals (~110 m) before being used as a key
+COORD_PRECISION = 3
+
+
+class ResponseCache:
+
+    '''
+    Bounded, thread-safe cache mapping request keys to JSON payloads.
+
+    Each entry expires after its own TTL; when the cache is full the least
+    recently used entry is evicted. Expired entries are kept (up to max_stale
+    seconds after they were stored) so get_stale can serve them while a fresh
+    copy is fetched, or when the network is down.
+    '''
+
+    def __init__(self, max_entries=256, path=None, max_stale=86400):
+        # Entries are stored as key -> (stored_at, expires_at, value), oldest use first
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.max_entries = max_entries
+        self.path = path
+        self.max_stale = max_stale
+
+        # Hit/miss counters reported by stats()
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.evictions = 0
+
+    @staticmethod
+    def make_key(endpoint, lat, lon):
+
+        '''
+        Build a cache key such as "weather:51.507:-0.128" from an endpoint name and coordinates.
+        '''
+
+        return f"{endpoint}:{round(float(lat), COORD_PRECISION)}:{round(float(lon), COORD_PRECISION)}"
+
+    def get(self, key):
+
+        '''
+        Return the cached value for key, or None if it is missing or expired.
+        '''
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            _, expires_at, value = entry
+            if expires_at <= time.time():
+                # Keep the stale entry for get_stale, but report a miss
+                self.expired += 1
+                self.misses += 1
+                return None
+
+            # Mark as most recently used
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def get_stale(self, key):
+
+        '''
+        Return (value, age_seconds, fresh) for key, even if it has expired, or None.
+        Entries older than max_stale are dropped instead of being served.
+        '''
+
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+
+            stored_at, expires_at, value = entry
+            if now - stored_at > self.max_stale:
+                del self._entries[key]
+                return None
+            return value, now - stored_at, expires_at > now
+
+    def put(self, key, value, ttl):
+
+        '''
+        Store value under key for ttl seconds, evicting the least recently used entries if full.
+        '''
+
+        with self._lock:
+            now = time.time()
+            self._entries[key] = (now, now + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+
+        '''
+        Remove every entry (counters are kept).
+        '''
+
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+
+        '''
+        Return a dict of cache counters and the current hit rate.
+        '''
+
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "expired": self.expired,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+    def load(self):
+
+        '''
+        Load entries younger than max_stale from self.path, if persistence is enabled and the file exists.
+        '''
+
+        if not self.path or not os.path.exists(self.path):
+            return
+
+        try:
+            with open(self.path, "r") as f:
+                stored = json.load(f)
+        except (OSError, ValueError) as e:
+            logging.warning("Ignoring unreadable cache file %s: %s", self.path, e)
+            return
+
+        now = time.time()
+        with self._lock:
+            # Stored oldest-first, so re-inserting preserves LRU order
+            for item in stored:
+                try:
+                    key, stored_at, expires_at, value = item
+                except (TypeError, ValueError):
+                    # Entry written by an older cache format
+                    continue
+                if now - stored_at <= self.max_stale:
+                    self._entries[key] = (stored_at, expires_at, value)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def save(self):
+
+        '''
+        Write entries younger than max_stale to self.path (atomically via a temp file), if persistence is enabled.
+        '''
+
+        if not self.path:
+            return
+
+        now = time.time()
+        with self._lock:
+            stored = [
+                [key, stored_at, expires_at, value]
+                for key, (stored_at, expires_at, value) in self._entries.items()
+                if now - stored_at <= self.max_stale
+            ]
+
+        tmp_path = self.path + ".tmp"
+        try:
+            with open(tmp_path, "w") as f:
+                json.dump(stored, f)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logging.warning("Could not save cache file %s: %s", self.path, e)
@@ -4,7 +4,7 @@ constants.py
 UI footer text constants for the Weather Dashboard application.
 
 Contains descriptive strings displayed at the bottom of each tab:
-- HISTORY_FOOTER: Guidance for the History tab (recent entries)
+- HISTORY_FOOTER: Guidance for the History tab (all entries, newest first)
 - STATS_FOOTER: Explanation for the Statistics tab (summary data)
 - FORECAST_FOOTER: Note for the Forecast tab (predictive outlook)
 - TEA_SELECTOR_FOOTER: Explanation for the Tea Selector tab (personalized tea picks)
@@ -12,7 +12,7 @@ Contains descriptive strings displayed at the bottom of each tab:
 
 # Footer displayed in the History tab explaining its contents and sorting behavior
 HISTORY_FOOTER = (
-    "This tab shows the 50 most recent weather history entries. "
+    "This tab shows all weather history entries, newest first; scroll to load older ones. "
     "Columns can be sorted by clicking their headers."
 )
 
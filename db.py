@@ -5,302 +5,1445 @@ Database module for Weather Dashboard.
 
 Provides WeatherDB class to manage SQLite database:
 - Establish connection to data/weather.db
-- Initialize the weather table if needed
-- Insert new weather records with timestamps
-- Retrieve recent history and compute various statistics
+- Initialize the weather table if needed, upgrading older files in place (see SCHEMA_VERSION)
+- Insert new weather records with timestamps (insert_reading takes a models.WeatherReading)
+- Page through history with keyset cursors, sorting and filters (get_history_page)
+- Fetch only the readings added since a given row (get_history_since_id)
+- Compute various statistics (three interchangeable methods, see get_stats)
+- Keep running statistics in summary tables (rebuild_stats, or "python db.py rebuild-stats")
+- Write from any thread through a queued writer (WeatherWriter) that group-commits inserts
+
+Schema version 2 stores every value as a number: epoch-second timestamps and
+sun times (with the city's UTC offset), wind speed and direction in separate
+columns. Indexes on timestamp, city, temp, humidity and the other "extreme"
+columns let history and stats queries walk an index instead of scanning.
+Version 1 files (text wind/timestamps, no indexes) are converted in batches
+inside one transaction the first time they are opened.
+
+Schema version 3 adds weather_totals (one row) and weather_city_totals (one
+row per city). An AFTER INSERT trigger folds every new reading into both:
+counts and sums for the averages, plus the sort key and row id of each
+extreme in STAT_EXTREMES. get_stats reads one summary row (joined to the
+extreme rows by primary key) instead of querying the whole table. The app
+only ever appends readings; after editing or deleting rows by hand, run
+rebuild_stats to recompute the summaries.
+
+The file uses WAL journaling so readers never wait for the writer. Inserts
+are queued and committed by one writer thread in batches (one executemany
+and one commit per batch); every other thread reads through its own
+connection. Call flush() before reading back rows you just inserted.
 """
 
 import os
+import re
+import math
+import time
+import queue
+import atexit
 import sqlite3
+import logging
+import argparse
+import threading
 from datetime import datetime
+from dataclasses import dataclass
+from typing import Optional
+from models import CONDITION_GROUP_NAMES, condition_group_sql
+from utils import title_case, format_clock, format_timestamp, format_wind
 
 # Define the path for the SQLite database file inside the "data/" directory
 DB_PATH = os.path.join("data", "weather.db")
 
+# Stored in PRAGMA user_version; 0 means the original text-based table (version 1) or a new file
+SCHEMA_VERSION = 3
+
+# Rows converted per batch when upgrading a version 1 table
+MIGRATION_BATCH = 5000
+
+# How get_stats computes its result (see WeatherDB.get_stats); override with WEATHER_STATS_METHOD
+STATS_METHODS = ("summary", "indexed", "single_pass")
+STATS_METHOD = os.getenv("WEATHER_STATS_METHOD", "summary")
+
+# Connection pragmas (see https://sqlite.org/pragma.html); WAL makes NORMAL safe against corruption
+DB_SYNCHRONOUS = os.getenv("WEATHER_DB_SYNCHRONOUS", "NORMAL")                 # OFF, NORMAL, FULL or EXTRA
+DB_CACHE_SIZE = int(os.getenv("WEATHER_DB_CACHE_SIZE", "-16000"))             # Pages, or KiB when negative
+DB_MMAP_SIZE = int(os.getenv("WEATHER_DB_MMAP_SIZE", str(64 * 1024 * 1024)))  # Bytes read via mmap (0 = off)
+BUSY_TIMEOUT = 10.0                                                           # Seconds to wait for a lock
+
+# Group commit: the writer commits after WRITE_BATCH rows or WRITE_DELAY seconds, whichever comes first
+WRITE_BATCH = int(os.getenv("WEATHER_DB_WRITE_BATCH", "500"))
+WRITE_DELAY = float(os.getenv("WEATHER_DB_WRITE_DELAY", "0.05"))
+
+# Version 2 table: numeric columns only (besides city and description)
+CREATE_WEATHER_TABLE = """
+    CREATE TABLE IF NOT EXISTS weather (
+        id INTEGER PRIMARY KEY,
+        timestamp INTEGER NOT NULL,
+        city TEXT NOT NULL,
+        temp REAL,
+        feels_like REAL,
+        weather TEXT,
+        condition_id INTEGER,
+        humidity INTEGER,
+        pressure INTEGER,
+        visibility REAL,
+        wind_speed REAL,
+        wind_deg REAL,
+        wind_gust REAL,
+        sea_level REAL,
+        grnd_level REAL,
+        sunrise INTEGER,
+        sunset INTEGER,
+        tz_offset INTEGER
+    )
+"""
+
+# Sun times compared by local time of day, so "earliest sunrise" ignores the date
+SUNRISE_LOCAL = "((sunrise + tz_offset) % 86400)"
+SUNSET_LOCAL = "((sunset + tz_offset) % 86400)"
+
+# Condition group ("Rain", "Clear", ...) of a row, as indexed for history filters
+CONDITION_GROUP = condition_group_sql("condition_id")
+
+# Indexes backing history paging and every extreme in get_stats
+WEATHER_INDEXES = (
+    "CREATE INDEX IF NOT EXISTS idx_weather_timestamp ON weather(timestamp)",
+    "CREATE INDEX IF NOT EXISTS idx_weather_city ON weather(city, timestamp)",
+    f"CREATE INDEX IF NOT EXISTS idx_weather_condition ON weather({CONDITION_GROUP}, timestamp)",
+    "CREATE INDEX IF NOT EXISTS idx_weather_temp ON weather(temp)",
+    "CREATE INDEX IF NOT EXISTS idx_weather_humidity ON weather(humidity)",
+    "CREATE INDEX IF NOT EXISTS idx_weather_wind_speed ON weather(wind_speed)",
+    "CREATE INDEX IF NOT EXISTS idx_weather_sea_level ON weather(sea_level)",
+    "CREATE INDEX IF NOT EXISTS idx_weather_grnd_level ON weather(grnd_level)",
+    f"CREATE INDEX IF NOT EXISTS idx_weather_sunrise_local ON weather({SUNRISE_LOCAL})",
+    f"CREATE INDEX IF NOT EXISTS idx_weather_sunset_local ON weather({SUNSET_LOCAL})",
+)
+
+# Columns written by insert_weather and by the migration, in order
+INSERT_COLUMNS = ("timestamp", "city", "temp", "feels_like", "weather", "condition_id",
+                  "humidity", "pressure", "visibility", "wind_speed", "wind_deg", "wind_gust",
+                  "sea_level", "grnd_level", "sunrise", "sunset", "tz_offset")
+INSERT_SQL = (f"INSERT INTO weather ({', '.join(INSERT_COLUMNS)}) "
+              f"VALUES ({', '.join('?' * len(INSERT_COLUMNS))})")
+
+# Columns returned by get_all_history and get_history_page, in order (see features/history.py)
+HISTORY_SELECT = ("timestamp, city, temp, feels_like, weather, humidity, pressure, visibility, "
+                  "wind_speed, wind_deg, sea_level, grnd_level, sunrise, sunset, tz_offset")
+
+# Rows per history page
+HISTORY_PAGE_SIZE = 50
+
+# History sort columns -> SQL sort key (see get_history_page); keys that may be NULL need a second pass
+HISTORY_SORT_KEYS = {
+    "timestamp": "timestamp", "city": "city", "temp": "temp", "feels_like": "feels_like",
+    "weather": "weather", "humidity": "humidity", "pressure": "pressure", "visibility": "visibility",
+    "wind_speed": "wind_speed", "sea_level": "sea_level", "grnd_level": "grnd_level",
+    "sunrise": SUNRISE_LOCAL, "sunset": SUNSET_LOCAL,
+}
+NOT_NULL_SORT_KEYS = ("timestamp", "city")
+
+# Columns averaged by get_stats; the summary tables keep a non-NULL count and a sum of each
+STAT_SUMS = ("temp", "humidity", "pressure", "wind_speed", "sea_level", "grnd_level")
+
+# Extremes shown by get_stats: (name, SQL sort key, "MAX" or "MIN", column displayed)
+STAT_EXTREMES = (
+    ("hottest", "temp", "MAX", "temp"),
+    ("coldest", "temp", "MIN", "temp"),
+    ("most_humid", "humidity", "MAX", "humidity"),
+    ("strongest_wind", "wind_speed", "MAX", "wind_speed"),
+    ("highest_sea", "sea_level", "MAX", "sea_level"),
+    ("lowest_ground", "grnd_level", "MIN", "grnd_level"),
+    ("earliest_sunrise", SUNRISE_LOCAL, "MIN", "sunrise"),
+    ("latest_sunset", SUNSET_LOCAL, "MAX", "sunset"),
+)
+
+# Read after the displayed column for each extreme's row: (value, wind_deg, tz_offset, city, timestamp)
+EXTREME_SELECT = "wind_deg, tz_offset, city, timestamp"
+
+
+def _summary_columns():
+
+    '''
+    Column definitions shared by both summary tables: row count, per-column counts/sums, extreme keys and row ids.
+    '''
+
+    columns = ["count INTEGER NOT NULL DEFAULT 0"]
+    for column in STAT_SUMS:
+        columns += [f"{column}_count INTEGER NOT NULL DEFAULT 0", f"{column}_sum REAL NOT NULL DEFAULT 0"]
+    for name, _, _, _ in STAT_EXTREMES:
+        columns += [f"{name}_key REAL", f"{name}_id INTEGER"]
+    return ", ".join(columns)
+
+
+def _on_new_row(expression):
+
+    '''
+    Rewrite a weather-column expression to read the inserted row inside a trigger (temp -> NEW.temp).
+    '''
+
+    return re.sub(r"\b(" + "|".join(INSERT_COLUMNS) + r")\b", r"NEW.\1", expression)
+
+
+def _summary_update(table, where):
+
+    '''
+    SQL folding the inserted row (NEW) into the summary row of table selected by where.
+
+    SQLite evaluates every SET expression against the old row, so each extreme's
+    key and id are replaced together when the new value beats the stored key.
+    '''
+
+    sets = ["count = count + 1"]
+    for column in STAT_SUMS:
+        sets.append(f"{column}_count = {column}_count + (NEW.{column} IS NOT NULL)")
+        sets.append(f"{column}_sum = {column}_sum + COALESCE(NEW.{column}, 0)")
+    for name, key, kind, _ in STAT_EXTREMES:
+        new_key = _on_new_row(key)
+        better = (f"{new_key} IS NOT NULL AND ({name}_key IS NULL OR "
+                  f"{new_key} {'>' if kind == 'MAX' else '<'} {name}_key)")
+        sets.append(f"{name}_key = CASE WHEN {better} THEN {new_key} ELSE {name}_key END")
+        sets.append(f"{name}_id = CASE WHEN {better} THEN NEW.id ELSE {name}_id END")
+    return f"UPDATE {table} SET {', '.join(sets)} WHERE {where};"
+
+
+# Summary tables and the trigger maintaining them (schema version 3)
+SUMMARY_SCHEMA = (
+    f"""CREATE TABLE IF NOT EXISTS weather_totals (
+        id INTEGER PRIMARY KEY CHECK (id = 1),
+        {_summary_columns()},
+        top_city TEXT,
+        top_city_count INTEGER NOT NULL DEFAULT 0
+    )""",
+    f"""CREATE TABLE IF NOT EXISTS weather_city_totals (
+        city TEXT PRIMARY KEY,
+        {_summary_columns()}
+    )""",
+    f"""CREATE TRIGGER IF NOT EXISTS weather_totals_insert AFTER INSERT ON weather
+    BEGIN
+        {_summary_update("weather_totals", "id = 1")}
+        INSERT OR IGNORE INTO weather_city_totals (city) VALUES (NEW.city);
+        {_summary_update("weather_city_totals", "city = NEW.city")}
+        UPDATE weather_totals
+        SET top_city = NEW.city, top_city_count = (SELECT count FROM weather_city_totals WHERE city = NEW.city)
+        WHERE id = 1 AND (SELECT count FROM weather_city_totals WHERE city = NEW.city) > top_city_count;
+    END""",
+    "INSERT OR IGNORE INTO weather_totals (id) VALUES (1)",
+)
+
+
+def _stats_dict(count, averages, top_city, extremes):
+
+    '''
+    Format raw statistics into the dict returned by get_stats (and read by features/stats.py).
+
+    Parameters:
+        count (int): Number of readings
+        averages (dict): STAT_SUMS column -> mean of its non-NULL values, or None
+        top_city (tuple): (city, reading count) of the most searched city, or None
+        extremes (dict): STAT_EXTREMES name -> (value, wind_deg, tz_offset, city, timestamp), or None
+    '''
+
+    def extreme(name, render):
+        row = extremes.get(name)
+        if not row:
+            return "N/A", "N/A", "N/A"
+        value, wind_deg, tz_offset, city, timestamp = row
+        return render(value, wind_deg, tz_offset), city, format_timestamp(timestamp)
+
+    hottest, coldest = extremes.get("hottest"), extremes.get("coldest")
+    _, hottest_city, hottest_time = extreme("hottest", lambda v, d, tz: v)
+    _, coldest_city, coldest_time = extreme("coldest", lambda v, d, tz: v)
+    most_humid = extreme("most_humid", lambda v, d, tz: f"{v:.0f}%")
+    strongest_wind = extreme("strongest_wind", lambda v, d, tz: format_wind(v, d))
+    highest_sea = extreme("highest_sea", lambda v, d, tz: f"{v:.2f} hPa")
+    lowest_ground = extreme("lowest_ground", lambda v, d, tz: f"{v:.2f} hPa")
+    earliest_sunrise = extreme("earliest_sunrise", lambda v, d, tz: format_clock(v, tz or 0))
+    latest_sunset = extreme("latest_sunset", lambda v, d, tz: format_clock(v, tz or 0))
+
+    avg_sea_level, avg_ground_level = averages["sea_level"], averages["grnd_level"]
+    return {
+        "hottest_raw": hottest[0] if hottest else None,
+        "hottest_city": hottest_city,
+        "hottest_time": hottest_time,
+        "coldest_raw": coldest[0] if coldest else None,
+        "coldest_city": coldest_city,
+        "coldest_time": coldest_time,
+        "strongest_wind": strongest_wind[0],
+        "strongest_wind_city": strongest_wind[1],
+        "strongest_wind_time": strongest_wind[2],
+        "most_humid": most_humid[0],
+        "most_humid_city": most_humid[1],
+        "most_humid_time": most_humid[2],
+        "log_count": count,
+        "avg_temp": averages["temp"] or 0,
+        "avg_humidity": int(averages["humidity"]) if averages["humidity"] else 0,
+        "avg_pressure": int(averages["pressure"]) if averages["pressure"] else 0,
+        "avg_wind": averages["wind_speed"] or 0,
+        "most_searched": f"{top_city[0]} ({top_city[1]} times)" if top_city else "N/A",
+        "avg_sea_level": round(avg_sea_level, 2) if avg_sea_level is not None else "N/A",
+        "highest_sea_value": highest_sea[0],
+        "highest_sea_city": highest_sea[1],
+        "highest_sea_time": highest_sea[2],
+        "avg_ground_level": round(avg_ground_level, 2) if avg_ground_level is not None else "N/A",
+        "lowest_ground_value": lowest_ground[0],
+        "lowest_ground_city": lowest_ground[1],
+        "lowest_ground_time": lowest_ground[2],
+        "earliest_sunrise_time": earliest_sunrise[0],
+        "earliest_sunrise_city": earliest_sunrise[1],
+        "latest_sunset_time": latest_sunset[0],
+        "latest_sunset_city": latest_sunset[1],
+    }
+
+
+def _partial_aggregates():
+
+    '''
+    SQL aggregates computed per city in one traversal: row count, (non-NULL count, total) per STAT_SUMS column, extreme keys.
+    '''
+
+    aggregates = ["COUNT(*)"]
+    for column in STAT_SUMS:
+        aggregates += [f"COUNT({column})", f"TOTAL({column})"]
+    aggregates += [f"{kind}({key})" for _, key, kind, _ in STAT_EXTREMES]
+    return ", ".join(aggregates)
+
+
+def _merge_partials(partials):
+
+    '''
+    Combine per-city aggregate rows into statistics for all of them.
+
+    Each partial is (city, count, then a (non-NULL count, total) pair per STAT_SUMS
+    column, then one key per STAT_EXTREMES entry), as selected with _partial_aggregates.
+
+    Returns:
+        tuple: (count, (city, count) of the largest partial or None,
+                {column: (non-NULL count, total)}, {extreme name: winning key or None})
+    '''
+
+    count = sum(p[1] for p in partials)
+    top_city = tuple(max(partials, key=lambda p: p[1])[:2]) if partials else None
+
+    sums = {}
+    for i, column in enumerate(STAT_SUMS):
+        sums[column] = (sum(p[2 + 2 * i] for p in partials), sum(p[3 + 2 * i] for p in partials))
+
+    keys = {}
+    first_key = 2 + 2 * len(STAT_SUMS)
+    for i, (name, _, kind, _) in enumerate(STAT_EXTREMES):
+        candidates = [p[first_key + i] for p in partials if p[first_key + i] is not None]
+        if not candidates:
+            keys[name] = None
+        else:
+            keys[name] = max(candidates) if kind == "MAX" else min(candidates)
+    return count, top_city, sums, keys
+
+
+def _connect(db_path, synchronous=DB_SYNCHRONOUS, cache_size=DB_CACHE_SIZE, mmap_size=DB_MMAP_SIZE):
+
+    '''
+    Open a connection to db_path with the busy timeout and per-connection pragmas applied.
+
+    check_same_thread is off only so close() can run from another thread at
+    exit; each connection is still used by a single thread.
+    '''
+
+    if str(synchronous).upper() not in ("OFF", "NORMAL", "FULL", "EXTRA"):
+        raise ValueError(f"Invalid synchronous setting {synchronous!r}")
+    conn = sqlite3.connect(db_path, timeout=BUSY_TIMEOUT, check_same_thread=False)
+    conn.execute(f"PRAGMA synchronous = {synchronous}")
+    conn.execute(f"PRAGMA cache_size = {int(cache_size)}")
+    conn.execute(f"PRAGMA mmap_size = {int(mmap_size)}")
+    return conn
+
+
+def _legacy_number(value):
+
+    '''
+    Return a version 1 numeric cell as a float, or None for "N/A", text or NULL.
+    '''
+
+    if isinstance(value, (int, float)):
+        return float(value)
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _legacy_wind(text):
+
+    '''
+    Split a version 1 wind text such as "5.10 m/s, 270°" into (speed, degrees); missing parts are None.
+    '''
+
+    if not text:
+        return None, None
+    speed_part, _, dir_part = text.partition(",")
+    speed = _legacy_number(speed_part.replace("m/s", "").strip())
+    deg = _legacy_number(dir_part.replace("°", "").strip())
+    return speed, deg
+
+
+def _legacy_row(row):
+
+    '''
+    Convert one version 1 row into a tuple matching INSERT_COLUMNS, or None if its timestamp is unreadable.
+
+    Version 1 stored the timestamp and "HH:MM" sun times in the machine's local
+    time, so they are anchored to the reading's date and stored with the
+    machine's UTC offset; they render exactly as they did before.
+    '''
+
+    (timestamp, city, temp, feels_like, weather, humidity, pressure,
+     visibility, wind, sea_level, grnd_level, sunrise, sunset) = row
+
+    try:
+        taken = datetime.strptime(timestamp, "%Y-%m-%d %H:%M:%S")
+    except (TypeError, ValueError):
+        return None
+    epoch = int(taken.timestamp())
+    tz_offset = int(taken.astimezone().utcoffset().total_seconds())
+
+    def sun_time(text):
+        try:
+            clock = datetime.strptime(text, "%H:%M")
+        except (TypeError, ValueError):
+            return None
+        return int(taken.replace(hour=clock.hour, minute=clock.minute, second=0).timestamp())
+
+    wind_speed, wind_deg = _legacy_wind(wind)
+    return (
+        epoch, city or "", _legacy_number(temp), _legacy_number(feels_like), weather, None,
+        _legacy_number(humidity), _legacy_number(pressure), _legacy_number(visibility),
+        wind_speed, wind_deg, None, _legacy_number(sea_level), _legacy_number(grnd_level),
+        sun_time(sunrise), sun_time(sunset), tz_offset
+    )
+
+
+@dataclass
+class HistoryPage:
+
+    '''
+    One page of history rows, newest first, as returned by WeatherDB.get_history_page.
+
+    Cursors are (timestamp, id) keys: pass older as before= to get the next
+    older page, or newer as after= to go back. A cursor is None when there is
+    nothing further in that direction.
+    '''
+
+    __slots__ = ("rows", "ids", "older", "newer")
+
+    rows: list                    # HISTORY_SELECT tuples
+    ids: list                     # Row id of each entry in rows
+    older: Optional[tuple]        # Cursor of the last row, if older rows exist
+    newer: Optional[tuple]        # Cursor of the first row, if newer rows exist
+
+
+def _where(clauses):
+
+    '''
+    Join SQL conditions into a WHERE clause ("" when there are none).
+    '''
+
+    return "WHERE " + " AND ".join(clauses) if clauses else ""
+
+
+def _history_filters(city, since, until, condition):
+
+    '''
+    Build (conditions, params) for the history filters shared by the paging methods.
+
+    Equality on city or condition group lets idx_weather_city or idx_weather_condition
+    serve the timestamp order; since/until become a range on the same index.
+    '''
+
+    if condition is not None and condition not in CONDITION_GROUP_NAMES:
+        raise ValueError(f"Unknown condition {condition!r}; expected one of {', '.join(CONDITION_GROUP_NAMES)}")
+
+    filters, params = [], []
+    if city is not None:
+        filters.append("city = ?")
+        params.append(city)
+    if condition is not None:
+        filters.append(f"{CONDITION_GROUP} = ?")
+        params.append(condition)
+    if since is not None:
+        filters.append("timestamp >= ?")
+        params.append(since)
+    if until is not None:
+        filters.append("timestamp < ?")
+        params.append(until)
+    return filters, params
+
+
+def _history_sort_key(sort):
+
+    '''
+    Return (SQL sort key, whether it can be NULL) for a HISTORY_SORT_KEYS name.
+    '''
+
+    if sort not in HISTORY_SORT_KEYS:
+        raise ValueError(f"Unknown sort column {sort!r}; expected one of {', '.join(HISTORY_SORT_KEYS)}")
+    return HISTORY_SORT_KEYS[sort], sort not in NOT_NULL_SORT_KEYS
+
+
+# Queue markers for WeatherWriter
+_STOP = object()
+
+
+class WeatherWriter:
+
+    '''
+    Background thread owning the only write connection to the weather database.
+
+    Rows queued with put() are inserted in groups: the writer takes the first
+    waiting row, collects more for up to delay seconds (or batch_size rows),
+    then inserts them with one executemany and one commit. flush() forces a
+    commit of everything queued so far and waits for it.
+
+    If a group fails to insert, its rows are retried one by one and the bad
+    ones are logged and dropped (see last_error); the thread keeps running. If the thread stops anyway (or after close()),
+    put() and flush() raise RuntimeError instead of queueing rows that would
+    never be written or waiting forever.
+    '''
+
+    def __init__(self, db_path, pragmas=(), batch_size=WRITE_BATCH, delay=WRITE_DELAY):
+        self.db_path = db_path
+        self.pragmas = pragmas
+        self.batch_size = max(1, batch_size)
+        self.delay = delay
+        self.queue = queue.Queue()
+
+        # Counters for diagnostics and benchmarks
+        self.rows_written = 0
+        self.commits = 0
+        self.last_error = None
+
+        # Set once the thread has stopped; the lock orders it against put() and flush()
+        self.stopped = False
+        self._state_lock = threading.Lock()
+
+        self.thread = threading.Thread(target=self._run, name="weather-db-writer", daemon=True)
+        self.thread.start()
+
+    def put(self, row):
+
+        '''
+        Queue one row (a tuple matching INSERT_COLUMNS) for insertion.
+
+        Raises:
+            RuntimeError: If the writer thread has stopped.
+        '''
+
+        with self._state_lock:
+            self._check_running()
+            self.queue.put(row)
+
+    def flush(self, timeout=None):
+
+        '''
+        Wait until every row queued before this call is committed; returns False on timeout.
+
+        Raises:
+            RuntimeError: If the writer thread has stopped (before or while waiting).
+        '''
+
+        done = threading.Event()
+        with self._state_lock:
+            self._check_running()
+            self.queue.put(done)
+        if not done.wait(timeout):
+            return False
+        if getattr(done, "dropped", False):
+            raise RuntimeError(f"Weather database writer has stopped (last error: {self.last_error})")
+        return True
+
+    def _check_running(self):
+        if self.stopped:
+            raise RuntimeError(f"Weather database writer has stopped (last error: {self.last_error})")
+
+    def close(self, timeout=None):
+
+        '''
+        Commit the remaining rows and stop the writer thread.
+        '''
+
+        with self._state_lock:
+            if self.stopped:
+                return
+            self.queue.put(_STOP)
+        self.thread.join(timeout)
+
+    def _run(self):
+        try:
+            conn = _connect(self.db_path, *self.pragmas)
+            try:
+                while True:
+                    batch, waiters, stop = self._collect()
+                    written = False
+                    try:
+                        if batch:
+                            self._write(conn, batch)
+                        written = True
+                    finally:
+                        # Release flush() callers even if the write went wrong
+                        for done in waiters:
+                            done.dropped = not written
+                            done.set()
+                    if stop:
+                        return
+            finally:
+                conn.close()
+        except Exception as e:
+            self.last_error = e
+            logging.exception("Weather database writer stopped")
+        finally:
+            self._stop()
+
+    def _stop(self):
+
+        '''
+        Mark the writer stopped and wake every flush() still waiting in the queue.
+        '''
+
+        with self._state_lock:
+            self.stopped = True
+            dropped = 0
+            while True:
+                try:
+                    item = self.queue.get_nowait()
+                except queue.Empty:
+                    break
+                if isinstance(item, threading.Event):
+                    item.dropped = True     # Tells flush() its rows were never committed
+                    item.set()
+                elif item is not _STOP:
+                    dropped += 1
+        if dropped:
+            logging.error("Dropped %d queued weather rows: the database writer stopped", dropped)
+
+    def _collect(self):
+
+        '''
+        Block for the next queue item, then gather a group: returns (rows, flush events, stop requested).
+        '''
+
+        batch, waiters = [], []
+        item = self.queue.get()
+        deadline = time.monotonic() + self.delay
+        while True:
+            if item is _STOP:
+                return batch, waiters, True
+            if isinstance(item, threading.Event):
+                # A flush commits what has been gathered right away
+                waiters.append(item)
+                return batch, waiters, False
+            batch.append(item)
+            if len(batch) >= self.batch_size:
+                return batch, waiters, False
+            try:
+                item = self.queue.get(timeout=max(0.0, deadline - time.monotonic()))
+            except queue.Empty:
+                return batch, waiters, False
+
+    def _write(self, conn, batch):
+        try:
+            conn.executemany(INSERT_SQL, batch)
+            conn.commit()
+            self.rows_written += len(batch)
+            self.commits += 1
+        except Exception as e:
+            # Bad rows (e.g. an int too large for SQLite) or database errors: never let them stop the thread
+            self.last_error = e
+            try:
+                conn.rollback()
+            except sqlite3.Error:
+                pass
+            if len(batch) > 1:
+                # Retry row by row so one bad row does not take the rest of the group with it
+                for row in batch:
+                    self._write(conn, [row])
+            else:
+                logging.error("Dropped a weather row after a database error: %s", e)
+
+
 class WeatherDB:
 
     '''
     A class to manage storing and retrieving weather data using a SQLite database file.
+
+    Safe to share between threads: inserts go through a WeatherWriter, and
+    each thread reads through its own connection (see conn).
     '''
 
-    def __init__(self, db_path=DB_PATH):
-        # Establish a connection to the SQLite database
-        self.conn = sqlite3.connect(db_path)
+    def __init__(self, db_path=DB_PATH, synchronous=DB_SYNCHRONOUS, cache_size=DB_CACHE_SIZE,
+                 mmap_size=DB_MMAP_SIZE, write_batch=WRITE_BATCH, write_delay=WRITE_DELAY):
+        self.db_path = db_path
+        self.pragmas = (synchronous, cache_size, mmap_size)
+
+        # One connection per thread, all tracked so close() can release them
+        self._local = threading.local()
+        self._connections = []
+        self._connections_lock = threading.Lock()
 
-        # Create the "weather" table if it does not exist
+        # WAL is persistent in the file: readers and the writer no longer block each other
+        self.conn.execute("PRAGMA journal_mode = WAL")
+
+        # Create the "weather" table if it does not exist, or upgrade an older one
         self.create_table()
 
+        # Start the writer once the schema is in place
+        self.writer = WeatherWriter(db_path, self.pragmas, write_batch, write_delay)
+        atexit.register(self.close)
+
+    @property
+    def conn(self):
+
+        '''
+        The calling thread's connection, opened on first use (for reads and maintenance commands).
+        '''
+
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = _connect(self.db_path, *self.pragmas)
+            self._local.conn = conn
+            with self._connections_lock:
+                self._connections.append(conn)
+        return conn
+
+    def flush(self, timeout=None):
+
+        '''
+        Wait until every queued insert is committed (call before reading back new rows).
+
+        Returns:
+            bool: False if timeout expired first.
+        '''
+
+        return self.writer.flush(timeout)
+
+    def close(self):
+
+        '''
+        Commit queued inserts, stop the writer and close every connection.
+        '''
+
+        atexit.unregister(self.close)
+        self.writer.close()
+        with self._connections_lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections.clear()
+        self._local = threading.local()
+
     def create_table(self):
 
         '''
-        Create the "weather" table to store weather records. Fields cover various weather parameters.
+        Create the "weather" table, its indexes and the summary tables, upgrading older schema versions first.
         '''
 
         # Get a cursor object for executing SQL statements
         cur = self.conn.cursor()
 
-        # Execute a SQL command to create the table if it does not already exist
-        cur.execute("""
-            CREATE TABLE IF NOT EXISTS weather (
-                timestamp TEXT,
-                city TEXT,
-                temp REAL,
-                feels_like REAL,
-                weather TEXT,
-                humidity INTEGER,
-                pressure INTEGER,
-                visibility REAL,
-                wind TEXT,
-                sea_level REAL,
-                grnd_level REAL,
-                sunrise TEXT,
-                sunset TEXT
+        version = cur.execute("PRAGMA user_version").fetchone()[0]
+        if version > SCHEMA_VERSION:
+            raise sqlite3.DatabaseError(
+                f"Database schema version {version} is newer than this app supports ({SCHEMA_VERSION})"
             )
-        """)
+
+        # An unversioned weather table with a text "wind" column is the original schema (a
+        # table without it was just created by another connection that has not set the version yet)
+        columns = {row[1] for row in cur.execute("PRAGMA table_info(weather)")}
+        if version == 0 and "wind" in columns:
+            self.migrate_v1()
+            version = 2
+
+        # Execute SQL commands to create the tables, indexes and trigger if they do not already exist
+        cur.execute(CREATE_WEATHER_TABLE)
+        for sql in WEATHER_INDEXES + SUMMARY_SCHEMA:
+            cur.execute(sql)
 
         # Commit the changes to persist the table creation
         self.conn.commit()
 
-    def insert_weather(self, city, temp, feels_like, weather, humidity, pressure,
-                       visibility, wind, sea_level, grnd_level, sunrise, sunset):
-        
+        # Version 2 rows were stored before the trigger existed
+        if version == 2:
+            self.rebuild_stats()
+        cur.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    def migrate_v1(self, batch_size=MIGRATION_BATCH):
+
+        '''
+        Convert a version 1 "weather" table to version 2 in place.
+
+        Rows are read and converted batch_size at a time (by rowid) so memory
+        stays flat on large files. Everything runs in one transaction: if the
+        migration fails, the original table is left untouched.
+
+        Returns:
+            int: Number of rows migrated (rows with an unreadable timestamp are dropped).
+        '''
+
+        cur = self.conn.cursor()
+        migrated = 0
+        try:
+            cur.execute("BEGIN IMMEDIATE")
+            cur.execute("ALTER TABLE weather RENAME TO weather_v1")
+            cur.execute(CREATE_WEATHER_TABLE)
+
+            last_rowid = 0
+            while True:
+                rows = cur.execute("""
+                    SELECT rowid, timestamp, city, temp, feels_like, weather, humidity, pressure,
+                    visibility, wind, sea_level, grnd_level, sunrise, sunset
+                    FROM weather_v1
+                    WHERE rowid > ?
+                    ORDER BY rowid
+                    LIMIT ?
+                """, (last_rowid, batch_size)).fetchall()
+                if not rows:
+                    break
+                last_rowid = rows[-1][0]
+
+                converted = [c for c in (_legacy_row(r[1:]) for r in rows) if c is not None]
+                cur.executemany(INSERT_SQL, converted)
+                migrated += len(converted)
+
+            # Build indexes once, after the bulk copy
+            cur.execute("DROP TABLE weather_v1")
+            for index_sql in WEATHER_INDEXES:
+                cur.execute(index_sql)
+            cur.execute("PRAGMA user_version = 2")
+            self.conn.commit()
+        except sqlite3.DatabaseError:
+            self.conn.rollback()
+            raise
+
+        logging.info("Migrated %d weather rows to schema version 2", migrated)
+        return migrated
+
+    def insert_weather(self, city, temp, feels_like, weather, humidity, pressure, visibility,
+                       wind_speed, wind_deg, sea_level, grnd_level, sunrise, sunset,
+                       tz_offset=0, wind_gust=None, condition_id=None, timestamp=None):
+
         '''
-        Insert a new weather record into the database with the current timestamp.
+        Queue a new weather record for the writer, stamped with the current time by default.
+
+        Returns immediately; the row is committed with the next group (use flush() to wait).
 
         Parameters:
             city (str): Name of the city
-            temp (float): Current temperature
-            feels_like (float): "Feels like" temperature
+            temp (float): Current temperature in °C
+            feels_like (float): "Feels like" temperature in °C
             weather (str): Weather description
             humidity (int): Humidity percentage
             pressure (int): Atmospheric pressure in hPa
-            visibility (float): Visibility in meters
-            wind (str): Wind speed and direction (e.g., "5.1 m/s, NW")
-            sea_level (float): Sea level pressure
-            grnd_level (float): Ground level pressure
-            sunrise (str): Sunrise time as text
-            sunset (str): Sunset time as text
+            visibility (float): Visibility in meters, or None
+            wind_speed (float): Wind speed in m/s
+            wind_deg (float): Wind direction in degrees, or None
+            sea_level (float): Sea level pressure, or None
+            grnd_level (float): Ground level pressure, or None
+            sunrise (int): Sunrise as UTC epoch seconds
+            sunset (int): Sunset as UTC epoch seconds
+            tz_offset (int): City's offset from UTC in seconds
+            wind_gust (float): Gust speed in m/s, or None
+            condition_id (int): OpenWeatherMap condition id, or None
+            timestamp (int): UTC epoch seconds of the reading (defaults to now)
         '''
 
-        # Prepare a cursor for insertion
-        cur = self.conn.cursor()
+        if timestamp is None:
+            timestamp = int(datetime.now().timestamp())
 
-        # Execute the INSERT statement, including a formatted timestamp on line 83
-        cur.execute("""
-            INSERT INTO weather (timestamp, city, temp, feels_like, weather,
-            humidity, pressure, visibility, wind,
-            sea_level, grnd_level, sunrise, sunset)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
-            datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-            city, temp, feels_like, weather,
-            humidity, pressure, visibility, wind,
-            sea_level, grnd_level, sunrise, sunset
+        # Hand the row to the writer thread, which commits it with its group
+        self.writer.put((
+            timestamp, city, temp, feels_like, weather, condition_id,
+            humidity, pressure, visibility, wind_speed, wind_deg, wind_gust,
+            sea_level, grnd_level, sunrise, sunset, tz_offset
         ))
-        self.conn.commit()
 
-    def get_all_history(self):
+    def insert_reading(self, city, reading):
+
+        '''
+        Insert a WeatherReading for city.
+
+        Parameters:
+            city (str): Name of the city
+            reading (WeatherReading): Reading returned by api.fetch_weather_by_coords
+        '''
+
+        self.insert_weather(
+            city=city,
+            temp=reading.temp,
+            feels_like=reading.feels_like,
+            weather=title_case(reading.description),
+            humidity=reading.humidity,
+            pressure=reading.pressure,
+            visibility=reading.visibility,
+            wind_speed=reading.wind_speed,
+            wind_deg=reading.wind_deg,
+            sea_level=reading.sea_level,
+            grnd_level=reading.grnd_level,
+            sunrise=reading.sunrise,
+            sunset=reading.sunset,
+            tz_offset=reading.tz_offset,
+            wind_gust=reading.wind_gust,
+            condition_id=reading.condition_id
+        )
+
+    def get_all_history(self, limit=HISTORY_PAGE_SIZE):
 
         '''
-        Retrieve the most recent 50 weather entries, ordered by timestamp descending.
+        Retrieve the most recent weather entries (the first page of get_history_page).
 
         Returns:
-            list of tuples: Each tuple represents a stored weather record.
+            list of tuples: (timestamp, city, temp, feels_like, weather, humidity, pressure,
+            visibility, wind_speed, wind_deg, sea_level, grnd_level, sunrise, sunset, tz_offset),
+            all raw values (epoch seconds, °C, m/s, ...).
         '''
 
-        # Prepare cursor for querying the database
-        cur = self.conn.cursor()
+        return self.get_history_page(limit=limit).rows
+
+    def get_history_page(self, limit=HISTORY_PAGE_SIZE, before=None, after=None,
+                         city=None, since=None, until=None, condition=None,
+                         sort="timestamp", descending=True):
+
+        '''
+        Return one page of history using keyset pagination (newest first by default).
+
+        Pages are addressed by the (sort value, id) key of a boundary row rather
+        than an OFFSET, so every page is an index range scan of limit rows no
+        matter how deep it is. Depending on the filters the scan runs on
+        idx_weather_timestamp, idx_weather_city or idx_weather_condition; the
+        row id is the implicit last column of each, which breaks ties.
+
+        Other sort columns use their own index where one exists (temp, humidity,
+        wind_speed, sea_level, grnd_level, sunrise, sunset). Readings missing the
+        sort value always come last, ordered by id.
 
-        # Execute the SELECT statement to fetch the last 50 entries
-        cur.execute("""
-            SELECT timestamp, city, temp, feels_like, weather, humidity, pressure,
-            visibility, wind, sea_level, grnd_level, sunrise, sunset
-            FROM weather 
-            ORDER BY timestamp DESC 
-            LIMIT 50
-        """
+        "Older" and "newer" below mean further down and further up the list; with
+        the default sort they are literally older and newer readings.
+
+        Parameters:
+            limit (int): Maximum rows on the page
+            before (tuple): Cursor (HistoryPage.older) - return the rows below it
+            after (tuple): Cursor (HistoryPage.newer) - return the rows above it
+            city (str): Only this city
+            since (int): Only readings at or after this UTC epoch second
+            until (int): Only readings before this UTC epoch second
+            condition (str): Only this condition group, one of models.CONDITION_GROUP_NAMES
+            sort (str): Column to order by, one of HISTORY_SORT_KEYS
+            descending (bool): Largest values first
+
+        Returns:
+            HistoryPage: Rows plus cursors for the neighbouring pages.
+
+        Raises:
+            ValueError: If both before and after are given, or condition or sort is unknown.
+        '''
+
+        if before is not None and after is not None:
+            raise ValueError("Pass either before or after, not both")
+        filters, params = _history_filters(city, since, until, condition)
+        key, nullable = _history_sort_key(sort)
+
+        def walk(cursor, down, count):
+            return self._history_walk(filters, params, key, nullable, descending, cursor, down, count)
+
+        # Fetch one extra row to learn whether the scan direction continues
+        down = after is None
+        rows = walk(after if after is not None else before, down, limit + 1)
+        more = len(rows) > limit
+        rows = rows[:limit]
+        if not down:
+            rows.reverse()
+        if not rows:
+            return HistoryPage(rows=[], ids=[], older=None, newer=None)
+
+        first = (rows[0][1], rows[0][0])
+        last = (rows[-1][1], rows[-1][0])
+        if down:
+            has_older = more
+            has_newer = before is not None and bool(walk(first, False, 1))
+        else:
+            has_newer = more
+            has_older = bool(walk(last, True, 1))
+
+        return HistoryPage(
+            rows=[row[2:] for row in rows],
+            ids=[row[0] for row in rows],
+            older=last if has_older else None,
+            newer=first if has_newer else None,
         )
 
-        # Return all fetched rows as a list
-        return cur.fetchall()
+    def _history_walk(self, filters, params, key, nullable, descending, cursor, down, count):
+
+        '''
+        Return up to count rows (id, sort value, *HISTORY_SELECT) next to cursor, in walking order.
+
+        The list is the rows with a sort value, ordered by (value, id), followed by
+        the rows without one, ordered by id. Walking down starts in whichever part
+        the cursor is in and continues into the NULL part; walking up does the reverse.
+        '''
+
+        # Part order for this walk: True = rows with a NULL sort value
+        in_nulls = cursor is not None and cursor[0] is None
+        if down:
+            parts = [True] if in_nulls else [False, True]
+        else:
+            parts = [True, False] if in_nulls else [False]
+        if not nullable:
+            parts = [p for p in parts if not p]
+
+        forward = descending if down else not descending
+        order, op = ("DESC", "<") if forward else ("ASC", ">")
+
+        rows = []
+        for nulls in parts:
+            where, args = list(filters), list(params)
+            if nulls:
+                where.append(f"{key} IS NULL")
+                if in_nulls:
+                    where.append(f"id {op} ?")
+                    args.append(cursor[1])
+                order_by = f"id {order}"
+            else:
+                if nullable:
+                    where.append(f"{key} IS NOT NULL")
+                if cursor is not None and not in_nulls:
+                    where.append(f"({key}, id) {op} (?, ?)")
+                    args.extend(cursor)
+                order_by = f"{key} {order}, id {order}"
+
+            rows += self.conn.execute(f"""
+                SELECT id, {key}, {HISTORY_SELECT} FROM weather
+                {_where(where)}
+                ORDER BY {order_by}
+                LIMIT ?
+            """, args + [count - len(rows)]).fetchall()
+            if len(rows) >= count:
+                break
+        return rows
+
+    def count_history(self, city=None, since=None, until=None, condition=None):
+
+        '''
+        Return how many readings match the history filters (see get_history_page).
+
+        Without a date range or condition the count comes from the summary tables.
+        '''
+
+        if since is None and until is None and condition is None:
+            if city is None:
+                row = self.conn.execute("SELECT count FROM weather_totals WHERE id = 1").fetchone()
+            else:
+                row = self.conn.execute("SELECT count FROM weather_city_totals WHERE city = ?", (city,)).fetchone()
+            return row[0] if row else 0
+
+        filters, params = _history_filters(city, since, until, condition)
+        return self.conn.execute(f"SELECT COUNT(*) FROM weather {_where(filters)}", params).fetchone()[0]
+
+    def history_state(self, city=None, since=None, until=None, condition=None):
+
+        '''
+        Return (matching row count, newest row id) from one consistent snapshot.
+
+        The id is the watermark for get_history_since_id: every row up to it is
+        included in the count, every later row is not. It is 0 for an empty table.
+        '''
+
+        # One read transaction, so a commit from the writer cannot fall between the two reads
+        self.conn.execute("BEGIN")
+        try:
+            count = self.count_history(city, since, until, condition)
+            newest = self.conn.execute("SELECT MAX(id) FROM weather").fetchone()[0] or 0
+        finally:
+            self.conn.execute("COMMIT")
+        return count, newest
+
+    def get_history_since_id(self, last_id, city=None, since=None, until=None, condition=None):
+
+        '''
+        Return the readings added after row last_id that match the history filters.
+
+        A rowid range scan (NOT INDEXED keeps the planner off the filter
+        indexes), so the cost depends only on how many rows were added.
+
+        Returns:
+            tuple: (rows, newest id) - rows are (id, *HISTORY_SELECT) ordered newest
+            first, like get_history_page; the id is the next watermark.
+        '''
+
+        filters, params = _history_filters(city, since, until, condition)
+        self.conn.execute("BEGIN")
+        try:
+            rows = self.conn.execute(f"""
+                SELECT id, {HISTORY_SELECT} FROM weather NOT INDEXED
+                {_where(["id > ?"] + filters)}
+            """, [last_id] + params).fetchall()
+            newest = self.conn.execute("SELECT MAX(id) FROM weather").fetchone()[0] or 0
+        finally:
+            self.conn.execute("COMMIT")
+        rows.sort(key=lambda row: (row[1], row[0]), reverse=True)
+        return rows, max(newest, last_id)
+
+    def get_history_cursor(self, position, city=None, since=None, until=None, condition=None,
+                           sort="timestamp", descending=True):
+
+        '''
+        Return the cursor to pass as before= so that a page starts at row number position.
+
+        Used to jump (e.g. dragging a scrollbar); this one lookup skips rows with
+        OFFSET, after which paging continues with cursors.
+
+        Returns:
+            tuple: Cursor of the row just above position, or None for position 0 or past the end.
+        '''
+
+        if position <= 0:
+            return None
+        filters, params = _history_filters(city, since, until, condition)
+        key, nullable = _history_sort_key(sort)
+        order = "DESC" if descending else "ASC"
+
+        values = filters + ([f"{key} IS NOT NULL"] if nullable else [])
+        row = self.conn.execute(f"""
+            SELECT {key}, id FROM weather {_where(values)}
+            ORDER BY {key} {order}, id {order} LIMIT 1 OFFSET ?
+        """, params + [position - 1]).fetchone()
+        if row or not nullable:
+            return tuple(row) if row else None
+
+        # Past the rows with a value: continue into the NULL part
+        with_values = self.conn.execute(f"SELECT COUNT(*) FROM weather {_where(values)}", params).fetchone()[0]
+        row = self.conn.execute(f"""
+            SELECT id FROM weather {_where(filters + [f"{key} IS NULL"])}
+            ORDER BY id {order} LIMIT 1 OFFSET ?
+        """, params + [position - 1 - with_values]).fetchone()
+        return (None, row[0]) if row else None
+
+    def explain(self, sql, params=()):
+
+        '''
+        Return SQLite's query plan for sql as a list of detail strings (for checking index use).
+        '''
+
+        return [row[-1] for row in self.conn.execute(f"EXPLAIN QUERY PLAN {sql}", params)]
+
+    def get_stats(self, city=None, method=None):
+
+        '''
+        Compute the statistics shown on the stats tab.
+
+        Parameters:
+            city (str): Limit the statistics to one city (default: all readings)
+            method (str): One of STATS_METHODS (default: STATS_METHOD)
+                "summary"      read the trigger-maintained summary row (summary_stats)
+                "indexed"      one index lookup per extreme plus average/top-city queries (compute_stats)
+                "single_pass"  one traversal of the table plus a point lookup per extreme (single_pass_stats)
+
+        Returns:
+            dict: Contains keys for extremes (hottest, coldest, most humid, strongest wind,
+                  highest sea level, lowest ground level), averages, and most-searched city.
+                  Empty when there are no readings or the database cannot be read.
+        '''
+
+        method = method or STATS_METHOD
+        if method == "summary":
+            return self.summary_stats(city)
+        if method == "indexed":
+            return self.compute_stats(city)
+        if method == "single_pass":
+            return self.single_pass_stats(city)
+        raise ValueError(f"Unknown stats method {method!r}; expected one of {', '.join(STATS_METHODS)}")
 
-    def get_stats(self):
+    def summary_stats(self, city=None):
 
         '''
-        Compute various statistics from the stored weather data.
+        Read the statistics from the summary tables.
+
+        The summary row is joined to each extreme's reading by primary key, so
+        the cost does not grow with the number of stored readings.
+
+        Parameters:
+            city (str): Limit the statistics to one city (default: all readings)
 
         Returns:
-            dict: Contains keys for extremes (hottest, coldest, most humid, strongest wind, 
+            dict: Contains keys for extremes (hottest, coldest, most humid, strongest wind,
                   highest sea level, lowest ground level), averages, and most-searched city.
+                  Empty when there are no readings or the database cannot be read.
+        '''
+
+        if city is None:
+            source, where, params = "weather_totals s", "s.id = 1", ()
+            top = "s.top_city, s.top_city_count"
+        else:
+            source, where, params = "weather_city_totals s", "s.city = ?", (city,)
+            top = "s.city, s.count"
+
+        sums = ", ".join(f"s.{c}_count, s.{c}_sum" for c in STAT_SUMS)
+        values = ", ".join(
+            f"{name}.{value}, " + ", ".join(f"{name}.{c}" for c in EXTREME_SELECT.split(", "))
+            for name, _, _, value in STAT_EXTREMES
+        )
+        joins = " ".join(f"LEFT JOIN weather {name} ON {name}.id = s.{name}_id" for name, _, _, _ in STAT_EXTREMES)
+
+        try:
+            row = self.conn.execute(
+                f"SELECT s.count, {top}, {sums}, {values} FROM {source} {joins} WHERE {where}", params
+            ).fetchone()
+        except sqlite3.DatabaseError as e:
+            # Handle any database errors gracefully
+            print(f"Database error during stats fetch: {e}")
+            return {}
+        if not row or not row[0]:
+            return {}
+
+        # Unpack: count, top city, (count, sum) per STAT_SUMS column, then 5 columns per extreme
+        count, top_city, top_count = row[0:3]
+        position = 3
+        averages = {}
+        for column in STAT_SUMS:
+            n, total = row[position:position + 2]
+            averages[column] = total / n if n else None
+            position += 2
+        extremes = {}
+        for name, _, _, _ in STAT_EXTREMES:
+            extreme = row[position:position + 5]
+            extremes[name] = extreme if extreme[3] is not None else None
+            position += 5
+
+        return _stats_dict(count, averages, (top_city, top_count) if top_city else None, extremes)
+
+    def compute_stats(self, city=None):
+
+        '''
+        Compute the same statistics as summary_stats directly from the weather table.
+
+        Every extreme is a single ORDER BY ... LIMIT 1 lookup on its index; the
+        averages and most-searched city need one pass each. Useful for
+        cross-checking the summary tables.
+
+        Parameters:
+            city (str): Limit the statistics to one city (default: all readings)
+
+        Returns:
+            dict: Same keys as get_stats, or {} if there are no readings.
         '''
 
+        city_filter, params = ("", ()) if city is None else (" AND city = ?", (city,))
+
         # Prepare cursor for querying the database
         cur = self.conn.cursor()
         try:
-            # Hottest
-            cur.execute("SELECT temp, city, timestamp FROM weather ORDER BY temp DESC LIMIT 1")
-            h = cur.fetchone()
-            if h:
-                hottest_raw = h[0]
-                hottest_city = h[1]
-                hottest_time = h[2]
-            else:
-                hottest_raw = None
-                hottest_city = "N/A"
-                hottest_time = "N/A"
-
-            # Coldest
-            cur.execute("SELECT temp, city, timestamp FROM weather ORDER BY temp ASC LIMIT 1")
-            c = cur.fetchone()
-            if c:
-                coldest_raw = c[0]
-                coldest_city = c[1]
-                coldest_time = c[2]
-            else:
-                coldest_raw = None
-                coldest_city = "N/A"
-                coldest_time = "N/A"
-
-            # Most humid
-            cur.execute("SELECT humidity, city, timestamp FROM weather ORDER BY humidity DESC LIMIT 1")
-            h2 = cur.fetchone()
-            if h2:
-                most_humid_value = f"{h2[0]}%"
-                most_humid_city = h2[1]
-                most_humid_time = h2[2]
-            else:
-                most_humid_value = "N/A"
-                most_humid_city = "N/A"
-                most_humid_time = "N/A"
-
-            # Strongest wind
-            cur.execute("SELECT wind, city, timestamp FROM weather")
-            entries = cur.fetchall()
-            max_speed = 0.0
-            wind_entry = None
-            wind_dir = None
-
-            for e in entries:
-                wind_str = e[0]
-                if wind_str:
-                    try:
-                        # Split speed and direction
-                        speed_part = wind_str.split()[0]
-                        dir_part = wind_str.split(",")[1].strip() if "," in wind_str else "N/A"
-                        speed = float(speed_part)
-                        if speed > max_speed:
-                            max_speed = speed
-                            wind_entry = e
-                            wind_dir = dir_part
-                    except ValueError:
-                        # Skip if parsing fails
-                        continue
-
-            if wind_entry:
-                strongest_wind_value = f"{max_speed:.2f} m/s, {wind_dir}"
-                strongest_wind_city = wind_entry[1]
-                strongest_wind_time = wind_entry[2]
-            else:
-                strongest_wind_value = "N/A"
-                strongest_wind_city = "N/A"
-                strongest_wind_time = "N/A"
-
-            # Basic count and averages for temperature, humidity, pressure
-            cur.execute("SELECT COUNT(*), AVG(temp), AVG(humidity), AVG(pressure) FROM weather")
-            row = cur.fetchone()
-            log_count = row[0] or 0
-            avg_temp = row[1] or 0
-            avg_humidity = int(row[2]) if row[2] else 0
-            avg_pressure = int(row[3]) if row[3] else 0
-
-            # Average wind speed calculation
-            cur.execute("SELECT AVG(wind_speed) FROM (SELECT CAST(SUBSTR(wind, 1, INSTR(wind, ' ') - 1) AS REAL) as wind_speed FROM weather WHERE wind LIKE '% m/s%')")
-            wind_row = cur.fetchone()
-            avg_wind = wind_row[0] if wind_row and wind_row[0] is not None else 0
+            # Basic count and averages
+            averages_sql = ", ".join(f"AVG({c})" for c in STAT_SUMS)
+            row = cur.execute(f"SELECT COUNT(*), {averages_sql} FROM weather WHERE 1{city_filter}", params).fetchone()
+            if not row[0]:
+                return {}
+            averages = dict(zip(STAT_SUMS, row[1:]))
 
             # Identify most-searched city by entry count
-            cur.execute("SELECT city, COUNT(*) FROM weather GROUP BY city ORDER BY COUNT(*) DESC LIMIT 1")
-            city = cur.fetchone()
-            most_searched = f"{city[0]} ({city[1]} times)" if city else "N/A"
-
-            # Sea level pressure averages and maximum
-            cur.execute("SELECT AVG(sea_level) FROM weather WHERE sea_level IS NOT NULL")
-            row = cur.fetchone()
-            avg_sea_level = round(row[0], 2) if row and row[0] is not None else "N/A"
-            cur.execute("SELECT sea_level, city, timestamp FROM weather WHERE sea_level IS NOT NULL ORDER BY sea_level DESC LIMIT 1")
-            highest_sea = cur.fetchone()
-            if highest_sea:
-                highest_sea_value = f"{highest_sea[0]:.2f} hPa"
-                highest_sea_city = highest_sea[1]
-                highest_sea_time = highest_sea[2]
-            else:
-                highest_sea_value = highest_sea_city = highest_sea_time = "N/A"
-
-            # Ground level pressure averages and minimum
-            cur.execute("SELECT AVG(grnd_level) FROM weather WHERE grnd_level IS NOT NULL")
-            row = cur.fetchone()
-            avg_ground_level = round(row[0], 2) if row and row[0] is not None else "N/A"
-
-            cur.execute("SELECT grnd_level, city, timestamp FROM weather WHERE grnd_level IS NOT NULL ORDER BY grnd_level ASC LIMIT 1")
-            lowest_ground = cur.fetchone()
-            if lowest_ground:
-                lowest_ground_value = f"{lowest_ground[0]:.2f} hPa"
-                lowest_ground_city = lowest_ground[1]
-                lowest_ground_time = lowest_ground[2]
-            else:
-                lowest_ground_value = lowest_ground_city = lowest_ground_time = "N/A"
-
-            # Earliest sunrise and latest sunset time
-            cur.execute("SELECT sunrise, city FROM weather ORDER BY sunrise ASC LIMIT 1")
-            earliest_sunrise = cur.fetchone()
-            if earliest_sunrise:
-                earliest_sunrise_time = earliest_sunrise[0]
-                earliest_sunrise_city = earliest_sunrise[1]
-            else:
-                earliest_sunrise_time = earliest_sunrise_city = "N/A"
+            top_city = cur.execute(f"""
+                SELECT city, COUNT(*) FROM weather WHERE 1{city_filter}
+                GROUP BY city ORDER BY COUNT(*) DESC LIMIT 1
+            """, params).fetchone()
 
-            cur.execute("SELECT sunset, city FROM weather ORDER BY sunset DESC LIMIT 1")
-            latest_sunset = cur.fetchone()
-            if latest_sunset:
-                latest_sunset_time = latest_sunset[0]
-                latest_sunset_city = latest_sunset[1]
-            else:
-                latest_sunset_time = latest_sunset_city = "N/A"
-
-            # Compile all stats into a dictionary and return
-            return {
-                "hottest_raw": hottest_raw,
-                "hottest_city": hottest_city,
-                "hottest_time": hottest_time,
-                "coldest_raw": coldest_raw,
-                "coldest_city": coldest_city,
-                "coldest_time": coldest_time,
-                "strongest_wind": strongest_wind_value,
-                "strongest_wind_city": strongest_wind_city,
-                "strongest_wind_time": strongest_wind_time,
-                "most_humid": most_humid_value,
-                "most_humid_city": most_humid_city,
-                "most_humid_time": most_humid_time,
-                "log_count": log_count,
-                "avg_temp": avg_temp,
-                "avg_humidity": avg_humidity,
-                "avg_pressure": avg_pressure,
-                "avg_wind": avg_wind,
-                "most_searched": most_searched,
-                "avg_sea_level": avg_sea_level,
-                "highest_sea_value": highest_sea_value,
-                "highest_sea_city": highest_sea_city,
-                "highest_sea_time": highest_sea_time,
-                "avg_ground_level": avg_ground_level,
-                "lowest_ground_value": lowest_ground_value,
-                "lowest_ground_city": lowest_ground_city,
-                "lowest_ground_time": lowest_ground_time,
-                "earliest_sunrise_time": earliest_sunrise_time,
-                "earliest_sunrise_city": earliest_sunrise_city,
-                "latest_sunset_time": latest_sunset_time,
-                "latest_sunset_city": latest_sunset_city,
-            }
+            # One index lookup per extreme
+            extremes = {}
+            for name, key, kind, value in STAT_EXTREMES:
+                extremes[name] = cur.execute(f"""
+                    SELECT {value}, {EXTREME_SELECT} FROM weather
+                    WHERE {key} IS NOT NULL{city_filter}
+                    ORDER BY {key} {'DESC' if kind == 'MAX' else 'ASC'} LIMIT 1
+                """, params).fetchone()
+
+            return _stats_dict(row[0], averages, top_city, extremes)
         except sqlite3.DatabaseError as e:
             # Handle any database errors gracefully
             print(f"Database error during stats fetch: {e}")
             return {}
+
+    def single_pass_stats(self, city=None):
+
+        '''
+        Compute the same statistics as summary_stats in a single traversal of the weather table.
+
+        One GROUP BY city query produces every count, sum and extreme key per
+        city (_scan_partials); the per-city rows are merged here, which also
+        yields the most-searched city. Each extreme's reading is then found
+        with an equality lookup on its index.
+
+        Parameters:
+            city (str): Limit the statistics to one city (default: all readings)
+
+        Returns:
+            dict: Same keys as summary_stats, or {} if there are no readings.
+        '''
+
+        cur = self.conn.cursor()
+        try:
+            count, top_city, sums, keys = _merge_partials(self._scan_partials(cur, city))
+            if not count:
+                return {}
+
+            averages = {column: total / n if n else None for column, (n, total) in sums.items()}
+            extremes = {}
+            for name, key, _, value in STAT_EXTREMES:
+                if keys[name] is not None:
+                    extremes[name] = self._find_extreme(cur, key, keys[name], city, f"{value}, {EXTREME_SELECT}")
+                else:
+                    extremes[name] = None
+
+            return _stats_dict(count, averages, top_city, extremes)
+        except sqlite3.DatabaseError as e:
+            # Handle any database errors gracefully
+            print(f"Database error during stats fetch: {e}")
+            return {}
+
+    def _scan_partials(self, cur, city=None):
+
+        '''
+        Aggregate the weather table per city in one traversal (row layout described in _merge_partials).
+        '''
+
+        columns = _partial_aggregates()
+        if city is not None:
+            return cur.execute(f"SELECT city, {columns} FROM weather WHERE city = ? GROUP BY city", (city,)).fetchall()
+
+        # A sequential scan grouped in a temporary B-tree beats walking idx_weather_city,
+        # which costs a table lookup per row
+        return cur.execute(f"SELECT city, {columns} FROM weather NOT INDEXED GROUP BY city").fetchall()
+
+    def _find_extreme(self, cur, key, best, city, columns):
+
+        '''
+        Return the requested columns of one reading whose sort key equals best (optionally within city).
+        '''
+
+        city_filter, params = ("", ()) if city is None else (" AND city = ?", (city,))
+        return cur.execute(
+            f"SELECT {columns} FROM weather WHERE {key} = ?{city_filter} LIMIT 1", (best,) + params
+        ).fetchone()
+
+    def _summary_snapshot(self):
+
+        '''
+        Return {scope: {column: value}} for every summary row; scope is None for weather_totals, else the city.
+        '''
+
+        snapshot = {}
+        for table, scope_column in (("weather_totals", None), ("weather_city_totals", "city")):
+            cur = self.conn.execute(f"SELECT * FROM {table}")
+            names = [d[0] for d in cur.description]
+            for row in cur:
+                values = dict(zip(names, row))
+                snapshot[values[scope_column] if scope_column else None] = values
+        return snapshot
+
+    def rebuild_stats(self, dry_run=False):
+
+        '''
+        Recompute both summary tables from the weather table and report drift.
+
+        The data is read in one traversal (_scan_partials, as single_pass_stats
+        does), independently of the trigger that normally maintains the tables.
+
+        Parameters:
+            dry_run (bool): Roll the rebuild back afterwards (consistency check only)
+
+        Returns:
+            list of str: "scope.column" for every stored summary value that differed from the
+                         recomputed one; empty when the summaries were consistent. Ties between
+                         extremes (same key, different reading) are not reported.
+        '''
+
+        before = self._summary_snapshot()
+        cur = self.conn.cursor()
+        try:
+            partials = self._scan_partials(cur)
+            cur.execute("DELETE FROM weather_totals")
+            cur.execute("DELETE FROM weather_city_totals")
+
+            # The totals row merges every city; each city row is its own partial
+            scopes = [(None, _merge_partials(partials))] + [(p[0], _merge_partials([p])) for p in partials]
+            for city, (count, top_city, sums, keys) in scopes:
+                values = {"count": count}
+                for column, (n, total) in sums.items():
+                    values[f"{column}_count"] = n
+                    values[f"{column}_sum"] = total
+                for name, key, _, _ in STAT_EXTREMES:
+                    values[f"{name}_key"] = keys[name]
+                    values[f"{name}_id"] = None if keys[name] is None else self._find_extreme(cur, key, keys[name], city, "id")[0]
+
+                if city is None:
+                    table = "weather_totals"
+                    values.update(id=1, top_city=top_city[0] if top_city else None,
+                                  top_city_count=top_city[1] if top_city else 0)
+                else:
+                    table = "weather_city_totals"
+                    values["city"] = city
+                cur.execute(f"INSERT INTO {table} ({', '.join(values)}) VALUES ({', '.join('?' * len(values))})",
+                            tuple(values.values()))
+
+            after = self._summary_snapshot()
+            if dry_run:
+                self.conn.rollback()
+            else:
+                self.conn.commit()
+        except sqlite3.DatabaseError:
+            self.conn.rollback()
+            raise
+
+        return _summary_drift(before, after)
+
+
+def _summary_drift(before, after):
+
+    '''
+    Compare two _summary_snapshot results and list the "scope.column" entries that differ.
+    '''
+
+    drift = []
+    for scope in sorted(set(before) | set(after), key=lambda s: (s is not None, s or "")):
+        label = "totals" if scope is None else scope
+        old, new = before.get(scope), after.get(scope)
+        if old is None or new is None:
+            drift.append(f"{label}.*")
+            continue
+        for column, value in new.items():
+            stored = old.get(column)
+            # Row ids and the top city may legitimately differ when several readings tie
+            if column.endswith("_id") or column == "top_city":
+                tie_column = "top_city_count" if column == "top_city" else column[:-3] + "_key"
+                if old.get(tie_column) == new.get(tie_column):
+                    continue
+            if isinstance(value, float) and isinstance(stored, (int, float)):
+                if math.isclose(value, stored, rel_tol=1e-9, abs_tol=1e-6):
+                    continue
+            elif value == stored:
+                continue
+            drift.append(f"{label}.{column}")
+    return drift
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Maintenance commands for the weather history database.")
+    parser.add_argument("command", choices=("rebuild-stats", "check-stats"),
+                        help="rebuild-stats recomputes the summary tables; check-stats only reports drift")
+    parser.add_argument("--db", default=DB_PATH, help=f"database file (default: {DB_PATH})")
+    args = parser.parse_args()
+
+    db = WeatherDB(args.db)
+    drift = db.rebuild_stats(dry_run=args.command == "check-stats")
+    db.close()
+    for entry in drift:
+        print(f"drift: {entry}")
+    if args.command == "check-stats":
+        print(f"Found {len(drift)} inconsistent summary values")
+        return 1 if drift else 0
+    print(f"Rebuilt summary tables ({len(drift)} values corrected)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,172 @@
+"""
+dispatcher.py
+
+Hand results from worker threads to the Tk main thread.
+
+Tkinter widgets may only be touched from the thread running the event loop,
+and root.after itself is not guaranteed to be safe from other threads. Workers
+therefore post() a callback to a queue instead; one periodic callback on the
+main thread drains it. Each drain stops once its time budget is used up
+(leaving the rest for the next tick), so a burst of results cannot stall
+typing or scrolling. Updates posted under the same key while still queued
+are coalesced: only the newest callback runs, in the place of the first one.
+
+Provides:
+- UIDispatcher: Thread-safe queue of UI callbacks drained on the Tk thread under a per-tick time budget,
+  with queue-latency metrics (metrics()).
+"""
+
+import os
+import time
+import logging
+import threading
+from itertools import count
+from collections import OrderedDict, deque
+
+
+# Milliseconds between drains, and main-thread time one drain may spend running callbacks
+DISPATCH_INTERVAL_MS = int(os.getenv("WEATHER_UI_TICK_MS", "16"))
+DISPATCH_BUDGET_MS = float(os.getenv("WEATHER_UI_BUDGET_MS", "8"))
+
+
+def _percentile(ordered, q):
+    return ordered[int(q * (len(ordered) - 1))] if ordered else 0.0
+
+
+class UIDispatcher:
+
+    '''
+    Queue of callbacks posted from any thread and run on the Tk thread.
+
+    Call start() once on the main thread; post(callback, key) from workers.
+    A callback posted with a key replaces one still queued under that key
+    (e.g. two forecast results for the same tab); callbacks posted without a
+    key always run. Every drain runs at least one callback, then stops at
+    the budget.
+    '''
+
+    def __init__(self, root, interval_ms=DISPATCH_INTERVAL_MS, budget_ms=DISPATCH_BUDGET_MS, window=512):
+        self.root = root
+        self.interval_ms = max(1, interval_ms)
+        self.budget = budget_ms / 1000
+        self.job = None
+
+        # key -> (callback, time first posted); keyless callbacks get a unique key
+        self.pending = OrderedDict()
+        self.lock = threading.Lock()
+        self._ids = count()
+
+        # Counters and the most recent queue latencies (seconds from post to run)
+        self.posted = 0
+        self.applied = 0
+        self.coalesced = 0
+        self.failed = 0
+        self.deferred = 0       # Drains that hit the budget with callbacks still queued
+        self.latencies = deque(maxlen=window)
+        self.max_latency = 0.0
+
+    def start(self):
+
+        '''
+        Start draining every interval_ms (call from the Tk thread).
+        '''
+
+        if self.job is None:
+            self.job = self.root.after(self.interval_ms, self._tick)
+
+    def stop(self):
+
+        '''
+        Stop the periodic drain; queued callbacks stay queued.
+        '''
+
+        if self.job is not None:
+            self.root.after_cancel(self.job)
+            self.job = None
+
+    def post(self, callback, key=None):
+
+        '''
+        Queue callback to run on the Tk thread; safe to call from any thread.
+
+        Parameters:
+            callback (callable): Called with no arguments
+            key (hashable): View or result the callback updates; a newer post
+                with the same key replaces this one while it is still queued
+        '''
+
+        now = time.perf_counter()
+        with self.lock:
+            self.posted += 1
+            if key is None:
+                key = ("_", next(self._ids))
+            queued = self.pending.get(key)
+            if queued is not None:
+                # Keep the queue position and age of the first post: latency is how long the view waited
+                self.coalesced += 1
+                now = queued[1]
+            self.pending[key] = (callback, now)
+
+    def drain(self):
+
+        '''
+        Run queued callbacks in order until the queue is empty or the budget is spent.
+
+        Returns:
+            int: Number of callbacks run.
+        '''
+
+        start = time.perf_counter()
+        ran = 0
+        while True:
+            with self.lock:
+                if not self.pending:
+                    break
+                key, (callback, posted) = self.pending.popitem(last=False)
+
+            latency = time.perf_counter() - posted
+            self.latencies.append(latency)
+            self.max_latency = max(self.max_latency, latency)
+            try:
+                callback()
+            except Exception:
+                # One broken update must not stop the others (or the drain loop)
+                self.failed += 1
+                logging.exception("UI update %r failed", key)
+            ran += 1
+            self.applied += 1
+
+            if time.perf_counter() - start >= self.budget:
+                with self.lock:
+                    if self.pending:
+                        self.deferred += 1
+                break
+        return ran
+
+    def _tick(self):
+        self.job = None
+        try:
+            self.drain()
+        finally:
+            self.start()
+
+    def metrics(self):
+
+        '''
+        Return a snapshot of the dispatcher counters and queue latencies (milliseconds).
+        '''
+
+        with self.lock:
+            queued = len(self.pending)
+        ordered = sorted(self.latencies)
+        return {
+            "posted": self.posted,
+            "applied": self.applied,
+            "coalesced": self.coalesced,
+            "failed": self.failed,
+            "queued": queued,
+            "deferred_drains": self.deferred,
+            "latency_p50_ms": _percentile(ordered, 0.5) * 1000,
+            "latency_p95_ms": _percentile(ordered, 0.95) * 1000,
+            "latency_max_ms": self.max_latency * 1000,
+        }
@@ -5,21 +5,44 @@ Forecast UI module for Weather Dashboard.
 
 Defines functions to:
 - create_forecast_tab(self): Set up the forecast tab layout, including header, content blocks, and footer.
-- refresh_forecast(self, city=None): Clear old forecast, validate city input, fetch new forecast data, and populate blocks.
-- make_forecast_block(parent, day, convert_temp_func, temp_unit): Build and return a styled frame for a single day's forecast.
+- refresh_forecast(self, city=None, background=False): Validate city input, fetch new forecast data, and fill the blocks.
+- show_forecast_days(self, city_disp, days, note=None): Fill the blocks with the given days and set the header/note.
+- show_forecast_unavailable(self, city_disp): Clear the blocks and report that the API is unreachable.
+- ForecastBlock: A styled frame for a single day's forecast, built once and refilled in place.
+
+Day blocks come from a WidgetPool (see bindings.py): refreshes and unit
+toggles update label text instead of destroying and rebuilding the blocks.
 """
 
 import tkinter as tk                             # Tkinter for GUI widgets
 import tkinter.messagebox as messagebox          # Show user alerts
 from styles import SMALL_FONT                    # Consistent small font definition
+from bindings import Binding, WidgetPool, bind_label    # Persistent widgets updated in place
 from constants import FORECAST_FOOTER            # Footer text for forecast tab
 from api import fetch_5day_forecast_by_coords    # Function to retrieve 5-day forecast data
-from api import APIError                         # Class for handling API errors
-from utils import title_case                     # Helper to title-case weather descriptions
+from api import get_last_known_forecast          # Last cached forecast, for stale-while-revalidate
+from api import APIError, RateLimitedError, CircuitOpenError    # Classes for handling API errors
+from api import PRIORITY_INTERACTIVE, PRIORITY_BACKGROUND    # Rate-limit lanes
+from utils import title_case, format_age         # Helpers for descriptions and data age
+from utils import format_wind, format_visibility_km    # Render-time formatting of raw values
 import threading                                 # Run background tasks
 import logging                                   # Logging for developer error tracking
 
 
+# Emoji shown on a forecast block for each OpenWeatherMap condition group
+CONDITION_ICONS = {
+    "Clear": "☀️",
+    "Clouds": "⛅",
+    "Rain": "🌧️",
+    "Drizzle": "🌧️",
+    "Thunderstorm": "⛈️",
+    "Snow": "❄️",
+    "Mist": "🌫️",
+    "Fog": "🌫️",
+    "Atmosphere": "🌫️",
+}
+
+
 def create_forecast_tab(self):
 
     '''
@@ -30,11 +53,11 @@ def create_forecast_tab(self):
     self.forecast_inner = tk.Frame(self.forecast_frame, bg="black")
     self.forecast_inner.pack(fill="both", expand=True, padx=0, pady=0)
 
-    # List to keep references to each day's block for future updates
+    # Day blocks currently shown, taken from a pool that keeps them between refreshes
     self.forecast_blocks = []
 
     # Header label (initially empty) for dynamic title like "5-Day Forecast for City"
-    self.forecast_header = tk.Label(
+    self.forecast_header = bind_label(
         self.forecast_inner,
         text="",                                 # Will be set on refresh
         font=("Helvetica Neue", 34, "bold"),     # Large, bold font
@@ -43,11 +66,22 @@ def create_forecast_tab(self):
         anchor="center",
         justify="center"
     )
-    self.forecast_header.pack(pady=(20, 18))     # Vertical padding above and below
+    self.forecast_header.layout("pack", pady=(20, 0))    # Vertical padding above the header
+
+    # Small note under the header, used to flag stale or offline forecast data
+    self.forecast_note = bind_label(
+        self.forecast_inner,
+        text="",
+        font=SMALL_FONT,
+        fg="#ccc",
+        bg="black"
+    )
+    self.forecast_note.layout("pack", pady=(0, 18))
 
     # Frame to hold day blocks in a horizontal row
     self.block_frame = tk.Frame(self.forecast_inner, bg="black")
     self.block_frame.pack(fill="x", expand=True)
+    self.forecast_pool = WidgetPool(lambda index: ForecastBlock(self.block_frame, index))
 
     # Footer label displayed at bottom of the tab
     self.forecast_footer = tk.Label(
@@ -60,146 +94,217 @@ def create_forecast_tab(self):
     self.forecast_footer.pack(side="bottom", pady=(0, 12))
 
 
-def refresh_forecast(self, city=None):
+def refresh_forecast(self, city=None, background=False):
 
     '''
-    Fetch new forecast data for the given city, then rebuild the forecast blocks.
+    Fetch new forecast data for the given city, then fill the forecast blocks.
     If no city is provided or invalid, display a prompt instead.
+    Auto-refresh passes background=True to use the background rate-limit lane.
     '''
 
-    # Remove existing day blocks
-    for widget in self.block_frame.winfo_children():
-        widget.destroy()
-    self.forecast_blocks.clear()
-
     # Determine city name from argument or entry widget
     city = city or self.city_entry.get().strip()
 
     # If city is empty, prompt user and exit
     if not city:
-        self.forecast_header.config(text="Enter a city to view forecast.")
+        self.forecast_blocks = self.forecast_pool.take(0)
+        self.forecast_header.set(text="Enter a city to view forecast.")
         self.root.update_idletasks()
         return
     
     # Validate against stored suggestions (to ensure correct coordinates exist)
     city_disp = city or self.city_entry.get().strip()
     if not city_disp or city_disp not in self.suggestion_coords:
-        self.forecast_header.config(text="Enter a city to view forecast.")
+        self.forecast_blocks = self.forecast_pool.take(0)
+        self.forecast_header.set(text="Enter a city to view forecast.")
         self.root.update_idletasks()
         return
 
     # Look up lat/lon from suggestions mapping
     lat, lon = self.suggestion_coords[city_disp]
+    priority = PRIORITY_BACKGROUND if background else PRIORITY_INTERACTIVE
+
+    # Stale-while-revalidate: show the last known forecast at once, refetch only if it expired
+    cached_days, age, fresh = get_last_known_forecast(lat, lon)
+    if cached_days is None:
+        # Nothing to show for this city yet: clear the previous city's days
+        self.forecast_blocks = self.forecast_pool.take(0)
+    else:
+        show_forecast_days(self, city_disp, cached_days, None if fresh else f"Updated {format_age(age)}, refreshing...")
+        if fresh:
+            return
 
     # Start background fetch to avoid blocking the UI
     def _worker():
         # Attempt API call
         try:
-            days = fetch_5day_forecast_by_coords(lat, lon)
+            days = fetch_5day_forecast_by_coords(lat, lon, priority)
+
+        except RateLimitedError:
+            # Skipped to save quota; the stale forecast stays until the next cycle, without "refreshing..."
+            logging.info("Skipped forecast refresh to stay within the API rate limit")
+            if cached_days is not None:
+                self.dispatcher.post(lambda: show_forecast_days(
+                    self, city_disp, cached_days, f"Updated {format_age(age)}; refresh skipped, retrying next cycle"
+                ), key="forecast")
+            return
+
+        except APIError as e:
+            # Offline fallback: keep showing the last known forecast, flagged with its age
+            if cached_days is not None:
+                logging.info("Forecast refresh failed; keeping last known forecast: %s", e)
+                self.dispatcher.post(lambda: show_forecast_days(
+                    self, city_disp, cached_days, f"⚠️ Offline: showing forecast from {format_age(age)}"
+                ), key="forecast")
+                return
+
+            # API known to be down (nothing cached to fall back on): the refresh label reports the outage
+            if isinstance(e, CircuitOpenError):
+                logging.info("Skipped forecast refresh while the API circuit is open")
+                self.dispatcher.post(lambda: show_forecast_unavailable(self, city_disp), key="forecast")
+                return
 
-        except APIError:
             logging.exception("Failed to fetch 5-day forecast")
 
             # Show a user-friendly popup (title first, then message)
-            self.root.after(0, lambda: messagebox.showerror(
+            self.dispatcher.post(lambda: messagebox.showerror(
                 "Forecast Error",
                 "Could not fetch 5-day forecast at this time.\n"
                 "Please check API status and try again later."
             ))
             return
 
-        # Update header with formatted city name
-        self.root.after(0, lambda: self.forecast_header.config(
-            text=f"5-Day Forecast for {title_case(city_disp)}:",
-            anchor="center", justify="center", font=("Helvetica Neue", 34, "bold")
-        ))
-
-        # Create and grid each day's forecast block
-        def _populate():
-            for i, day in enumerate(days):
-                dayblock = make_forecast_block(
-                    self.block_frame, day, self.convert_temp, self.temp_unit
-                )
-                dayblock.grid(
-                    row=0, column=i, sticky="nsew", padx=28, ipadx=14, ipady=80
-                )
-                self.block_frame.columnconfigure(i, weight=1)
-                self.forecast_blocks.append(dayblock)
-        self.root.after(0, _populate)
+        self.dispatcher.post(lambda: show_forecast_days(self, city_disp, days), key="forecast")
 
     threading.Thread(target=_worker, daemon=True).start()
 
 
-def make_forecast_block(parent, day, convert_temp_func, temp_unit):
+def show_forecast_unavailable(self, city_disp):
 
     '''
-    Helper to build a styled Frame for one day's forecast data.
+    Say the forecast cannot be fetched right now (API circuit open, nothing cached).
+    '''
+
+    if self.city_entry.get().strip() != city_disp:
+        return
+    self.forecast_blocks = self.forecast_pool.take(0)
+    self.forecast_header.set(text="Forecast unavailable right now.")
+    self.forecast_note.set(text="The weather service is unreachable; retrying automatically.")
+
 
-    Args:
-        parent: Tkinter parent widget
-        day (dict): Forecast data for the day
-        convert_temp_func (callable): Function to convert temp to current unit
-        temp_unit (str): 'C' or 'F'
+def show_forecast_days(self, city_disp, days, note=None):
 
-    Returns:
-        Frame: Configured Tkinter Frame containing labels for the day's forecast
+    '''
+    Fill the forecast blocks with the given daily summaries, reusing the pooled blocks.
+    Sets the header for the city and the small note line (e.g. data age), if any.
     '''
 
-    # Accent color for headers and borders
-    color = "#ffe047"
-
-    # Determine emoji icon based on weather description
-    weather_main = day['weather'].lower()
-    if "clear" in weather_main:
-        icon = "☀️"
-    elif "cloud" in weather_main:
-        icon = "⛅"
-    elif "rain" in weather_main:
-        icon = "🌧️"
-    elif "storm" in weather_main or "thunder" in weather_main:
-        icon = "⛈️"
-    elif "snow" in weather_main:
-        icon = "❄️"
-    elif "haze" in weather_main:
-        icon = "🌫️"
-    else:
-        icon = "🌡️"
+    # Ignore late results for a city the user has moved away from
+    if self.city_entry.get().strip() != city_disp:
+        return
+
+    # Update header with formatted city name
+    self.forecast_header.set(
+        text=f"5-Day Forecast for {title_case(city_disp)}:",
+        anchor="center", justify="center", font=("Helvetica Neue", 34, "bold")
+    )
+    self.forecast_note.set(text=note or "")
 
-    # Convert temperatures and choose unit symbol
-    temp_min = convert_temp_func(day['temp_min'])
-    temp_max = convert_temp_func(day['temp_max'])
-    t_unit_symbol = "°C" if temp_unit == "C" else "°F"
+    # Take one block per day from the pool and fill it in place
+    self.forecast_blocks = self.forecast_pool.take(len(days))
+    for block, day in zip(self.forecast_blocks, days):
+        block.show_day(day, self.convert_temp, self.temp_unit)
 
-    # Outer frame with ridge border
-    f = tk.Frame(parent, bg="#222", bd=3, relief="ridge", padx=14, pady=12)
-    content = tk.Frame(f, bg="#222")
-    content.pack(expand=True)
 
-    # Date label
-    tk.Label(content, text=day['date'], font=("Helvetica Neue", 16, "bold"), fg=color, bg="#222").pack(pady=(2, 0), anchor="center")
+class ForecastBlock:
 
-    # Weather description with icon
-    tk.Label(content, text=f"{icon} {title_case(day['weather'])}", font=("Helvetica Neue", 16), fg="#fff", bg="#222").pack(anchor="center")
+    '''
+    Styled frame for one day's forecast, gridded in column index of parent.
+
+    The labels are created once; show_day and update_units only change their
+    text (see bindings.Binding), so refilling a block with the same day costs
+    no Tcl calls at all.
+    '''
+
+    def __init__(self, parent, index):
+        self.parent = parent
+        self.index = index
+        self.day = None
+
+        # Accent color for headers and borders
+        color = "#ffe047"
+
+        # Outer frame with ridge border
+        f = tk.Frame(parent, bg="#222", bd=3, relief="ridge", padx=14, pady=12)
+        self.root = Binding(f).layout("grid", visible=False, row=0, column=index, sticky="nsew", padx=28, ipadx=14, ipady=80)
+        content = tk.Frame(f, bg="#222")
+        content.pack(expand=True)
+
+        # Date label
+        self.date = bind_label(content, text="", font=("Helvetica Neue", 16, "bold"), fg=color, bg="#222").layout("pack", pady=(2, 0), anchor="center")
+
+        # Weather description with icon
+        self.description = bind_label(content, text="", font=("Helvetica Neue", 16), fg="#fff", bg="#222").layout("pack", anchor="center")
+
+        # Divider
+        tk.Label(content, text="----------------", font=("Helvetica Neue", 12), fg="#555", bg="#222").pack(pady=(4, 4), anchor="center")
+
+        # Temperature range
+        self.temp = bind_label(content, text="", font=("Helvetica Neue", 16, "bold"), fg="#ffe047", bg="#222").layout("pack", pady=(0, 8), anchor="center")
+
+        # Humidity
+        self.humidity = bind_label(content, text="", font=("Helvetica Neue", 15), fg="#bfffa5", bg="#222").layout("pack", anchor="center")
 
-    # Divider
-    tk.Label(content, text="----------------", font=("Helvetica Neue", 12), fg="#555", bg="#222").pack(pady=(4, 4), anchor="center")
+        # Wind
+        self.wind = bind_label(content, text="", font=("Helvetica Neue", 15), fg="#43fad8", bg="#222").layout("pack", anchor="center")
 
-    # Temperature range
-    temp_label = tk.Label(content, text=f"{temp_min:.1f}{t_unit_symbol} - {temp_max:.1f}{t_unit_symbol}", font=("Helvetica Neue", 16, "bold"), fg="#ffe047", bg="#222")
-    temp_label.pack(pady=(0, 8), anchor="center")
-    f.temp_label = temp_label
-    f.day_data    = day
+        # Visibility
+        self.visibility = bind_label(content, text="", font=("Helvetica Neue", 15), fg="#a1e3ff", bg="#222").layout("pack", anchor="center")
 
-    # Humidity
-    tk.Label(content, text=f"Humidity: {day['humidity']}%", font=("Helvetica Neue", 15), fg="#bfffa5", bg="#222").pack(anchor="center")
+    def show(self, visible=True):
 
-    # Wind
-    tk.Label(content, text=f"Wind: {day.get('wind', 'N/A')}", font=("Helvetica Neue", 15), fg="#43fad8", bg="#222").pack(anchor="center")
+        '''
+        Show or hide the block; a hidden block's column stops taking a share of the width.
+        '''
 
-    # Visibility
-    tk.Label(content, text=f"Visibility: {day.get('visibility', 'N/A')} km (max 10 km)", font=("Helvetica Neue", 15), fg="#a1e3ff", bg="#222").pack(anchor="center")
+        if visible != self.root.visible:
+            self.root.show(visible)
+            self.parent.columnconfigure(self.index, weight=1 if visible else 0)
 
-    return f     # Return the completed day block frame
+    def show_day(self, day, convert_temp_func, temp_unit):
+
+        '''
+        Fill the block with one day's forecast.
+
+        Args:
+            day (ForecastDay): Forecast data for the day
+            convert_temp_func (callable): Function to convert temp to current unit
+            temp_unit (str): 'C' or 'F'
+        '''
+
+        self.day = day
+
+        # Determine emoji icon based on the condition group
+        icon = CONDITION_ICONS.get(day.condition_main, "🌡️")
+
+        self.date.set(text=day.date.strftime("%a, %b %d"))
+        self.description.set(text=f"{icon} {title_case(day.description)}")
+        self.update_units(convert_temp_func, temp_unit)
+        self.humidity.set(text=f"Humidity: {day.humidity}%")
+        self.wind.set(text=f"Wind: {format_wind(day.wind_speed, day.wind_deg)}")
+        self.visibility.set(text=f"Visibility: {format_visibility_km(day.visibility)} km (max 10 km)")
+
+    def update_units(self, convert_temp_func, temp_unit):
+
+        '''
+        Re-render the temperature range of the current day in the given unit.
+        '''
+
+        # Convert temperatures and choose unit symbol
+        temp_min = convert_temp_func(self.day.temp_min)
+        temp_max = convert_temp_func(self.day.temp_max)
+        t_unit_symbol = "°C" if temp_unit == "C" else "°F"
+        self.temp.set(text=f"{temp_min:.1f}{t_unit_symbol} - {temp_max:.1f}{t_unit_symbol}")
 
 
 def update_forecast_units(self):
@@ -209,19 +314,6 @@ def update_forecast_units(self):
     toggling between Celsius and Fahrenheit without re-fetching data.
     """
     
-    # Select the appropriate unit symbol based on current setting
-    unit_symbol = "°C" if self.temp_unit == "C" else "°F"
-
-    # Loop over each existing forecast block frame
+    # Blocks keep their ForecastDay, so only the temperature labels change
     for block in self.forecast_blocks:
-        # Retrieve the original forecast data dict attached during block creation
-        forecast_data = block.day_data
-
-        # Convert the stored minimum and maximum temperatures to the new unit
-        converted_min = self.convert_temp(forecast_data['temp_min'])
-        converted_max = self.convert_temp(forecast_data['temp_max'])
-
-        # Update the label text directly on the widget to reflect new values
-        block.temp_label.config(
-            text=f"{converted_min:.1f}{unit_symbol} - {converted_max:.1f}{unit_symbol}"
-        )
+        block.update_units(self.convert_temp, self.temp_unit)
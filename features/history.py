@@ -3,26 +3,87 @@ history.py
 
 History UI module for Weather Dashboard.
 
+The History tab is virtualized: the Treeview only holds items for the rows on
+screen (plus a small overscan), and a HistoryPager fetches the rows for the
+current scroll position from the database a page at a time. Items are reused
+as the view scrolls, so memory and redraw time stay flat however many rows the
+table holds.
+
 Provides functions to:
-- treeview_sort_column: Sort a Treeview column numerically or lexically when its header is clicked.
-- create_history_tab: Initialize and style the history tab with a Treeview and footer label.
-- refresh_history: Load weather history entries from the database and populate the Treeview rows.
+- format_history_row: Turn one raw history row into the strings shown in the Treeview.
+- treeview_sort_column: Sort the history by a column (in the database) when its header is clicked.
+- create_history_tab: Initialize and style the history tab with a Treeview, scrollbar and footer label.
+- refresh_history: Take in new readings incrementally (only the new rows are formatted and inserted).
+- scroll_history: Move the visible window (scrollbar, mouse wheel and keys).
 """
 
 import tkinter as tk                                   # Core Tkinter library for GUI components
 from tkinter import ttk                                # Themed widgets: Treeview and Style support
 from constants import HISTORY_FOOTER                   # Footer text constant for the history tab
+from history_pager import HistoryPager                 # Windowed, cached access to the history rows
 from styles import NORMAL_FONT, SMALL_FONT             # Standard font configuration for text elements
+from utils import format_clock, format_timestamp, format_value, format_wind    # Render raw DB values
+
+
+# Columns in the order they appear (built from WeatherDB.get_history_page rows)
+HISTORY_COLUMNS = ("timestamp", "city", "temp", "feels_like", "weather", "humidity", "pressure",
+                   "visibility", "wind", "sea_level", "grnd_level", "sunrise", "sunset")
+
+# Database sort key of each column (see db.HISTORY_SORT_KEYS); wind sorts by speed
+HISTORY_SORT_COLUMNS = {col: col for col in HISTORY_COLUMNS}
+HISTORY_SORT_COLUMNS["wind"] = "wind_speed"
+
+# Treeview row height in pixels, and extra items kept below the visible ones
+HISTORY_ROW_HEIGHT = 26
+HISTORY_OVERSCAN = 2
+
+
+def format_history_row(entry, convert_temp, t_unit):
+
+    """
+    Format one HISTORY_SELECT row for display.
+
+    Args:
+        entry (tuple): Raw row from WeatherDB.get_history_page.
+        convert_temp (callable): Converts a °C value to the unit on screen.
+        t_unit (str): Unit suffix for temperatures ("°C" or "°F").
+
+    Returns:
+        tuple: One string per HISTORY_COLUMNS entry, "N/A" for missing fields.
+    """
+
+    (timestamp, city, temp, feels_like, weather, humidity, pressure, visibility,
+     wind_speed, wind_deg, sea_level, grnd_level, sunrise, sunset, tz_offset) = entry
+
+    # Temperatures are stored in °C; convert for display
+    temp_str = f"{convert_temp(temp):.2f}{t_unit}" if temp is not None else "N/A"
+    feels_like_str = f"{convert_temp(feels_like):.2f}{t_unit}" if feels_like is not None else "N/A"
+
+    return (
+        format_timestamp(timestamp), city,      # timestamp, city
+        temp_str,                               # temperature
+        feels_like_str,                         # feels like
+        weather or "N/A",                       # weather description
+        format_value(humidity),                 # humidity
+        format_value(pressure),                 # pressure
+        format_value(visibility),               # visibility
+        format_wind(wind_speed, wind_deg),      # wind
+        format_value(sea_level),                # sea level
+        format_value(grnd_level),               # ground level
+        format_clock(sunrise, tz_offset or 0),  # sunrise (city's local time)
+        format_clock(sunset, tz_offset or 0)    # sunset (city's local time)
+    )
 
 
 def treeview_sort_column(self, tv, col, reverse):
-    
+
     """
     Sort a given Treeview column when its header is clicked.
 
-    Attempts to parse and sort values numerically by stripping common unit suffixes.
-    Falls back to lexicographical sort on failure. Toggles sort order and updates
-    the column header to display an arrow indicator.
+    The whole history is re-ordered by the database (see
+    WeatherDB.get_history_page), not just the rows on screen; missing values
+    always come last. The view returns to the top, the sort order toggles on
+    the next click, and the column header displays an arrow indicator.
 
     Args:
         self: Reference to the WeatherApp instance.
@@ -31,23 +92,11 @@ def treeview_sort_column(self, tv, col, reverse):
         reverse (bool): True for descending sort, False for ascending.
     """
 
-    # Build a list of tuples: (cell_text, row_id) for all rows
-    l = [(tv.set(k, col), k) for k in tv.get_children('')]
-    
-    try:
-        # Numeric sort: strip units then convert to float
-        l.sort(
-            key=lambda t: float(t[0].split()[0].replace("°C", "").replace("°F", "")
-                            .replace("%", "").replace("m/s", "").replace("hPa", "")),
-            reverse=reverse
-        )
-    except ValueError:
-        # Fall back to simple string sort if conversion fails (e.g., 'N/A')
-        l.sort(reverse=reverse)
-
-    # Reorder each row in the Treeview according to sorted list
-    for index, (val, k) in enumerate(l):
-        tv.move(k, '', index)
+    # Re-query in the new order and show its first rows
+    self.history_pager.set_query(sort=HISTORY_SORT_COLUMNS[col], descending=reverse,
+                                 **self.history_pager.filters)
+    self.history_top = 0
+    _render_history(self)
 
     # Reset all column headers to default text and sort callback
     for c in tv["columns"]:
@@ -58,31 +107,46 @@ def treeview_sort_column(self, tv, col, reverse):
     arrow = " ▲" if not reverse else " ▼"
     tv.heading(col, text=col.replace("_", " ").title() + arrow,
             command=lambda: self.treeview_sort_column(tv, col, not reverse))
-        
-        
+
+
 def create_history_tab(self):
 
     """
     Initialize the History tab:
-    - Create and pack a Treeview with columns matching the data schema.
+    - Create and pack a Treeview with columns matching the data schema, and its scrollbar.
     - Apply visual styles to headings and rows.
     - Configure click handlers for sorting on each column.
+    - Bind the mouse wheel, paging keys and resizing to the virtual scroll.
     - Add a footer label with guidance text.
     """
 
     # Define columns in the order they should appear
-    columns = ("timestamp", "city", "temp", "feels_like", "weather", "humidity", "pressure",
-            "visibility", "wind", "sea_level", "grnd_level", "sunrise", "sunset")
-    
+    columns = HISTORY_COLUMNS
+
+    # Rows come from the pager; the Treeview only shows the window starting at history_top
+    self.history_pager = HistoryPager(self.db)
+    self.history_top = 0
+    self.history_visible = 18
+    self.history_items = []
+    self.history_unit = None
+    self.history_placeholder = True
+
+    # Treeview and scrollbar side by side; the scrollbar tracks the virtual position
+    table = tk.Frame(self.history_frame, bg="black")
+    table.pack(fill="both", expand=True, padx=12, pady=(14, 0))
+    self.history_scrollbar = ttk.Scrollbar(table, orient="vertical",
+                                           command=lambda *args: scroll_history(self, *args))
+    self.history_scrollbar.pack(side="right", fill="y")
+
     # Instantiate the Treeview widget in the history_frame
-    self.tree = ttk.Treeview(self.history_frame, columns=columns, show="headings", height=18)
-    self.tree.pack(fill="both", expand=True, padx=12, pady=(14, 0))
+    self.tree = ttk.Treeview(table, columns=columns, show="headings", height=self.history_visible)
+    self.tree.pack(side="left", fill="both", expand=True)
 
     # Configure styling for headings and rows
     style = ttk.Style()
     style.theme_use("default")
     style.configure("Treeview.Heading", font=("Helvetica Neue", 14, "bold"), background="#444", foreground="#DEAFEE")
-    style.configure("Treeview", font=NORMAL_FONT, rowheight=26, background="black", fieldbackground="black", foreground="white")
+    style.configure("Treeview", font=NORMAL_FONT, rowheight=HISTORY_ROW_HEIGHT, background="black", fieldbackground="black", foreground="white")
     style.map("Treeview", background=[('selected', '#555')], foreground=[('selected', '#fff')])
 
     # Center-align text in rows tagged 'centered'
@@ -105,68 +169,170 @@ def create_history_tab(self):
             text=display_text,
             command=lambda _col=col: treeview_sort_column(self, self.tree, _col, False))
 
+    # Scrolling moves the virtual window instead of the Treeview ("break" stops its own handling)
+    def wheel(event):
+        if event.num == 4 or event.delta > 0:
+            scroll_history(self, "scroll", -3, "units")
+        else:
+            scroll_history(self, "scroll", 3, "units")
+        return "break"
+
+    def bind_scroll(sequence, *args):
+        def handler(event):
+            scroll_history(self, *args)
+            return "break"
+        self.tree.bind(sequence, handler)
+
+    self.tree.bind("<MouseWheel>", wheel)
+    self.tree.bind("<Button-4>", wheel)
+    self.tree.bind("<Button-5>", wheel)
+    bind_scroll("<Prior>", "scroll", -1, "pages")
+    bind_scroll("<Next>", "scroll", 1, "pages")
+    bind_scroll("<Home>", "moveto", 0.0)
+    bind_scroll("<End>", "moveto", 1.0)
+    self.tree.bind("<Configure>", lambda event: _resize_history(self, event.height))
+
     # Footer label with descriptive text at bottom of tab
     self.history_footer = tk.Label(self.history_frame, text=HISTORY_FOOTER, font=SMALL_FONT, fg="#fff", bg="black")
     self.history_footer.pack(side="bottom", pady=(0, 12))
 
 
-def refresh_history(self):
+def scroll_history(self, action, amount=None, what=None):
+
+    """
+    Scroll the virtual history window; accepts the ttk.Scrollbar command arguments.
+
+    Args:
+        self: Reference to the WeatherApp instance.
+        action (str): "moveto" (amount is a fraction of the history) or "scroll".
+        amount: Fraction for "moveto", or a number of units/pages for "scroll".
+        what (str): "units" (rows) or "pages" (visible heights) for "scroll".
+    """
+
+    if action == "moveto":
+        top = int(float(amount) * self.history_pager.count)
+    else:
+        step = self.history_visible if what == "pages" else 1
+        top = self.history_top + int(amount) * step
+
+    # Keep a full window on screen when possible
+    top = max(0, min(top, self.history_pager.count - self.history_visible))
+    if top != self.history_top:
+        self.history_top = top
+        _render_history(self)
+
+
+def _resize_history(self, height):
 
     """
-    Refresh the displayed history records:
-    - Clear existing rows in the Treeview.
-    - Fetch history entries from the database.
-    - Format temperatures and handle missing data gracefully.
-    - Insert each row into the Treeview with centered alignment.
+    Recompute how many rows fit after the Treeview was resized, and redraw if it changed.
     """
 
-    # Clear all current rows
-    for i in self.tree.get_children():
-        self.tree.delete(i)
+    # One row's height is taken by the headings
+    visible = max(1, height // HISTORY_ROW_HEIGHT - 1)
+    if visible != self.history_visible:
+        self.history_visible = visible
+        self.history_top = max(0, min(self.history_top, self.history_pager.count - visible))
+        _render_history(self)
+
+
+def _render_history(self):
+
+    """
+    Show the rows from history_top onwards, reusing the existing Treeview items.
+
+    Only the visible rows plus HISTORY_OVERSCAN are formatted and kept as
+    items; extra items are deleted and missing ones inserted at the end.
+    """
 
-    # Retrieve entries from the database
-    entries = self.db.get_all_history()
-    if not entries:
-        self.tree.insert("", "end", values=["No history found."] + [""] * 13)
-        return
-    
     # Determine the unit symbol based on user preference
     t_unit = "°C" if self.temp_unit == "C" else "°F"
 
-    # Loop through each database entry and format for display
-    for entry in entries:
-        # Safely parse and format temperature
-        try:
-            temp = float(entry[2]) if entry[2] is not None else None
-            temp_str = f"{self.convert_temp(temp):.2f}{t_unit}" if temp is not None else "N/A"
-        except (ValueError, TypeError):
-            temp_str = "N/A"
-
-        # Safely parse and format 'feels like'
-        try:
-            feels_like = float(entry[3]) if entry[3] is not None else None
-            feels_like_str = f"{self.convert_temp(feels_like):.2f}{t_unit}" if feels_like is not None else "N/A"
-        except (ValueError, TypeError):
-            feels_like_str = "N/A"
-
-        # Assemble row tuple, defaulting to "N/A" for missing fields
-        row = (
-            entry[0], entry[1],         # timestamp, city
-            temp_str,                   # temperature
-            feels_like_str,             # feels like
-            entry[4] or "N/A",          # weather description
-            entry[5] or "N/A",          # humidity
-            entry[6] or "N/A",          # pressure
-            entry[7] or "N/A",          # visibility
-            entry[8] or "N/A",          # wind
-            entry[9] or "N/A",          # sea level
-            entry[10] or "N/A",         # ground level
-            entry[11] or "N/A",         # sunrise
-            entry[12] or "N/A"          # sunset
-        )
-
-        # Insert row with a centered tag
-        self.tree.insert("", "end", values=row, tags=('centered',))
-        
+    window = self.history_pager.rows(self.history_top, self.history_top + self.history_visible + HISTORY_OVERSCAN)
+    if window:
+        values = [format_history_row(entry, self.convert_temp, t_unit) for _, entry in window]
+    else:
+        values = [["No history found."] + [""] * (len(HISTORY_COLUMNS) - 1)]
+
+    # Match the number of items to the window, then update them in place
+    while len(self.history_items) > len(values):
+        self.tree.delete(self.history_items.pop())
+    while len(self.history_items) < len(values):
+        self.history_items.append(self.tree.insert("", "end", tags=('centered',)))
+    for item, row in zip(self.history_items, values):
+        self.tree.item(item, values=row)
+    self.tree.yview_moveto(0)
+
+    # Remember what is on screen for the incremental refresh
+    self.history_unit = self.temp_unit
+    self.history_placeholder = not window
+    _update_history_scrollbar(self)
+
+
+def _prepend_history(self, added):
+
+    """
+    Insert the newest added rows at the top of the window and evict the items pushed past its end.
+
+    Only the new rows are formatted; the items already shown keep their values.
+    """
+
+    # Determine the unit symbol based on user preference
+    t_unit = "°C" if self.temp_unit == "C" else "°F"
+
+    size = self.history_visible + HISTORY_OVERSCAN
+    for index, (_, entry) in enumerate(self.history_pager.rows(0, min(added, size))):
+        row = format_history_row(entry, self.convert_temp, t_unit)
+        self.history_items.insert(index, self.tree.insert("", index, values=row, tags=('centered',)))
+    while len(self.history_items) > size:
+        self.tree.delete(self.history_items.pop())
+    self.tree.yview_moveto(0)
+    _update_history_scrollbar(self)
+
+
+def _update_history_scrollbar(self):
+
+    """
+    Set the scrollbar thumb to the window's share of the whole history.
+    """
+
+    count = self.history_pager.count
+    if count:
+        self.history_scrollbar.set(self.history_top / count, min(1.0, (self.history_top + self.history_visible) / count))
+    else:
+        self.history_scrollbar.set(0.0, 1.0)
+
+
+def refresh_history(self):
+
+    """
+    Refresh the displayed history records incrementally, keeping the sort order:
+    - Ask the pager for the readings added since the last refresh (HistoryPager.update).
+    - Newest first at the top of the list: insert just the new rows as items and
+      evict as many from the bottom of the window.
+    - Scrolled down: keep the same rows on screen and only move the scrollbar.
+    - Redraw the whole window only when the rows cannot be placed (other sorts),
+      the temperature unit changed, or rows were appended inside the window.
+    """
+
+    pager = self.history_pager
+    old_count = pager.count
+    added = pager.update()
+
+    if added is None or self.history_unit != self.temp_unit or self.history_placeholder:
+        self.history_top = max(0, min(self.history_top, pager.count - self.history_visible))
+        _render_history(self)
+    elif added and self.history_top == 0:
+        _prepend_history(self, added)
+    elif added:
+        # The rows on screen moved down by added positions: follow them
+        self.history_top += added
+        _update_history_scrollbar(self)
+    elif pager.count != old_count and self.history_top + len(self.history_items) >= old_count:
+        # Oldest first: the new rows were appended inside the window
+        _render_history(self)
+    else:
+        _update_history_scrollbar(self)
+
     # Refresh UI to ensure updates are shown
-    self.root.update_idletasks()
\ No newline at end of file
+    self.root.update_idletasks()
@@ -3,21 +3,42 @@ stats.py
 
 Statistics UI module for Weather Dashboard.
 
+The tab's labels are built once (see bindings.py); each refresh only updates
+the text of the values that changed.
+
 Provides functions to:
-- create_stats_tab: Initialize the Statistics tab layout and footer.
-- refresh_stats: Query aggregated metrics from the database and display them in labeled grids.
+- create_stats_tab: Initialize the Statistics tab layout, its persistent grids and footer.
+- refresh_stats: Query aggregated metrics from the database and update the labeled grids in place.
 """
 
 import tkinter as tk                                       # Core Tkinter library for GUI components
+from bindings import Binding, bind_label                   # Persistent widgets updated in place
 from constants import STATS_FOOTER                         # Footer text constant for the history statistics tab
 from styles import HEADER_FONT, NORMAL_FONT, SMALL_FONT    # Font styles for headings and labels
 
 
+# Summary grid rows: label and the stats keys of its value, city and time
+SUMMARY_ROWS = (
+    ("🔥 Hottest", "hottest"),
+    ("❄️ Coldest", "coldest"),
+    ("⛅ Strongest Wind", "strongest_wind"),
+    ("💧 Most Humid", "most_humid"),
+)
+
+# Detail grid row labels, in order
+DETAIL_LABELS = (
+    "Total logs:", "Most searched city:", "Average temperature:", "Average humidity:",
+    "Average pressure:", "Average wind speed:", "Average sea level pressure:", "Highest sea level:",
+    "Average ground level pressure:", "Lowest ground level:", "Earliest sunrise:", "Latest sunset:",
+)
+
+
 def create_stats_tab(self):
 
     """
     Initialize the Statistics tab UI:
     - Create an inner frame for layout.
+    - Build the header, the empty-state message and both grids once; refresh_stats fills them in.
     - Pack the footer label at the bottom of the tab.
     """
 
@@ -25,6 +46,36 @@ def create_stats_tab(self):
     self.stats_frame_inner = tk.Frame(self.stats_frame, bg="black")
     self.stats_frame_inner.pack(expand=True, fill="both", pady=(14, 0))
 
+    # Header label for the stats section
+    tk.Label(self.stats_frame_inner, text="SQL Statistics of Weather History", font=HEADER_FONT, fg="#ffe047", bg="black").pack(pady=(10, 20))
+
+    # Shown instead of the grids while the database is empty
+    self.stats_empty = bind_label(self.stats_frame_inner, text="No statistics available yet. Search for a city first!", font=NORMAL_FONT, fg="#fff", bg="black")
+    self.stats_empty.layout("pack", visible=False, pady=24)
+
+    # Grid for top summary metrics: label, value, city, timestamp per row
+    summary_grid = tk.Frame(self.stats_frame_inner, bg="black")
+    self.stats_summary = Binding(summary_grid).layout("pack", anchor="center", pady=(4, 18))
+    self.stats_summary_cells = []
+    for i, (label, _) in enumerate(SUMMARY_ROWS):
+        tk.Label(summary_grid, text=label, font=NORMAL_FONT, fg="#fff", bg="black", anchor="w", width=18).grid(row=i, column=0, sticky="w", padx=(12, 8), pady=2)
+        cells = (
+            bind_label(summary_grid, text="", font=NORMAL_FONT, fg="#ffe047", bg="black", anchor="w", width=12).layout("grid", row=i, column=1, sticky="w", padx=8, pady=2),
+            bind_label(summary_grid, text="", font=NORMAL_FONT, fg="#43fad8", bg="black", anchor="w", width=22).layout("grid", row=i, column=2, sticky="w", padx=8, pady=2),
+            bind_label(summary_grid, text="", font=NORMAL_FONT, fg="#ccc", bg="black", anchor="w", width=20).layout("grid", row=i, column=3, sticky="w", padx=8, pady=2),
+        )
+        self.stats_summary_cells.append(cells)
+
+    # Secondary grid for additional detailed metrics
+    grid = tk.Frame(self.stats_frame_inner, bg="black")
+    self.stats_details = Binding(grid).layout("pack", anchor="n", pady=(4, 0))
+    self.stats_detail_cells = []
+    for i, label in enumerate(DETAIL_LABELS):
+        tk.Label(grid, text=label, font=NORMAL_FONT, fg="#ccc", bg="black", anchor="e").grid(row=i, column=0, sticky="e", pady=1, padx=(24, 8))
+        self.stats_detail_cells.append(
+            bind_label(grid, text="", font=NORMAL_FONT, fg="#fff", bg="black", anchor="w").layout("grid", row=i, column=1, sticky="w", pady=1)
+        )
+
     # Footer label with explanatory text, using small font
     self.stats_footer = tk.Label(self.stats_frame, text=STATS_FOOTER, font=SMALL_FONT, fg="#fff", bg="black")
     self.stats_footer.pack(side="bottom", pady=(0, 12))
@@ -33,29 +84,21 @@ def create_stats_tab(self):
 def refresh_stats(self):
 
     """
-    Refresh and display database statistics:
-    - Clear previous widgets.
+    Refresh the displayed database statistics in place:
     - Fetch stats dict from database.
-    - Display a header and key summary grid for top metrics.
-    - Display a secondary grid for detailed averages and records.
+    - Show the empty-state message instead of the grids when there is no data.
+    - Update the summary grid (top metrics) and the detail grid (averages and records);
+      only labels whose text changed are reconfigured.
     """
 
-    # Remove any existing children in the inner frame
-    for w in self.stats_frame_inner.winfo_children():
-        w.destroy()
-
-    # Header label for the stats section
-    header_label = tk.Label(self.stats_frame_inner, text="SQL Statistics of Weather History", font=HEADER_FONT, fg="#ffe047", bg="black")
-    header_label.pack(pady=(10, 20))
-
-
     # Retrieve aggregated statistics from the database
     stats = self.db.get_stats()
+    self.stats_empty.show(not stats)
+    self.stats_summary.show(bool(stats))
+    self.stats_details.show(bool(stats))
     if not stats:
-        tk.Label(self.stats_frame_inner, text="No statistics available yet. Search for a city first!", font=NORMAL_FONT, fg="#fff", bg="black").pack(pady=24)
         return
 
-
     # Extract raw hottest and coldest temperatures
     hottest_temp = stats['hottest_raw']
     coldest_temp = stats['coldest_raw']
@@ -65,24 +108,19 @@ def refresh_stats(self):
         hottest_temp = hottest_temp * 9 / 5 + 32
         coldest_temp = coldest_temp * 9 / 5 + 32
 
-    # Create a grid frame for top summary metrics
-    summary_grid = tk.Frame(self.stats_frame_inner, bg="black")
-    summary_grid.pack(anchor="center", pady=(4, 18))
-
-    # Define rows: label, value, city, timestamp
-    summary_rows = [
-        ("🔥 Hottest", f"{hottest_temp:.2f}°{self.temp_unit}", stats['hottest_city'], stats['hottest_time']),
-        ("❄️ Coldest", f"{coldest_temp:.2f}°{self.temp_unit}", stats['coldest_city'], stats['coldest_time']),
-        ("⛅ Strongest Wind", stats['strongest_wind'], stats['strongest_wind_city'], stats['strongest_wind_time']),
-        ("💧 Most Humid", stats['most_humid'], stats['most_humid_city'], stats['most_humid_time']),
-    ]
-
-    # Populate summary grid rows
-    for i, (label, value, city, time) in enumerate(summary_rows):
-        tk.Label(summary_grid, text=label, font=NORMAL_FONT, fg="#fff", bg="black", anchor="w", width=18).grid(row=i, column=0, sticky="w", padx=(12, 8), pady=2)
-        tk.Label(summary_grid, text=value, font=NORMAL_FONT, fg="#ffe047", bg="black", anchor="w", width=12).grid(row=i, column=1, sticky="w", padx=8, pady=2)
-        tk.Label(summary_grid, text=city, font=NORMAL_FONT, fg="#43fad8", bg="black", anchor="w", width=22).grid(row=i, column=2, sticky="w", padx=8, pady=2)
-        tk.Label(summary_grid, text=time, font=NORMAL_FONT, fg="#ccc", bg="black", anchor="w", width=20).grid(row=i, column=3, sticky="w", padx=8, pady=2)
+    # Summary values, in SUMMARY_ROWS order
+    values = {
+        "hottest": f"{hottest_temp:.2f}°{self.temp_unit}",
+        "coldest": f"{coldest_temp:.2f}°{self.temp_unit}",
+        "strongest_wind": stats['strongest_wind'],
+        "most_humid": stats['most_humid'],
+    }
+
+    # Update summary grid rows: value, city, timestamp
+    for (value_cell, city_cell, time_cell), (_, key) in zip(self.stats_summary_cells, SUMMARY_ROWS):
+        value_cell.set(text=values[key])
+        city_cell.set(text=stats[f"{key}_city"])
+        time_cell.set(text=stats[f"{key}_time"])
 
     # Calculate average temperature display text
     avg_temp = stats['avg_temp']
@@ -92,30 +130,22 @@ def refresh_stats(self):
         t_unit = "°F"
     avg_temp_text = f"{avg_temp:.1f}{t_unit}"
 
-    grid = tk.Frame(self.stats_frame_inner, bg="black")
-    grid.pack(anchor="n", pady=(4, 0))
-
-    # Secondary grid for additional detailed metrics
-    rows = [
-        ("Total logs:", stats['log_count']),
-        ("Most searched city:", stats['most_searched']),
-        ("Average temperature:", avg_temp_text),
-        ("Average humidity:", f"{stats['avg_humidity']}%"),
-        ("Average pressure:", f"{stats['avg_pressure']} hPa"),
-        ("Average wind speed:", f"{stats['avg_wind']:.2f} m/s"),
-    ]
-
-    # Extend with sea level, ground level, and daylight extremes
-    rows.extend([
-        ("Average sea level pressure:", f"{stats['avg_sea_level']} hPa"),
-        ("Highest sea level:", f"{stats['highest_sea_value']} in {stats['highest_sea_city']} at {stats['highest_sea_time']}"),
-        ("Average ground level pressure:", f"{stats['avg_ground_level']} hPa"),
-        ("Lowest ground level:", f"{stats['lowest_ground_value']} in {stats['lowest_ground_city']} at {stats['lowest_ground_time']}"),
-        ("Earliest sunrise:", f"{stats['earliest_sunrise_time']} in {stats['earliest_sunrise_city']}"),
-        ("Latest sunset:", f"{stats['latest_sunset_time']} in {stats['latest_sunset_city']}"),
-    ])
-
-    # Populate detailed metrics grid
-    for i, (k, v) in enumerate(rows):
-        tk.Label(grid, text=k, font=NORMAL_FONT, fg="#ccc", bg="black", anchor="e").grid(row=i, column=0, sticky="e", pady=1, padx=(24, 8))
-        tk.Label(grid, text=v, font=NORMAL_FONT, fg="#fff", bg="black", anchor="w").grid(row=i, column=1, sticky="w", pady=1)
\ No newline at end of file
+    # Detail values, in DETAIL_LABELS order
+    details = (
+        stats['log_count'],
+        stats['most_searched'],
+        avg_temp_text,
+        f"{stats['avg_humidity']}%",
+        f"{stats['avg_pressure']} hPa",
+        f"{stats['avg_wind']:.2f} m/s",
+        f"{stats['avg_sea_level']} hPa",
+        f"{stats['highest_sea_value']} in {stats['highest_sea_city']} at {stats['highest_sea_time']}",
+        f"{stats['avg_ground_level']} hPa",
+        f"{stats['lowest_ground_value']} in {stats['lowest_ground_city']} at {stats['lowest_ground_time']}",
+        f"{stats['earliest_sunrise_time']} in {stats['earliest_sunrise_city']}",
+        f"{stats['latest_sunset_time']} in {stats['latest_sunset_city']}",
+    )
+
+    # Update detailed metrics grid
+    for cell, value in zip(self.stats_detail_cells, details):
+        cell.set(text=value)
@@ -3,6 +3,10 @@ features/tea_selector.py
 
 Provides tea recommendations based on current weather conditions,
 using pre-defined CSV files for different weather categories.
+
+The Tea Selector tab is added once (add_tea_selector_tab) and refilled with
+fill_tea_selector_tab when the weather condition changes. pick_tea does the
+slow part (CSV sample, image load and resize) and may run on a worker thread.
 '''
 
 import os                                                       # Used for building paths to locate tea CSV files
@@ -109,29 +113,76 @@ def get_available_weather_types():
     return list(WEATHER_TO_FILE.keys())
 
 
-def add_tea_selector_tab(notebook, weather_data):
+def add_tea_selector_tab(notebook):
 
     """
-    Add a new tab to the notebook widget with tea recommendations.
+    Add an empty Tea Selector tab to the notebook widget.
 
     Parameters:
         notebook (ttk.Notebook): The notebook to add the tab to
-        weather_data (dict): Full weather data with 'weather' key as string
+
+    Returns:
+        tk.Frame: The tab, to be filled with fill_tea_selector_tab
     """
-    
+
     tea_tab = tk.Frame(notebook, bg="black")
     notebook.add(tea_tab, text="Tea Selector")
 
     tea_tab.columnconfigure(0, weight=1)
     tea_tab.rowconfigure(4, weight=1)
+    return tea_tab
 
-    try:
-        weather_main = weather_data['weather']
-    except (KeyError, IndexError):
-        weather_main = ""
+
+def pick_tea(weather_data):
+
+    """
+    Choose a tea for the given weather and load its picture; safe to call off the Tk thread.
+
+    Parameters:
+        weather_data (WeatherReading): Current reading, or None
+
+    Returns:
+        tuple: (condition group it was picked for, suggestion text, resized PIL image or None)
+    """
+
+    # Condition group such as "Rain" (or the description if the id is unknown)
+    weather_main = weather_data.condition_main if weather_data is not None else ""
 
     suggestion = get_tea_recommendation(weather_main)
 
+    # Load a random tea image from data folder
+    try:
+        selected_image = random.choice(TEA_IMAGES)
+        image_path = os.path.join(CSV_DIR, selected_image)
+        pil_image = Image.open(image_path)
+        pil_image = pil_image.resize((400, 400), Image.Resampling.LANCZOS)
+    except Exception as e:
+        print(f"Unable to load tea icon: {e}")
+        pil_image = None
+
+    return weather_main, suggestion, pil_image
+
+
+def fill_tea_selector_tab(tea_tab, weather_data, pick=None):
+
+    """
+    Replace the tab's contents with a tea recommendation for the given weather.
+
+    Parameters:
+        tea_tab (tk.Frame): Tab created by add_tea_selector_tab
+        weather_data (WeatherReading): Current reading, or None
+        pick (tuple): Result of pick_tea prepared in the background; only if it
+            is missing is a tea picked here, on the calling thread
+    """
+
+    if pick is None:
+        pick = pick_tea(weather_data)
+    _, suggestion, pil_image = pick
+
+    # Clear the previous suggestion
+    for widget in tea_tab.winfo_children():
+        widget.destroy()
+
     header = tk.Label(
         tea_tab,
         text="Your Weather-Based Tea Suggestion:",
@@ -151,18 +202,12 @@ def add_tea_selector_tab(notebook, weather_data):
     )
     message.grid(row=1, column=0, pady=(0, 10), sticky="n")
 
-    # Load a random tea image from data folder
-    try:
-        selected_image = random.choice(TEA_IMAGES)
-        image_path = os.path.join(CSV_DIR, selected_image)
-        pil_image = Image.open(image_path)
-        pil_image = pil_image.resize((400, 400), Image.Resampling.LANCZOS)
+    # PhotoImage must be created on the Tk thread
+    if pil_image is not None:
         tea_icon = ImageTk.PhotoImage(pil_image)
         tea_label = tk.Label(tea_tab, image=tea_icon, bg="black")
         tea_label.image = tea_icon 
         tea_label.grid(row=2, column=0, pady=(20, 10))
-    except Exception as e:
-        print(f"Unable to load tea icon: {e}")
 
     footer = tk.Label(
         tea_tab,
@@ -0,0 +1,267 @@
+"""
+forecast_engine.py
+
+Vectorized aggregation of 5-day / 3-hour forecasts for the Weather Dashboard.
+
+Loads one or many forecast payloads into NumPy arrays once, then summarizes
+them over configurable time buckets without per-entry Python loops:
+- load_forecasts(payloads): Stack the "list" entries of many payloads into a ForecastArrays.
+- aggregate(arrays, bucket): Min/max/mean temperature, mean humidity, wind speed and
+  visibility, and circular-mean wind direction for every (city, bucket).
+- summarize_days(payload, limit): One payload's local-time days as ForecastDay records.
+
+Buckets are computed in each city's local time (the payload's city.timezone):
+    "day"       Local calendar days
+    "12h"       00:00-12:00 and 12:00-24:00 local
+    "6h"        Four 6-hour blocks per local day
+    "daynight"  06:00-18:00 (day) and 18:00-06:00 (night) local
+    "utc_day"   UTC calendar days (the original dt_txt grouping)
+"""
+
+import numpy as np                    # Array storage and grouped reductions
+from datetime import datetime, timezone    # For turning bucket starts into dates
+from models import ForecastDay        # Daily records returned to the UI
+
+
+# Bucket name -> (length in seconds, offset of the first boundary from local midnight, use local time)
+BUCKETS = {
+    "day": (86400, 0, True),
+    "12h": (43200, 0, True),
+    "6h": (21600, 0, True),
+    "daynight": (43200, 6 * 3600, True),
+    "utc_day": (86400, 0, False),
+}
+
+
+class ForecastArrays:
+
+    '''
+    Column arrays for the forecast entries of one or more cities, in payload order.
+
+    Every per-entry array has one element per entry; city holds the index of the
+    payload each entry came from. Missing visibility or wind direction is NaN,
+    a missing condition id is -1.
+    '''
+
+    __slots__ = ("city", "dt", "tz_offset", "temp", "humidity", "wind_speed", "wind_deg",
+                 "visibility", "condition_id", "description", "cities")
+
+    def __init__(self, city, dt, tz_offset, temp, humidity, wind_speed, wind_deg,
+                 visibility, condition_id, description, cities):
+        self.city = city                    # int32 payload index per entry
+        self.dt = dt                        # int64 UTC epoch seconds
+        self.tz_offset = tz_offset          # int64 seconds east of UTC, per entry
+        self.temp = temp                    # float64 °C
+        self.humidity = humidity            # float64 %
+        self.wind_speed = wind_speed        # float64 m/s (NaN if missing)
+        self.wind_deg = wind_deg            # float64 degrees (NaN if missing)
+        self.visibility = visibility        # float64 metres (NaN if missing)
+        self.condition_id = condition_id    # int32 OWM condition id (-1 if missing)
+        self.description = description      # list of condition descriptions
+        self.cities = cities                # number of payloads loaded
+
+    def __len__(self):
+        return len(self.dt)
+
+
+class BucketStats:
+
+    '''
+    Result of aggregate(): one element per non-empty (city, bucket), ordered by city then time.
+
+    start/end are the bucket's UTC epoch bounds; local_start is start shifted into
+    the city's local time (useful for labelling). wind_deg is the circular mean
+    direction and is NaN where no entry reported one; likewise for visibility.
+    '''
+
+    __slots__ = ("city", "start", "end", "local_start", "count", "temp_min", "temp_max", "temp_mean",
+                 "humidity", "wind_speed", "wind_deg", "visibility", "condition_id", "description")
+
+    def __init__(self, **columns):
+        for name in self.__slots__:
+            setattr(self, name, columns[name])
+
+    def __len__(self):
+        return len(self.start)
+
+    def for_city(self, index):
+
+        '''
+        Return the row positions belonging to payload number index.
+        '''
+
+        return np.flatnonzero(self.city == index)
+
+
+# Stand-in for entries without a "wind" object
+_NO_WIND = {}
+
+
+def load_forecasts(payloads):
+
+    '''
+    Stack the entries of many Forecast API payloads into one ForecastArrays.
+
+    Args:
+        payloads (iterable of dict): Raw /data/2.5/forecast responses.
+
+    Raises:
+        Exception: If a payload has no "list" (same as api._summarize_forecast).
+    '''
+
+    rows, description, city, tz_offset = [], [], [], []
+    count = 0
+    for index, payload in enumerate(payloads):
+        if "list" not in payload:
+            raise Exception("Forecast data unavailable")
+        entries = payload["list"]
+        count += 1
+        city.append(np.full(len(entries), index, dtype=np.int32))
+        tz_offset.append(np.full(len(entries), payload.get("city", {}).get("timezone", 0), dtype=np.int64))
+
+        # One tuple per entry; missing optional fields become NaN (None -> NaN in a float array)
+        rows.extend([
+            (e["dt"], e["main"]["temp"], e["main"]["humidity"],
+             e.get("wind", _NO_WIND).get("speed"), e.get("wind", _NO_WIND).get("deg"),
+             e.get("visibility"), e["weather"][0].get("id", -1))
+            for e in entries
+        ])
+        description.extend([e["weather"][0]["description"] for e in entries])
+
+    # Columns: dt, temp, humidity, wind speed, wind deg, visibility, condition id
+    table = np.array(rows, dtype=np.float64).reshape(-1, 7)
+    return ForecastArrays(
+        city=np.concatenate(city) if city else np.zeros(0, dtype=np.int32),
+        dt=table[:, 0].astype(np.int64),
+        tz_offset=np.concatenate(tz_offset) if tz_offset else np.zeros(0, dtype=np.int64),
+        temp=table[:, 1].copy(),
+        humidity=table[:, 2].copy(),
+        wind_speed=table[:, 3].copy(),
+        wind_deg=table[:, 4].copy(),
+        visibility=table[:, 5].copy(),
+        condition_id=table[:, 6].astype(np.int32),
+        description=description,
+        cities=count,
+    )
+
+
+def _nan_mean(values, starts):
+
+    '''
+    Grouped mean ignoring NaNs; NaN for groups with no valid value.
+    '''
+
+    valid = ~np.isnan(values)
+    sums = np.add.reduceat(np.where(valid, values, 0.0), starts)
+    counts = np.add.reduceat(valid.astype(np.int64), starts)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(counts > 0, sums / np.maximum(counts, 1), np.nan)
+
+
+def aggregate(arrays, bucket="day"):
+
+    '''
+    Summarize every (city, bucket) group of arrays in one vectorized pass.
+
+    Entries must be in time order within each city (as the API returns them).
+
+    Args:
+        arrays (ForecastArrays): Output of load_forecasts.
+        bucket (str): One of BUCKETS.
+
+    Returns:
+        BucketStats: One element per non-empty group.
+    '''
+
+    if bucket not in BUCKETS:
+        raise ValueError(f"Unknown bucket {bucket!r}; expected one of {', '.join(BUCKETS)}")
+    length, phase, local = BUCKETS[bucket]
+
+    # Bucket number of each entry: shift into local time and align to the bucket phase
+    shift = (arrays.tz_offset if local else np.zeros_like(arrays.dt)) - phase
+    bucket_id = (arrays.dt + shift) // length
+
+    # Group boundaries: the first entry, then wherever the city or bucket changes
+    change = (np.diff(bucket_id) != 0) | (np.diff(arrays.city) != 0)
+    starts = np.concatenate(([0], np.flatnonzero(change) + 1)) if len(arrays) else np.zeros(0, dtype=np.int64)
+    counts = np.diff(np.append(starts, len(arrays)))
+
+    # reduceat needs at least one group
+    if not len(starts):
+        return _empty_stats()
+
+    # Circular mean of wind direction: average the unit vectors, then take the angle
+    radians = np.deg2rad(arrays.wind_deg)
+    sin_mean = _nan_mean(np.sin(radians), starts)
+    cos_mean = _nan_mean(np.cos(radians), starts)
+    wind_deg = np.mod(np.round(np.rad2deg(np.arctan2(sin_mean, cos_mean)), 6), 360.0)
+
+    # Bucket bounds in UTC epoch seconds
+    start = bucket_id[starts] * length - shift[starts]
+
+    return BucketStats(
+        city=arrays.city[starts],
+        start=start,
+        end=start + length,
+        local_start=start + (arrays.tz_offset[starts] if local else 0),
+        count=counts,
+        temp_min=np.minimum.reduceat(arrays.temp, starts),
+        temp_max=np.maximum.reduceat(arrays.temp, starts),
+        temp_mean=np.add.reduceat(arrays.temp, starts) / counts,
+        humidity=np.add.reduceat(arrays.humidity, starts) / counts,
+        wind_speed=_nan_mean(arrays.wind_speed, starts),
+        wind_deg=wind_deg,
+        visibility=_nan_mean(arrays.visibility, starts),
+        condition_id=arrays.condition_id[starts],
+        description=[arrays.description[i] for i in starts],
+    )
+
+
+def _empty_stats():
+
+    '''
+    Return a BucketStats with no rows (aggregate of an empty ForecastArrays).
+    '''
+
+    ints, floats = np.zeros(0, dtype=np.int64), np.zeros(0)
+    return BucketStats(city=ints, start=ints, end=ints, local_start=ints, count=ints,
+                       temp_min=floats, temp_max=floats, temp_mean=floats, humidity=floats,
+                       wind_speed=floats, wind_deg=floats, visibility=floats,
+                       condition_id=ints, description=[])
+
+
+def _optional(value):
+    return None if np.isnan(value) else float(value)
+
+
+def to_forecast_days(stats, rows, limit=5):
+
+    '''
+    Convert BucketStats rows (e.g. stats.for_city(i)) of a day bucketing into ForecastDay records.
+    '''
+
+    days = []
+    for i in rows[:limit]:
+        condition_id = int(stats.condition_id[i])
+        days.append(ForecastDay(
+            date=datetime.fromtimestamp(int(stats.local_start[i]), tz=timezone.utc).date(),
+            temp_min=float(stats.temp_min[i]),
+            temp_max=float(stats.temp_max[i]),
+            humidity=int(round(stats.humidity[i])),
+            wind_speed=_optional(stats.wind_speed[i]),
+            wind_deg=_optional(stats.wind_deg[i]),
+            visibility=_optional(stats.visibility[i]),
+            condition_id=condition_id if condition_id >= 0 else None,
+            description=stats.description[i],
+        ))
+    return days
+
+
+def summarize_days(payload, limit=5, bucket="day"):
+
+    '''
+    Return up to limit ForecastDay summaries of one payload, grouped by local calendar day.
+    '''
+
+    stats = aggregate(load_forecasts([payload]), bucket)
+    return to_forecast_days(stats, np.arange(len(stats)), limit)
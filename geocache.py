@@ -0,0 +1,155 @@
+"""
+geocache.py
+
+Local geocoding cache for city-name suggestions.
+
+Provides GeocodeIndex, a sorted prefix index of every geocoding result seen so far:
+- lookup(query, limit): Return cached cities whose name starts with the query.
+- is_answered(query): Check whether the exact query was already answered by the API.
+- add(query, options): Record an API answer and index its cities.
+- load() / save(): Persist the index between runs as JSON.
+"""
+
+import os                             # For checking and replacing the index file
+import json                           # For persisting the index to disk
+import bisect                         # For binary-search prefix lookups on the sorted keys
+import threading                      # For guarding the index from concurrent suggestion workers
+import logging                        # For reporting unreadable index files
+
+
+def normalize(text):
+
+    '''
+    Normalize a query or city name for matching: casefold and collapse whitespace.
+    '''
+
+    return " ".join(text.casefold().split())
+
+
+class GeocodeIndex:
+
+    '''
+    Sorted prefix index over cached geocoding results.
+
+    Cities are kept in a list sorted by normalized name, so a prefix query is two
+    binary searches plus a slice. Exact queries already answered by the API are
+    remembered separately and replayed verbatim.
+    '''
+
+    def __init__(self, path=None):
+        # Sorted list of (normalized name, display, lat, lon) tuples
+        self._keys = []
+
+        # Display strings already indexed, to avoid duplicates
+        self._seen = set()
+
+        # Normalized query -> list of option dicts exactly as the API returned them
+        self._answers = {}
+
+        self._lock = threading.Lock()
+        self.path = path
+
+    def __len__(self):
+        return len(self._keys)
+
+    def is_answered(self, query):
+
+        '''
+        Return True if the exact (normalized) query was already answered by the API.
+        '''
+
+        with self._lock:
+            return normalize(query) in self._answers
+
+    def lookup(self, query, limit=5):
+
+        '''
+        Return up to limit cached option dicts for query.
+
+        An exact query seen before returns the API's original answer; otherwise
+        cached cities whose name starts with the query are returned, exact name
+        matches first. Queries with a comma ("London, GB") only match exactly.
+        '''
+
+        norm = normalize(query)
+        with self._lock:
+            if norm in self._answers:
+                return list(self._answers[norm][:limit])
+            if not norm or "," in norm:
+                return []
+
+            # All keys starting with norm sit between these two insertion points
+            start = bisect.bisect_left(self._keys, (norm,))
+            end = bisect.bisect_left(self._keys, (norm + "\uffff",))
+            matches = self._keys[start:end]
+
+        # Exact name matches first, then alphabetical by display
+        matches = sorted(matches, key=lambda m: (m[0] != norm, m[1]))
+        return [{"display": d, "lat": lat, "lon": lon} for _, d, lat, lon in matches[:limit]]
+
+    def add(self, query, options):
+
+        '''
+        Record the API's answer for query and index each returned city under its name.
+        '''
+
+        with self._lock:
+            self._answers[normalize(query)] = [dict(o) for o in options]
+            for opt in options:
+                self._insert(opt)
+
+    def _insert(self, opt):
+
+        '''
+        Insert one option dict into the sorted key list (caller holds the lock).
+        '''
+
+        if opt["display"] in self._seen:
+            return
+        self._seen.add(opt["display"])
+
+        # Index under the city name, i.e. the part before the first comma
+        name = normalize(opt["display"].split(",")[0])
+        bisect.insort(self._keys, (name, opt["display"], opt["lat"], opt["lon"]))
+
+    def load(self):
+
+        '''
+        Load a previously saved index from self.path, if it exists.
+        '''
+
+        if not self.path or not os.path.exists(self.path):
+            return
+
+        try:
+            with open(self.path, "r") as f:
+                stored = json.load(f)
+        except (OSError, ValueError) as e:
+            logging.warning("Ignoring unreadable geocode cache %s: %s", self.path, e)
+            return
+
+        with self._lock:
+            for query, options in stored.get("answers", {}).items():
+                self._answers[query] = options
+                for opt in options:
+                    self._insert(opt)
+
+    def save(self):
+
+        '''
+        Write the index to self.path (atomically via a temp file).
+        '''
+
+        if not self.path:
+            return
+
+        with self._lock:
+            stored = {"answers": dict(self._answers)}
+
+        tmp_path = self.path + ".tmp"
+        try:
+            with open(tmp_path, "w") as f:
+                json.dump(stored, f)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logging.warning("Could not save geocode cache %s: %s", self.path, e)
@@ -23,18 +23,22 @@ import logging
 
 # Core logic and styling/constants
 from db import WeatherDB
-from utils import title_case
+from utils import title_case, format_age, format_wind, format_clock, format_visibility_km
 from styles import HEADER_FONT, NORMAL_FONT, SMALL_FONT, TAB_BG, TAB_FG, ACTIVE_TAB_BG, ACTIVE_TAB_FG
 from constants import HISTORY_FOOTER, STATS_FOOTER, FORECAST_FOOTER
+from bindings import Binding, bind_label
+from dispatcher import UIDispatcher
 
 # API calls
-from api import fetch_weather_by_coords, fetch_5day_forecast_by_coords, search_city_options, APIError
+from api import fetch_weather_by_coords, fetch_5day_forecast_by_coords, search_city_options, APIError, RateLimitedError
+from api import PRIORITY_INTERACTIVE, PRIORITY_BACKGROUND, CircuitOpenError, get_circuit_states, OPEN, HALF_OPEN
+from api import get_last_known_weather
 
 # Feature tabs
 from features.history import create_history_tab, refresh_history, treeview_sort_column
 from features.stats import create_stats_tab, refresh_stats
 from features.forecast import create_forecast_tab, refresh_forecast, update_forecast_units
-from features.tea_selector import add_tea_selector_tab
+from features.tea_selector import add_tea_selector_tab, fill_tea_selector_tab, pick_tea
 
 
 class WeatherApp:
@@ -46,6 +50,7 @@ class WeatherApp:
     - Initialize suggestion mapping and database connection
     - Set default temperature unit
     - Bind feature-tab methods to this instance
+    - Start the dispatcher that applies worker-thread results on the Tk thread
     - Build UI, load last refresh time, and start auto-refresh loop
         '''
 
@@ -64,6 +69,18 @@ class WeatherApp:
         # Default temperature unit is Celsius
         self.temp_unit = "C"
 
+        # Background threads hand their results to the Tk thread through this queue (see dispatcher.py)
+        self.dispatcher = UIDispatcher(root)
+        self.dispatcher.start()
+
+        # Age (seconds) of the weather on screen when it is stale, and whether it is an offline fallback
+        self.last_weather_age = None
+        self.weather_offline = False
+
+        # Current get_weather request: its number (bumped to supersede or cancel) and city while busy
+        self.weather_request = 0
+        self.weather_busy = None
+
         # Bind feature tab methods to the class instance
         self.create_history_tab = create_history_tab.__get__(self)
         self.refresh_history = refresh_history.__get__(self)
@@ -80,13 +97,24 @@ class WeatherApp:
         self.create_stats_tab()
         self.create_forecast_tab()
 
-        # Listen for tab switch events
+        # Tabs whose data changed since they were last drawn; each is drawn when it is on screen
+        self.tea_frame = None
+        self.tea_condition = None
+        self.tea_pick = None
+        self.dirty_views = {"forecast", "history", "stats"}
+
+        # Listen for tab switch events, and catch up when the window is restored
         self.tabs.bind("<<NotebookTabChanged>>", self.on_tab_change)
+        self.root.bind("<Map>", lambda event: self.render_visible() if event.widget is self.root else None)
 
         # Suggestions UI and typing delay handling
         self.suggestions_listbox = None
         self.typing_timer = None
 
+        # Number of the latest suggestion query, and (query number, stage) of the list on screen
+        self.suggestion_query = 0
+        self.suggestions_shown = (0, 0)
+
         # Load last refresh time from file if it exists
         refresh_path = os.path.join("data", "last_refresh.txt")
         if os.path.exists(refresh_path):
@@ -145,6 +173,12 @@ class WeatherApp:
         get_btn = tk.Button(input_frame, text="Get Weather", font=NORMAL_FONT, command=self.get_weather)
         get_btn.grid(row=0, column=2)
 
+        # Busy indicator and Cancel button, shown while a weather request is in flight
+        self.busy_label = bind_label(input_frame, text="", font=SMALL_FONT, fg="#ccc", bg="black")
+        self.busy_label.layout("grid", visible=False, row=0, column=4, padx=(12, 0))
+        self.cancel_btn = Binding(tk.Button(input_frame, text="Cancel", font=SMALL_FONT, command=self.cancel_weather))
+        self.cancel_btn.layout("grid", visible=False, row=0, column=5, padx=(6, 0))
+
         # Button to toggle temperature unit
         self.unit_btn = tk.Button(
             input_frame, text="Show °F", font=NORMAL_FONT,
@@ -157,6 +191,7 @@ class WeatherApp:
         # Frame to display weather data
         self.weather_info_frame = tk.Frame(self.root, bg="black")
         self.weather_info_frame.pack(pady=(16, 2))
+        self.create_weather_card()
 
         # Create notebook for tabs
         self.tabs = ttk.Notebook(self.root)
@@ -198,7 +233,8 @@ class WeatherApp:
     Switch between Celsius and Fahrenheit:
     - Flip the temp_unit flag
     - Update toggle button label
-    - Refresh displayed weather, forecast, history, and stats
+    - Refresh displayed weather and forecast temperatures in place
+    - Mark history and stats dirty (redrawn now if on screen, else when shown)
         '''
 
         # Toggle between Celsius and Fahrenheit
@@ -209,10 +245,12 @@ class WeatherApp:
 
         # Refresh the displayed weather using the selected unit
         city = self.city_entry.get().strip()
-        self.refresh_display(city, self.last_weather if hasattr(self, "last_weather") else None)
+        self.refresh_display(
+            city, self.last_weather if hasattr(self, "last_weather") else None,
+            age=self.last_weather_age, offline=self.weather_offline
+        )
         self.update_forecast_units()
-        self.refresh_history()
-        self.refresh_stats()
+        self.invalidate("history", "stats")
 
 
     def convert_temp(self, temp_c):
@@ -220,12 +258,20 @@ class WeatherApp:
         return temp_c if self.temp_unit == "C" else temp_c * 9/5 + 32
 
 
-    def get_weather(self):
+    def get_weather(self, background=False):
 
         '''
-    Validate city selection, fetch current weather, handle errors,
-    save data to the database, and update all UI sections (display,
-    history, stats, forecast). Record and display the new refresh time.
+    Validate city selection and start a weather request (see start_weather_request):
+    fetching, saving to the database and picking a tea run on a worker
+    thread, so the window stays responsive; the result is applied on the
+    Tk thread. A newer request supersedes one still in flight.
+    Auto-refresh passes background=True so its API calls yield to
+    interactive ones, are skipped quietly when over quota, and never
+    interrupt a request already in flight.
+
+    Stale-while-revalidate: if the last known reading for this city has
+    expired, it is shown immediately (marked with its age) while the
+    request revalidates it and swaps in fresh data.
         '''
 
         # Clears the suggestion list if present
@@ -244,61 +290,207 @@ class WeatherApp:
             messagebox.showerror("Error", "Please select a valid city from suggestions.")
             return
 
+        # Let the user's own request finish instead of restarting it
+        if background and self.weather_busy:
+            return
+
         # Get coordinates from suggestion mapping
         lat, lon = self.suggestion_coords[city_disp]
 
-        try:
-            # Fetch current weather data
-            weather = fetch_weather_by_coords(lat, lon)
-            self.last_weather = weather
-        except APIError:
-            # Record the error message and full stack trace in the console for debugging
-            logging.exception("Failed to fetch current weather")
+        # Auto-refresh calls use the background rate-limit lane
+        priority = PRIORITY_BACKGROUND if background else PRIORITY_INTERACTIVE
+
+        # Render an expired reading right away and revalidate it in the background
+        stale, age, fresh = get_last_known_weather(lat, lon)
+        revalidating = stale is not None and not fresh
+        if revalidating:
+            self.last_weather = stale
+            self.last_weather_age = age
+            self.weather_offline = False
+            self.refresh_display(city_disp, stale, age=age)
+
+        self.start_weather_request(city_disp, lat, lon, priority, background, revalidating)
+
+
+    def start_weather_request(self, city_disp, lat, lon, priority, background, revalidating=False):
+
+        '''
+    Run one weather request on a worker thread:
+    - Fetch the reading, save it (queued insert + flush) and, unless the
+      last prepared tea pick already matches its condition, pick a tea and
+      load its picture
+    - Post the result (or the error handling) to the dispatcher, where
+      finish_weather_request drops it if a newer request or Cancel came since
+    - A superseded request also skips saving its reading
+    - Any failure still posts a completion, so the busy state is always cleared
+    When revalidating a stale reading, failures keep it on screen marked
+    as offline instead of showing an error.
+        '''
+
+        # Supersede whatever is in flight and show the busy state
+        self.weather_request += 1
+        request = self.weather_request
+        self.set_weather_busy(city_disp, background)
 
-            # Show a user-friendly popup in the GUI
+        # Condition of the tea pick already prepared (read here, on the Tk thread)
+        tea_ready = self.tea_pick[0] if self.tea_pick else None
+
+        def post(callback, key="weather"):
+            # Results share the "weather" key (a newer one replaces a queued one); popups pass key=None so none is lost
+            self.dispatcher.post(lambda: self.finish_weather_request(request, callback), key=key)
+
+        def show_error():
             messagebox.showerror(
                 "Error",
                 "Could not fetch current weather at this time.\n"
                 "Please check API status and try again later."
             )
+
+        def worker():
+            try:
+                run()
+            except Exception:
+                # Unexpected failure (bad payload, database error, ...): log it and still end the request
+                logging.exception("Weather request for %s failed", city_disp)
+                post(show_error, key=None)
+
+        def run():
+            try:
+                # Fetch current weather data
+                weather = fetch_weather_by_coords(lat, lon, priority)
+            except RateLimitedError:
+                # Background refresh skipped to save quota; try again next cycle
+                logging.info("Skipped weather fetch to stay within the API rate limit")
+                post(lambda: None)
+                return
+            except APIError as e:
+                if revalidating:
+                    logging.info("Revalidation failed; keeping last known weather for %s", city_disp)
+                    post(lambda: self.show_offline_weather(city_disp))
+                elif isinstance(e, CircuitOpenError):
+                    # API known to be down: the refresh label already says so, so skip the popup on auto-refresh
+                    logging.info("Skipped weather fetch while the API circuit is open")
+                    post(lambda: self.show_weather_outage(background), key=None)
+                else:
+                    # Record the error message and full stack trace in the console for debugging
+                    logging.exception("Failed to fetch current weather")
+                    post(show_error, key=None)
+                return
+
+            # Superseded or cancelled while fetching: do not store the reading
+            if request != self.weather_request:
+                return
+
+            # Save weather information to database (committed before the tabs read it back)
+            self.db.insert_reading(city_disp, weather)
+            self.db.flush()
+
+            # Prepare the tea suggestion only when the Tea Selector will need a new one
+            tea = pick_tea(weather) if weather.condition_main != tea_ready else None
+
+            post(lambda: self.apply_weather(city_disp, weather, background, tea))
+
+        threading.Thread(target=worker, name="weather-request", daemon=True).start()
+
+
+    def finish_weather_request(self, request, callback):
+
+        '''
+    On the Tk thread: clear the busy state and run callback, unless the
+    request was superseded or cancelled in the meantime.
+        '''
+
+        if request != self.weather_request:
             return
+        self.set_weather_busy(None)
+        callback()
 
-        # Save weather information to database
-        self.db.insert_weather(
-            city=city_disp,
-            temp=weather["temp"],
-            feels_like=weather["feels_like"],
-            weather=title_case(weather["weather"]),
-            humidity=weather["humidity"],
-            pressure=weather["pressure"],
-            visibility=weather["visibility"],
-            wind=weather["wind"],
-            sea_level=weather["sea_level"],
-            grnd_level=weather["grnd_level"],
-            sunrise=weather["sunrise"],
-            sunset=weather["sunset"]
-        )
 
-        # Refresh UI tabs with new data
-        self.refresh_display(city_disp, weather)
-        self.refresh_history()
-        self.refresh_stats()
-        self.refresh_forecast(city_disp)
+    def cancel_weather(self):
+
+        '''
+    Cancel button handler: abandon the request in flight. The network call
+    cannot be interrupted, but its result is neither saved nor shown.
+        '''
+
+        self.weather_request += 1
+        self.set_weather_busy(None)
+
+
+    def set_weather_busy(self, city_disp, background=False):
+
+        '''
+    Show (or, with city_disp None, hide) the busy indicator and Cancel button.
+        '''
+
+        self.weather_busy = city_disp
+        if city_disp:
+            verb = "Refreshing" if background else "Fetching weather for"
+            self.busy_label.set(text=f"⏳ {verb} {title_case(city_disp)}...")
+        self.busy_label.show(bool(city_disp))
+        self.cancel_btn.show(bool(city_disp))
+
+
+    def show_weather_outage(self, background):
+
+        '''
+    Report that the API circuit is open: a popup for interactive requests,
+    the refresh label (which shows the outage) in every case.
+        '''
+
+        if not background:
+            messagebox.showerror(
+                "Error",
+                "The weather service is currently unreachable.\n"
+                "Retrying automatically, please try again shortly."
+            )
+        self.update_refresh_label()
+
+
+    def show_offline_weather(self, city_disp):
 
-        # Save index of currently selected tab
-        current_index = self.tabs.index(self.tabs.select())
+        '''
+    Mark the on-screen stale reading as an offline fallback,
+    unless the user has moved on to another city.
+        '''
+
+        if self.city_entry.get().strip() != city_disp:
+            return
+        self.weather_offline = True
+        self.refresh_display(city_disp, self.last_weather, age=self.last_weather_age, offline=True)
+        self.update_refresh_label()
 
-        # Remove the Tea Selector tab if it already exists
-        for i in range(self.tabs.index("end")):
-            if self.tabs.tab(i, option="text") == "Tea Selector":
-                self.tabs.forget(i)
-                break
 
-        # Add the refreshed Tea Selector tab
-        add_tea_selector_tab(self.tabs, self.last_weather)
+    def apply_weather(self, city_disp, weather, background=False, tea=None):
+
+        '''
+    Show a freshly fetched (and already saved) reading on the Tk thread:
+    - Refresh the weather card (always on screen)
+    - Mark history, stats, forecast and (if the condition changed) the Tea
+      Selector dirty; only the tab on screen is redrawn now
+    - tea is the pick_tea result prepared by the worker, if any; otherwise
+      the last pick (made for this condition) is kept for the Tea Selector
+    - Record the new refresh time
+        '''
+
+        # Ignore late results for a city the user has moved away from
+        if self.city_entry.get().strip() != city_disp:
+            return
+
+        self.last_weather = weather
+        self.last_weather_age = None
+        self.weather_offline = False
+
+        # The weather card is always visible; the tabs are redrawn when shown
+        self.refresh_display(city_disp, weather)
 
-        # Restore the previously selected tab by index
-        self.tabs.select(current_index)
+        # Add the Tea Selector tab with the first reading; its suggestion only depends on the condition
+        if self.tea_frame is None:
+            self.tea_frame = add_tea_selector_tab(self.tabs)
+        if tea is not None:
+            self.tea_pick = tea
+        tea_changed = weather.condition_main != self.tea_condition
+        self.invalidate("history", "stats", "forecast", *(["tea"] if tea_changed else []), background=background)
 
         # ✅ Update refresh time and store it
         self.last_refresh_time = time.strftime("%Y-%m-%d %H:%M:%S")
@@ -309,94 +501,192 @@ class WeatherApp:
             f.write(self.last_refresh_time)
 
         # Update label with new refresh time
-        if hasattr(self, 'refresh_label'):
-            self.refresh_label.config(
-                text=f"Last refreshed: {self.last_refresh_time}  •••  Next refresh in: {self.next_refresh_seconds} s"
-            )
+        self.update_refresh_label()
 
 
-    def refresh_display(self, city, weather):
+    def update_refresh_label(self):
 
         '''
-    Clear and rebuild the main weather card for a given city:
-    - Convert and format temps, visibility, etc.
-    - Create a styled frame showing city, temperature,
-      condition icon, and detailed metrics.
+    Show the last refresh time, the countdown to the next refresh and,
+    when an API circuit breaker is not closed, the service status.
         '''
 
-        # Clear previous weather card content
-        for widget in self.weather_info_frame.winfo_children():
-            widget.destroy()
-
-        # Skip if no weather data is available
-        if not weather:
+        if not hasattr(self, 'refresh_label'):
             return
 
-        # Convert temperature units
-        temp = self.convert_temp(weather['temp'])
-        feels_like = self.convert_temp(weather["feels_like"])
-        t_unit = "°C" if self.temp_unit == "C" else "°F"
+        text = f"Last refreshed: {self.last_refresh_time}  •••  Next refresh in: {self.next_refresh_seconds} s"
 
-        # Calculate visibility in kilometers
-        visibility = weather.get("visibility", "N/A")
-        if visibility != "N/A" and isinstance(visibility, (int, float)):
-            visibility_km = round(visibility / 1000, 1)
-        else:
-            visibility_km = "N/A"
+        # Surface circuit breaker state so users know why data is not updating
+        states = get_circuit_states().values()
+        open_circuits = [s for s in states if s["state"] == OPEN]
+        if open_circuits:
+            retry_in = max(s["retry_in"] for s in open_circuits)
+            text += f"  •••  Weather service unreachable (retrying in {retry_in:.0f} s)"
+        elif any(s["state"] == HALF_OPEN for s in states):
+            text += "  •••  Reconnecting to weather service..."
+
+        self.refresh_label.config(text=text)
+
+
+    def create_weather_card(self):
+
+        '''
+    Build the main weather card once, hidden until the first reading:
+    - A styled frame for city, temperature, condition and detailed metrics.
+    - Every changing label is a Binding (see bindings.py), so refresh_display
+      only reconfigures the text that actually changed.
+        '''
 
         # Main weather display card container
-        card = tk.Frame(self.weather_info_frame, bg="#222", bd=3, relief="ridge", padx=20, pady=14)
-        card.pack(pady=12)
+        frame = tk.Frame(self.weather_info_frame, bg="#222", bd=3, relief="ridge", padx=20, pady=14)
+        card = {"card": Binding(frame).layout("pack", visible=False, pady=12)}
 
         # City name
-        tk.Label(card, text=title_case(city), font=("Helvetica Neue", 20, "bold"), fg="#ffe047", bg="#222").pack()
+        card["city"] = bind_label(frame, text="", font=("Helvetica Neue", 20, "bold"), fg="#ffe047", bg="#222").layout("pack")
+
+        # Staleness note for last-known data, shown right under the city when needed
+        card["note"] = bind_label(frame, text="", font=("Helvetica Neue", 12), fg="#ccc", bg="#222")
+        card["note"].layout("pack", visible=False, after=card["city"].widget)
 
         # Temperature line
-        tk.Label(card, text=f"{temp:.1f}{t_unit} (Feels like: {feels_like:.1f}{t_unit})", font=("Helvetica Neue", 16), fg="#fff", bg="#222").pack()
+        card["temp"] = bind_label(frame, text="", font=("Helvetica Neue", 16), fg="#fff", bg="#222").layout("pack")
 
         # Weather condition description
-        tk.Label(card, text=f"🌤️ {title_case(weather['weather'])}", font=("Helvetica Neue", 16), fg="#fff", bg="#222").pack(pady=(0, 6))
+        card["description"] = bind_label(frame, text="", font=("Helvetica Neue", 16), fg="#fff", bg="#222").layout("pack", pady=(0, 6))
 
         # Divider line
-        tk.Label(card, text="──────────────", font=("Helvetica Neue", 12), fg="#555", bg="#222").pack(pady=4)
+        tk.Label(frame, text="──────────────", font=("Helvetica Neue", 12), fg="#555", bg="#222").pack(pady=4)
+
+        # First row: Humidity, Wind, Visibility; second row: Pressure, Sunrise, Sunset
+        rows = (
+            (("humidity", "#bfffa5"), ("wind", "#43fad8"), ("visibility", "#a1e3ff")),
+            (("pressure", "#ffd580"), ("sunrise", "#ffacac"), ("sunset", "#ffacac")),
+        )
+        for names in rows:
+            row = tk.Frame(frame, bg="#222")
+            row.pack(pady=2)
+            for column, (name, color) in enumerate(names):
+                card[name] = bind_label(row, text="", font=("Helvetica Neue", 14), fg=color, bg="#222")
+                card[name].layout("grid", row=0, column=column, padx=14, sticky="w")
+
+        self.weather_card = card
+
+
+    def refresh_display(self, city, weather, age=None, offline=False):
+
+        '''
+    Update the main weather card in place for a given city:
+    - Convert and format temps, visibility, etc.
+    - Set the text of the card's labels; unchanged ones cost nothing.
+    - If age is given, note how old the (stale) reading is, and
+      whether it is an offline fallback or being refreshed.
+        '''
+
+        card = self.weather_card
+
+        # Hide the card if no weather data is available
+        card["card"].show(bool(weather))
+        if not weather:
+            return
+
+        # Convert temperature units
+        temp = self.convert_temp(weather.temp)
+        feels_like = self.convert_temp(weather.feels_like)
+        t_unit = "°C" if self.temp_unit == "C" else "°F"
+
+        # Calculate visibility in kilometers
+        visibility_km = format_visibility_km(weather.visibility)
+
+        # City name
+        card["city"].set(text=title_case(city))
+
+        # Staleness note for last-known data
+        card["note"].show(age is not None)
+        if age is not None:
+            if offline:
+                note, color = f"⚠️ Offline: showing data from {format_age(age)}", "#ffacac"
+            else:
+                note, color = f"⏳ Updated {format_age(age)}, refreshing...", "#ccc"
+            card["note"].set(text=note, fg=color)
+
+        # Temperature line and weather condition description
+        card["temp"].set(text=f"{temp:.1f}{t_unit} (Feels like: {feels_like:.1f}{t_unit})")
+        card["description"].set(text=f"🌤️ {title_case(weather.description)}")
 
         # First row: Humidity, Wind, Visibility
-        row1 = tk.Frame(card, bg="#222")
-        row1.pack(pady=2)
-        tk.Label(row1, text=f"💧 Humidity: {weather['humidity']}%", font=("Helvetica Neue", 14), fg="#bfffa5", bg="#222").grid(row=0, column=0, padx=14, sticky="w")
-        tk.Label(row1, text=f"🌬️ Wind: {weather['wind']}", font=("Helvetica Neue", 14), fg="#43fad8", bg="#222").grid(row=0, column=1, padx=14, sticky="w")
-        tk.Label(row1, text=f"👁️ Visibility: {visibility_km} km", font=("Helvetica Neue", 14), fg="#a1e3ff", bg="#222").grid(row=0, column=2, padx=14, sticky="w")
+        card["humidity"].set(text=f"💧 Humidity: {weather.humidity}%")
+        card["wind"].set(text=f"🌬️ Wind: {format_wind(weather.wind_speed, weather.wind_deg)}")
+        card["visibility"].set(text=f"👁️ Visibility: {visibility_km} km")
 
         # Second row: Pressure, Sunrise, Sunset
-        row2 = tk.Frame(card, bg="#222")
-        row2.pack(pady=2)
-        tk.Label(row2, text=f"📄 Pressure: {weather['pressure']} hPa", font=("Helvetica Neue", 14), fg="#ffd580", bg="#222").grid(row=0, column=0, padx=14, sticky="w")
-        tk.Label(row2, text=f"🌅 Sunrise: {weather['sunrise']}", font=("Helvetica Neue", 14), fg="#ffacac", bg="#222").grid(row=0, column=1, padx=14, sticky="w")
-        tk.Label(row2, text=f"🌇 Sunset: {weather['sunset']}", font=("Helvetica Neue", 14), fg="#ffacac", bg="#222").grid(row=0, column=2, padx=14, sticky="w")
+        card["pressure"].set(text=f"📄 Pressure: {weather.pressure} hPa")
+        card["sunrise"].set(text=f"🌅 Sunrise: {format_clock(weather.sunrise, weather.tz_offset)}")
+        card["sunset"].set(text=f"🌇 Sunset: {format_clock(weather.sunset, weather.tz_offset)}")
 
 
-    def on_tab_change(self, event):
+    def invalidate(self, *views, background=False):
 
         '''
-    Notebook tab-change handler:
-    - Detect selected tab index and trigger appropriate refresh:
-      0→forecast, 1→history, 2→stats
+    Mark views ("forecast", "history", "stats", "tea") as out of date:
+    - The one on screen is redrawn right away
+    - The others wait until their tab is selected (see on_tab_change)
         '''
 
-        # Determine which tab is selected by index
-        idx = self.tabs.index(self.tabs.select())
+        self.dirty_views.update(views)
+        self.render_visible(background)
 
-        if idx == 0:
-            # Forecast tab selected
-            self.refresh_forecast(self.city_entry.get().strip())
 
-        elif idx == 1:
-            # History tab selected
-            self.refresh_history()
+    def visible_view(self):
+
+        '''
+    Return the name of the tab on screen, or None while the window is minimized.
+        '''
+
+        if self.root.state() == "iconic":
+            return None
+        selected = self.tabs.select()
+        views = {
+            str(self.forecast_frame): "forecast",
+            str(self.history_frame): "history",
+            str(self.stats_frame): "stats",
+            str(self.tea_frame): "tea",
+        }
+        return views.get(str(selected))
+
+
+    def render_visible(self, background=False):
+
+        '''
+    Redraw the tab on screen if it is marked dirty (a no-op otherwise).
+    background=True keeps a forecast fetch in the background rate-limit lane.
+        '''
 
-        elif idx == 2:
-            # Stats tab selected
+        view = self.visible_view()
+        if view not in self.dirty_views:
+            return
+        self.dirty_views.discard(view)
+
+        if view == "forecast":
+            self.refresh_forecast(self.city_entry.get().strip(), background=background)
+        elif view == "history":
+            self.refresh_history()
+        elif view == "stats":
             self.refresh_stats()
+        elif view == "tea":
+            # Always drawn from the pick prepared off the Tk thread (see start_weather_request)
+            self.tea_condition = self.tea_pick[0]
+            fill_tea_selector_tab(self.tea_frame, self.last_weather, self.tea_pick)
+
+
+    def on_tab_change(self, event):
+
+        '''
+    Notebook tab-change handler:
+    - Draw the newly selected tab if its data changed while it was hidden
+      (forecast, history, stats or tea selector); otherwise nothing to do
+        '''
+
+        self.render_visible()
     
 
     def next_tab(self, event=None):
@@ -567,7 +857,7 @@ class WeatherApp:
     Debounced trigger for fetching city suggestions:
     - Skip queries shorter than 2 chars
     - Spawn a background thread to call search_city_options(),
-      then schedule show_suggestions via root.after.
+      then post show_suggestions to the dispatcher (newest answer wins).
         '''
 
         # Grab the query from the entry field
@@ -580,17 +870,36 @@ class WeatherApp:
                 self.suggestions_listbox = None
             return
 
+        # Number this query so answers to older ones can be told apart
+        self.suggestion_query += 1
+        number = self.suggestion_query
+
         def worker():
 
             '''
     (nested) Background thread target for fetch_suggestions:
-    - Call search_city_options(query)
-    - Schedule show_suggestions on the main thread
+    - Call search_city_options(query), answered from the local index when possible
+    - Post show_suggestions to the main thread (again if the API adds matches);
+      the callback itself decides whether its answer is still the newest
             '''
 
-            options = search_city_options(query)
-            self.root.after(0, lambda: self.show_suggestions(options))
-            
+            def post(options, stage):
+                # Stage 0: first answer; stage 1: list merged with the API's matches.
+                # No coalescing key: a later post may be the older answer, so each one checks itself
+                self.dispatcher.post(lambda: show_if_current(options, stage))
+
+            def show_if_current(options, stage):
+                # Ignore late answers for a query the user has typed past,
+                # and never let the first answer replace the merged list
+                if self.city_entry.get().strip() != query or (number, stage) <= self.suggestions_shown:
+                    return
+                self.suggestions_shown = (number, stage)
+                self.show_suggestions(options)
+
+            # Cached matches come back at once; API gap-fills arrive through on_update (possibly first)
+            options = search_city_options(query, on_update=lambda opts: post(opts, 1))
+            post(options, 0)
+
         threading.Thread(target=worker, daemon=True).start()
 
 
@@ -695,10 +1004,7 @@ class WeatherApp:
             if self.next_refresh_seconds > 0:
                 self.next_refresh_seconds -= 1
 
-            if hasattr(self, 'refresh_label'):
-                self.refresh_label.config(
-                    text=f"Last refreshed: {self.last_refresh_time}  •••  Next refresh in: {self.next_refresh_seconds} s"
-                )
+            self.update_refresh_label()
 
             # Schedule next 1-second update
             self.root.after(1000, update_timer)
@@ -716,7 +1022,7 @@ class WeatherApp:
             city_disp = self.city_entry.get().strip()
             if city_disp and city_disp in self.suggestion_coords:
                 # Fetch new weather if city selected
-                self.get_weather()
+                self.get_weather(background=True)
             else:
                 # Otherwise, update the refresh time at the next interval
                 self.last_refresh_time = time.strftime("%Y-%m-%d %H:%M:%S")
@@ -725,10 +1031,7 @@ class WeatherApp:
                 with open(os.path.join("data", "last_refresh.txt"), "w") as f:
                     f.write(self.last_refresh_time)
 
-                if hasattr(self, 'refresh_label'):
-                    self.refresh_label.config(
-                        text=f"Last refreshed: {self.last_refresh_time}  •••  Next refresh in: {self.next_refresh_seconds} s"
-                    )
+                self.update_refresh_label()
 
             # Restart the 60-second refresh timer
             self.next_refresh_seconds = 60
@@ -0,0 +1,193 @@
+"""
+history_pager.py
+
+Windowed access to the weather history for the virtualized History tab.
+
+Provides:
+- HistoryPager: Serve any slice of the sorted, filtered history by row position,
+  loading fixed-size pages from WeatherDB on demand and keeping only a few of them.
+
+A page next to a cached one is loaded with its keyset cursor (one index range
+scan); a page reached by jumping (e.g. dragging the scrollbar) is found with
+WeatherDB.get_history_cursor first. Memory use is bounded by cache_pages,
+whatever the size of the table.
+
+update() takes in readings added since the last look without reloading: with
+the time sort they can only land at one end of the list, so newest-first they
+are kept in a short head list above the cached pages, and oldest-first they
+just extend the count. Its cost depends only on how many rows were added.
+"""
+
+from collections import OrderedDict
+from db import HISTORY_PAGE_SIZE, HistoryPage
+
+
+class HistoryPager:
+
+    '''
+    Random access by position to the rows of WeatherDB.get_history_page, with an LRU page cache.
+
+    Positions count from 0 at the top of the current sort order. Call update()
+    after rows were added (or refresh() to start over) so count and the cached
+    pages are current again.
+    '''
+
+    def __init__(self, db, page_size=HISTORY_PAGE_SIZE, cache_pages=8):
+        self.db = db
+        self.page_size = page_size
+        self.cache_pages = max(2, cache_pages)
+
+        # Current query: sort column, direction and get_history_page filters
+        self.sort = "timestamp"
+        self.descending = True
+        self.filters = {}
+
+        # Page number -> HistoryPage, least recently used first
+        self.pages = OrderedDict()
+        self.count = 0
+
+        # Rows taken in by update() above page 0, as (id, row) newest first
+        self.head = []
+
+        # Newest row id seen, and the (timestamp, id) key of the newest matching row
+        self.newest_id = 0
+        self.edge = None
+
+        # Counters for diagnostics and benchmarks
+        self.page_loads = 0
+        self.seeks = 0
+        self.cache_hits = 0
+
+        self.refresh()
+
+    def set_query(self, sort="timestamp", descending=True, **filters):
+
+        '''
+        Change the sort order and filters (get_history_page keywords), then reload.
+        '''
+
+        self.sort = sort
+        self.descending = descending
+        self.filters = filters
+        self.refresh()
+
+    def refresh(self):
+
+        '''
+        Drop the cached pages and recount the matching rows.
+
+        Returns:
+            int: The new row count.
+        '''
+
+        self.pages.clear()
+        self.head = []
+        self.count, self.newest_id = self.db.history_state(**self.filters)
+
+        # Newest matching reading; unknown if it was committed after the snapshot above
+        top = self.db.get_history_page(limit=1, **self.filters)
+        self.edge = None
+        if top.rows and top.ids[0] <= self.newest_id:
+            self.edge = (top.rows[0][0], top.ids[0])
+        return self.count
+
+    def update(self):
+
+        '''
+        Take in the readings added since the last refresh() or update().
+
+        New rows are only placed without reloading when the list is sorted by
+        time and they are all newer than every row already listed (always the
+        case for readings stamped on arrival); otherwise this falls back to refresh().
+
+        Returns:
+            int: Rows added above the existing ones (whose positions moved down by
+            as much), or None if the list was reloaded.
+        '''
+
+        new, self.newest_id = self.db.get_history_since_id(self.newest_id, **self.filters)
+        if not new:
+            return 0
+        oldest_new = (new[-1][1], new[-1][0])
+        if self.sort != "timestamp" or (self.count and (self.edge is None or oldest_new <= self.edge)):
+            self.refresh()
+            return None
+
+        old_count = self.count
+        self.count += len(new)
+        self.edge = (new[0][1], new[0][0])
+
+        if not self.descending:
+            # Appended at the bottom: only the last (partial) page changes
+            for number in [n for n in self.pages if (n + 1) * self.page_size >= old_count]:
+                del self.pages[number]
+            return 0
+
+        self.head[0:0] = [(row[0], row[1:]) for row in new]
+        if len(self.head) > self.page_size:
+            # Too many to keep on the side: let the pages be reloaded from the new top
+            self.head = []
+            self.pages.clear()
+        return len(new)
+
+    def rows(self, start, stop):
+
+        '''
+        Return [(row id, HISTORY_SELECT tuple), ...] for positions start to stop (exclusive).
+
+        The result is shorter than requested when it runs past the end of the history.
+        '''
+
+        start, stop = max(0, start), min(stop, self.count)
+        result = self.head[start:stop]
+
+        # The pages hold the rows below the head
+        start, stop = max(0, start - len(self.head)), stop - len(self.head)
+        if stop <= start:
+            return result
+        for number in range(start // self.page_size, (stop - 1) // self.page_size + 1):
+            page = self._page(number)
+            offset = number * self.page_size
+            lo, hi = max(start - offset, 0), min(stop - offset, len(page.rows))
+            result.extend(zip(page.ids[lo:hi], page.rows[lo:hi]))
+        return result
+
+    def _page(self, number):
+
+        '''
+        Return page number (rows number * page_size onwards, below the head), from the cache or the database.
+        '''
+
+        page = self.pages.get(number)
+        if page is not None:
+            self.pages.move_to_end(number)
+            self.cache_hits += 1
+            return page
+
+        query = dict(self.filters, limit=self.page_size, sort=self.sort, descending=self.descending)
+        above, below = self.pages.get(number - 1), self.pages.get(number + 1)
+        if number == 0:
+            # Start right below the head, if there is one
+            last = self.head[-1] if self.head else None
+            page = self.db.get_history_page(before=(last[1][0], last[0]) if last else None, **query)
+        elif above is not None and above.older is not None:
+            # Continue down from the page above
+            page = self.db.get_history_page(before=above.older, **query)
+        elif below is not None and below.newer is not None:
+            # Continue up from the page below (it is full, so this lines up on the page boundary)
+            page = self.db.get_history_page(after=below.newer, **query)
+        else:
+            # Jump: find the row just above the page, then read down from it
+            self.seeks += 1
+            cursor = self.db.get_history_cursor(number * self.page_size + len(self.head), sort=self.sort,
+                                                descending=self.descending, **self.filters)
+            page = self.db.get_history_page(before=cursor, **query) if cursor is not None else None
+
+        if page is None:
+            page = HistoryPage(rows=[], ids=[], older=None, newer=None)
+        self.page_loads += 1
+
+        self.pages[number] = page
+        while len(self.pages) > self.cache_pages:
+            self.pages.popitem(last=False)
+        return page
@@ -7,7 +7,9 @@ Creates the root Tk window, initializes WeatherApp, and starts the main loop.
 
 import tkinter as tk                    # GUI toolkit for Python
 from gui.main_app import WeatherApp     # Main application class
+from api import warm_up_connections     # Pre-opens pooled API connections
 import logging                          # Python’s built-in logging module
+import threading                        # Run connection warm-up off the UI thread
 
 
 # Configure the logging system once at startup:
@@ -19,6 +21,9 @@ logging.basicConfig(
 
 
 if __name__ == "__main__":
+    # Open API connections in the background so the first search is fast
+    threading.Thread(target=warm_up_connections, daemon=True).start()
+
     # Create the main Tkinter window
     root = tk.Tk()
 
@@ -0,0 +1,163 @@
+"""
+models.py
+
+Typed records for weather data returned by the API layer.
+
+Provides compact, slotted dataclasses holding raw numeric values; all text
+formatting happens at render time (see the format_* helpers in utils.py):
+- WeatherReading: One current-weather observation (from_owm builds it from an API payload).
+- ForecastDay: One daily forecast summary built from 3-hour forecast entries.
+- condition_group(condition_id): Map an OpenWeatherMap condition id to its group ("Rain", "Clear", ...).
+- condition_group_sql(column): The same mapping as an SQL CASE expression (for filters and indexes).
+"""
+
+from dataclasses import dataclass    # Generated __init__/__repr__/__eq__ for the records
+from datetime import date            # Calendar date of a forecast day
+from typing import Optional
+
+
+# OpenWeatherMap condition id ranges (https://openweathermap.org/weather-conditions)
+_CONDITION_GROUPS = (
+    (200, 300, "Thunderstorm"),
+    (300, 400, "Drizzle"),
+    (500, 600, "Rain"),
+    (600, 700, "Snow"),
+    (701, 702, "Mist"),
+    (741, 742, "Fog"),
+    (700, 800, "Atmosphere"),
+    (800, 801, "Clear"),
+    (801, 900, "Clouds"),
+)
+
+
+def condition_group(condition_id):
+
+    '''
+    Return the condition group name for an OpenWeatherMap condition id, or "" if unknown.
+    '''
+
+    if condition_id is None:
+        return ""
+    for low, high, name in _CONDITION_GROUPS:
+        if low <= condition_id < high:
+            return name
+    return ""
+
+
+# Group names in display order, without duplicates
+CONDITION_GROUP_NAMES = tuple(dict.fromkeys(name for _, _, name in _CONDITION_GROUPS))
+
+
+def condition_group_sql(column="condition_id"):
+
+    '''
+    Return an SQL expression mapping an integer condition id column to its group name ('' if unknown).
+
+    The ranges are tested in the same order as condition_group, so both always agree.
+    '''
+
+    cases = " ".join(f"WHEN {column} >= {low} AND {column} < {high} THEN '{name}'"
+                     for low, high, name in _CONDITION_GROUPS)
+    return f"(CASE {cases} ELSE '' END)"
+
+
+@dataclass
+class WeatherReading:
+
+    '''
+    One current-weather observation in SI units, as returned by fetch_weather_by_coords.
+
+    Optional fields are None when the API omitted them. sunrise/sunset are UTC
+    epoch seconds and tz_offset is the city's offset from UTC in seconds, so
+    local clock times can be rendered for the city rather than the machine.
+    '''
+
+    __slots__ = ("temp", "feels_like", "humidity", "pressure", "visibility",
+                 "wind_speed", "wind_deg", "wind_gust", "sea_level", "grnd_level",
+                 "sunrise", "sunset", "tz_offset", "condition_id", "description")
+
+    temp: float                   # °C
+    feels_like: float             # °C
+    humidity: int                 # %
+    pressure: int                 # hPa
+    visibility: Optional[int]     # metres
+    wind_speed: float             # m/s
+    wind_deg: Optional[float]     # degrees, meteorological
+    wind_gust: Optional[float]    # m/s
+    sea_level: Optional[int]      # hPa
+    grnd_level: Optional[int]     # hPa
+    sunrise: int                  # UTC epoch seconds
+    sunset: int                   # UTC epoch seconds
+    tz_offset: int                # seconds east of UTC
+    condition_id: Optional[int]   # OpenWeatherMap condition id, e.g. 500
+    description: str              # e.g. "light rain"
+
+    @classmethod
+    def from_owm(cls, data):
+
+        '''
+        Build a reading from a Current Weather API payload.
+        '''
+
+        main = data["main"]
+        wind = data["wind"]
+        condition = data["weather"][0]
+        return cls(
+            temp=main["temp"],
+            feels_like=main["feels_like"],
+            humidity=main["humidity"],
+            pressure=main["pressure"],
+            visibility=data.get("visibility"),
+            wind_speed=wind["speed"],
+            wind_deg=wind.get("deg"),
+            wind_gust=wind.get("gust"),
+            sea_level=main.get("sea_level"),
+            grnd_level=main.get("grnd_level"),
+            sunrise=data["sys"]["sunrise"],
+            sunset=data["sys"]["sunset"],
+            tz_offset=data.get("timezone", 0),
+            condition_id=condition.get("id"),
+            description=condition["description"],
+        )
+
+    @property
+    def condition_main(self):
+
+        '''
+        Condition group such as "Rain" or "Clouds", falling back to the description.
+        '''
+
+        return condition_group(self.condition_id) or self.description
+
+
+@dataclass
+class ForecastDay:
+
+    '''
+    Summary of one forecast day, as returned by fetch_5day_forecast_by_coords.
+
+    visibility is the mean in metres and wind_deg the mean direction, or None
+    when no entry of the day reported them.
+    '''
+
+    __slots__ = ("date", "temp_min", "temp_max", "humidity", "wind_speed", "wind_deg",
+                 "visibility", "condition_id", "description")
+
+    date: date
+    temp_min: float               # °C
+    temp_max: float               # °C
+    humidity: int                 # %, mean
+    wind_speed: Optional[float]   # m/s, mean
+    wind_deg: Optional[float]     # degrees
+    visibility: Optional[float]   # metres
+    condition_id: Optional[int]   # condition of the day's first entry
+    description: str
+
+    @property
+    def condition_main(self):
+
+        '''
+        Condition group such as "Rain" or "Clouds", falling back to the description.
+        '''
+
+        return condition_group(self.condition_id) or self.description
@@ -0,0 +1,322 @@
+"""
+offline_geocoder.py
+
+Offline city lookup for the Weather Dashboard.
+
+Turns a bulk OpenWeatherMap city list (city.list.json, optionally gzipped) into a
+compact binary index that is memory-mapped at startup and searched in place:
+- build_index(source_path, index_path): Convert city.list.json into the on-disk index.
+- OfflineGeocoder(index_path): Open an index and answer queries without the network.
+- OfflineGeocoder.search(query, limit): Prefix matches, falling back to one-typo fuzzy matches.
+
+Results use the same { 'display', 'lat', 'lon' } dicts as api.search_city_options.
+
+Index layout (little-endian):
+    header   8s magic, I record count, I string-blob offset
+    records  count x (I key offset, H key length, H display length, f lat, f lon),
+             sorted by normalized key bytes
+    strings  UTF-8 key immediately followed by UTF-8 display text, per record
+
+Usage:
+    python offline_geocoder.py city.list.json [data/city_index.bin]
+"""
+
+import os                             # For file sizes and default paths
+import sys                            # For command-line arguments
+import gzip                           # For reading gzipped city lists
+import json                           # For parsing city.list.json
+import mmap                           # For memory-mapping the index
+import struct                         # For packing fixed-width records
+import unicodedata                    # For stripping accents during normalization
+
+
+# Default index location used by api.py
+INDEX_PATH = os.path.join("data", "city_index.bin")
+
+MAGIC = b"OWMCITY1"
+HEADER = struct.Struct("<8sII")
+RECORD = struct.Struct("<IHHff")
+
+
+def normalize(text):
+
+    '''
+    Normalize a city name or query: strip accents, casefold, collapse whitespace.
+    So "São Paulo" and "sao  paulo" share the key "sao paulo".
+    '''
+
+    decomposed = unicodedata.normalize("NFKD", text)
+    stripped = "".join(c for c in decomposed if not unicodedata.combining(c))
+    return " ".join(stripped.casefold().split())
+
+
+def _display_name(city):
+
+    '''
+    Format a city.list.json entry like api.search_city_options does ("Name, State, CC").
+    State codes such as "NY" are kept upper-case; full names are title-cased.
+    '''
+
+    name = city.get("name", "")
+    state = city.get("state", "") or ""
+    if state and not state.isupper():
+        state = state.title()
+    country = (city.get("country", "") or "").upper()
+
+    if state:
+        return f"{name}, {state}, {country}"
+    return f"{name}, {country}"
+
+
+def build_index(source_path, index_path=INDEX_PATH):
+
+    '''
+    Build the binary index from an OpenWeatherMap city list.
+
+    Args:
+        source_path (str): Path to city.list.json (or city.list.json.gz).
+        index_path (str): Where to write the index.
+
+    Returns:
+        int: Number of cities written (duplicate display names are dropped).
+    '''
+
+    opener = gzip.open if source_path.endswith(".gz") else open
+    with opener(source_path, "rt", encoding="utf-8") as f:
+        cities = json.load(f)
+
+    # Collect (key bytes, display bytes, lat, lon), keeping the first of any duplicate display
+    entries = []
+    seen = set()
+    for city in cities:
+        display = _display_name(city)
+        if not city.get("name") or display in seen:
+            continue
+        seen.add(display)
+        coord = city.get("coord", {})
+        entries.append((
+            normalize(city["name"]).encode("utf-8"),
+            display.encode("utf-8"),
+            float(coord.get("lat", 0.0)),
+            float(coord.get("lon", 0.0)),
+        ))
+
+    # UTF-8 byte order matches code point order, so bytes sort like the normalized text
+    entries.sort()
+
+    strings_offset = HEADER.size + RECORD.size * len(entries)
+    records = bytearray()
+    strings = bytearray()
+    for key, display, lat, lon in entries:
+        records += RECORD.pack(len(strings), len(key), len(display), lat, lon)
+        strings += key + display
+
+    tmp_path = index_path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, len(entries), strings_offset))
+        f.write(records)
+        f.write(strings)
+    os.replace(tmp_path, index_path)
+
+    return len(entries)
+
+
+class OfflineGeocoder:
+
+    '''
+    Read-only, memory-mapped view of an index written by build_index.
+
+    Nothing is parsed up front: opening costs one mmap call, and every lookup
+    binary-searches the sorted records directly in the mapped file.
+    '''
+
+    def __init__(self, index_path=INDEX_PATH):
+        self.path = index_path
+        self._file = open(index_path, "rb")
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, self.count, self._strings = HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(f"{index_path} is not a city index")
+
+    @classmethod
+    def open_if_exists(cls, index_path=INDEX_PATH):
+
+        '''
+        Return an OfflineGeocoder for index_path, or None if the file is missing or invalid.
+        '''
+
+        if not index_path or not os.path.exists(index_path):
+            return None
+        try:
+            return cls(index_path)
+        except (OSError, ValueError, struct.error):
+            return None
+
+    def close(self):
+
+        '''
+        Unmap the index and close its file.
+        '''
+
+        self._mm.close()
+        self._file.close()
+
+    def __len__(self):
+        return self.count
+
+    def _record(self, i):
+
+        '''
+        Return (key offset, key length, display length, lat, lon) for record i.
+        '''
+
+        return RECORD.unpack_from(self._mm, HEADER.size + i * RECORD.size)
+
+    def _key(self, i):
+
+        '''
+        Return the normalized key bytes of record i.
+        '''
+
+        off, key_len, _, _, _ = self._record(i)
+        start = self._strings + off
+        return self._mm[start:start + key_len]
+
+    def _option(self, i):
+
+        '''
+        Return record i as a { 'display', 'lat', 'lon' } dict.
+        '''
+
+        off, key_len, disp_len, lat, lon = self._record(i)
+        start = self._strings + off + key_len
+        return {
+            "display": self._mm[start:start + disp_len].decode("utf-8"),
+            "lat": round(lat, 4),
+            "lon": round(lon, 4),
+        }
+
+    def _lower_bound(self, prefix, lo=0, hi=None):
+
+        '''
+        Return the first index in [lo, hi) whose key is >= prefix.
+        '''
+
+        hi = self.count if hi is None else hi
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._key(mid) < prefix:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def _prefix_range(self, prefix, lo=0, hi=None):
+
+        '''
+        Return the (start, end) index range of keys starting with prefix.
+        '''
+
+        start = self._lower_bound(prefix, lo, hi)
+        end = self._lower_bound(prefix + b"\xff", start, hi)
+        return start, end
+
+    def _next_bytes(self, prefix, lo, hi):
+
+        '''
+        Return (byte, start, end) for each distinct byte that follows prefix among keys in [lo, hi),
+        where [start, end) is the range of keys starting with prefix + byte.
+        '''
+
+        depth = len(prefix)
+        children = []
+        while lo < hi:
+            key = self._key(lo)
+            if len(key) <= depth:
+                lo += 1
+                continue
+            child = key[depth:depth + 1]
+            end = self._lower_bound(prefix + child + b"\xff", lo, hi)
+            children.append((child, lo, end))
+            lo = end
+        return children
+
+    def prefix_search(self, query, limit=5):
+
+        '''
+        Return up to limit cities whose normalized name starts with query (exact names first).
+        '''
+
+        prefix = normalize(query).encode("utf-8")
+        if not prefix:
+            return []
+        start, end = self._prefix_range(prefix)
+        return [self._option(i) for i in range(start, min(end, start + limit))]
+
+    def fuzzy_search(self, query, limit=5):
+
+        '''
+        Return up to limit cities whose name starts with a one-edit variant of query.
+
+        Variants (deletion, substitution, insertion, adjacent transposition) are
+        generated only from byte values that actually occur at that position in
+        the index, so the search walks the sorted keys like a trie.
+        '''
+
+        q = normalize(query).encode("utf-8")
+        if not q:
+            return []
+
+        # Each variant is searched only inside the key range of the head it extends
+        variants = []
+        lo, hi = 0, self.count
+        for i in range(len(q) + 1):
+            head = q[:i]
+            if i:
+                lo, hi = self._prefix_range(head, lo, hi)
+            if lo == hi:
+                break
+
+            # Deletion and adjacent transposition at position i
+            if i < len(q):
+                variants.append((head + q[i + 1:], lo, hi))
+            if i < len(q) - 1:
+                variants.append((head + q[i + 1:i + 2] + q[i:i + 1] + q[i + 2:], lo, hi))
+
+            # Substitution and insertion using bytes that exist after this head
+            for child, child_lo, child_hi in self._next_bytes(head, lo, hi):
+                if i < len(q) and child != q[i:i + 1]:
+                    variants.append((head + child + q[i + 1:], child_lo, child_hi))
+                variants.append((head + child + q[i:], child_lo, child_hi))
+
+        # Collect up to limit matches per variant
+        results = set()
+        for variant, v_lo, v_hi in variants:
+            if not variant or variant == q:
+                continue
+            start, end = self._prefix_range(variant, v_lo, v_hi)
+            results.update(range(start, min(end, start + limit)))
+
+        # Closest (shortest) names first, then alphabetical
+        ranked = sorted(results, key=lambda i: (len(self._key(i)), self._key(i)))
+        return [self._option(i) for i in ranked[:limit]]
+
+    def search(self, query, limit=5):
+
+        '''
+        Return prefix matches for query, or one-typo fuzzy matches if there are none.
+        '''
+
+        return self.prefix_search(query, limit) or self.fuzzy_search(query, limit)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) not in (2, 3):
+        print("Usage: python offline_geocoder.py city.list.json [index_path]")
+        sys.exit(1)
+
+    target = sys.argv[2] if len(sys.argv) == 3 else INDEX_PATH
+    written = build_index(sys.argv[1], target)
+    print(f"Indexed {written} cities into {target} ({os.path.getsize(target) / 1e6:.1f} MB)")
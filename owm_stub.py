@@ -0,0 +1,510 @@
+"""
+owm_stub.py
+
+Local stand-in for the OpenWeatherMap API, for offline development, benchmarks and load tests.
+
+Serves the endpoints api.py uses, from synthetic or recorded payloads:
+- /geo/1.0/direct: City search (synthetic cities named after the query).
+- /data/2.5/weather: Current weather for lat/lon.
+- /data/2.5/forecast: 5-day / 3-hour forecast for lat/lon.
+- /stats: Counters for requests served, injected faults and replay hits (stub only).
+
+Synthetic payloads are deterministic per query/coordinate. Faults can be injected:
+- latency: a base distribution plus an optional slow tail (see parse_latency).
+- error_rate: fraction of requests answered with a random 500/502/503.
+- rate_limit: calls per minute before answering 429 with Retry-After, like the free tier.
+- forecast_entries / pad_bytes: payload size.
+
+Record mode proxies every request to the real API (appid included) and saves each
+200 response; replay mode serves those recordings, keyed by path and query without
+the appid, and falls back to synthetic payloads for anything not recorded.
+
+Point the app or a benchmark at it with WEATHER_API_BASE=http://127.0.0.1:8765
+
+Usage:
+    python owm_stub.py [--port 8765] [--latency normal:0.15,0.03] [--tail-rate 0.05 --tail-latency uniform:2,4]
+                       [--error-rate 0.01] [--rate-limit 60] [--forecast-entries 40] [--pad-bytes 0]
+                       [--replay recordings.json | --record recordings.json [--upstream URL]]
+"""
+
+import os                             # For replacing the recordings file atomically
+import json                           # For payloads and recordings
+import math                           # For synthetic daily temperature cycles
+import time                           # For latency injection and throttling windows
+import random                         # For latency, faults and synthetic values
+import zlib                           # For stable per-query seeds
+import logging                        # For reporting record/replay problems
+import argparse                       # For the command-line interface
+import threading                      # For serving in the background and guarding shared state
+import urllib.error                   # For relaying upstream error statuses in record mode
+import urllib.request                 # For proxying to the real API in record mode
+from urllib.parse import urlsplit, parse_qsl, urlencode    # For request keys and upstream URLs
+from datetime import datetime, timezone    # For forecast timestamps
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+DEFAULT_PORT = 8765
+DEFAULT_UPSTREAM = "https://api.openweathermap.org"
+
+ENDPOINTS = ("/geo/1.0/direct", "/data/2.5/weather", "/data/2.5/forecast")
+
+# Vocabulary for synthetic payloads
+CONDITIONS = [(800, "clear sky"), (801, "few clouds"), (802, "scattered clouds"), (803, "broken clouds"),
+              (804, "overcast clouds"), (500, "light rain"), (501, "moderate rain"), (211, "thunderstorm"),
+              (601, "snow"), (701, "mist")]
+COUNTRIES = ["GB", "US", "DE", "FR", "IN", "BR", "JP", "AU", "CA", "ZA"]
+STATES = ["", "England", "Texas", "Bavaria", "Ontario", "Queensland"]
+
+
+def parse_latency(spec):
+
+    '''
+    Parse a latency spec into a function rng -> seconds.
+
+    Accepted forms (seconds):
+        "0.15" or "fixed:0.15"     Always the same delay
+        "uniform:0.1,0.3"          Uniform between two bounds
+        "normal:0.15,0.03"         Gaussian with mean and standard deviation (clamped at 0)
+        "lognormal:0.15,0.5"       Log-normal with median and sigma (long right tail)
+    '''
+
+    kind, _, args = spec.partition(":")
+    if not args:
+        kind, args = "fixed", kind
+    values = [float(v) for v in args.split(",")]
+
+    if kind == "fixed" and len(values) == 1:
+        return lambda rng: values[0]
+    if kind == "uniform" and len(values) == 2:
+        return lambda rng: rng.uniform(values[0], values[1])
+    if kind == "normal" and len(values) == 2:
+        return lambda rng: max(0.0, rng.gauss(values[0], values[1]))
+    if kind == "lognormal" and len(values) == 2:
+        return lambda rng: rng.lognormvariate(math.log(values[0]), values[1])
+    raise ValueError(f"Invalid latency spec: {spec!r}")
+
+
+def request_key(path, params):
+
+    '''
+    Return the recording key for a request: path plus sorted query, without the API key.
+    '''
+
+    query = sorted((k, v) for k, v in params.items() if k != "appid")
+    return f"{path}?{urlencode(query)}"
+
+
+def _seeded_rng(*parts):
+
+    '''
+    Return a Random seeded from parts, so the same query always yields the same payload.
+    '''
+
+    return random.Random(zlib.crc32(repr(parts).encode("utf-8")))
+
+
+def synthetic_cities(query, limit=5):
+
+    '''
+    Return a Geocoding API style list of up to limit cities named after query.
+    '''
+
+    name = query.split(",")[0].strip().title()
+    if not name:
+        return []
+
+    rng = _seeded_rng("geo", name.casefold())
+    cities = []
+    for i in range(min(limit, 5)):
+        city = {
+            "name": name,
+            "lat": round(rng.uniform(-60, 70), 4),
+            "lon": round(rng.uniform(-180, 180), 4),
+            "country": COUNTRIES[(i + rng.randrange(len(COUNTRIES))) % len(COUNTRIES)],
+        }
+        state = rng.choice(STATES)
+        if state:
+            city["state"] = state
+        cities.append(city)
+    return cities
+
+
+def _conditions(rng, lat, hour):
+
+    '''
+    Return the shared "main"/"weather"/"wind" parts of a synthetic reading.
+    '''
+
+    # Warmer near the equator and in the afternoon
+    base = 28 - abs(lat) * 0.45
+    temp = round(base + 6 * math.sin((hour - 9) / 24 * 2 * math.pi) + rng.uniform(-2, 2), 2)
+    humidity = rng.randint(30, 95)
+    condition_id, description = rng.choice(CONDITIONS)
+    return {
+        "main": {
+            "temp": temp,
+            "feels_like": round(temp - rng.uniform(0, 3), 2),
+            "temp_min": round(temp - rng.uniform(0, 2), 2),
+            "temp_max": round(temp + rng.uniform(0, 2), 2),
+            "pressure": rng.randint(990, 1035),
+            "sea_level": rng.randint(1000, 1035),
+            "grnd_level": rng.randint(950, 1020),
+            "humidity": humidity,
+        },
+        "weather": [{"id": condition_id, "main": "Weather", "description": description, "icon": "01d"}],
+        "wind": {
+            "speed": round(rng.uniform(0, 12), 2),
+            "deg": rng.randrange(360),
+            "gust": round(rng.uniform(0, 18), 2),
+        },
+        "visibility": rng.choice([10000, 10000, 8000, 5000, 2000]),
+    }
+
+
+def synthetic_weather(lat, lon, now=None):
+
+    '''
+    Return a Current Weather API style payload for lat/lon (stable within each 10-minute slot).
+    '''
+
+    now = int(time.time() if now is None else now)
+    rng = _seeded_rng("weather", round(lat, 3), round(lon, 3), now // 600)
+    tz_offset = int(round(lon / 15)) * 3600
+    local_midnight = now - (now + tz_offset) % 86400
+    hour = (now + tz_offset) % 86400 // 3600
+
+    payload = _conditions(rng, lat, hour)
+    payload.update({
+        "coord": {"lat": lat, "lon": lon},
+        "dt": now,
+        "timezone": tz_offset,
+        "name": "Stubville",
+        "cod": 200,
+        "sys": {
+            "country": "XX",
+            "sunrise": local_midnight + 6 * 3600 + rng.randrange(3600),
+            "sunset": local_midnight + 18 * 3600 + rng.randrange(3600),
+        },
+    })
+    return payload
+
+
+def synthetic_forecast(lat, lon, now=None, entries=40):
+
+    '''
+    Return a 5 day / 3 hour Forecast API style payload with the given number of entries.
+    '''
+
+    now = int(time.time() if now is None else now)
+    rng = _seeded_rng("forecast", round(lat, 3), round(lon, 3), now // 10800)
+    first = now - now % 10800 + 10800
+
+    items = []
+    for i in range(entries):
+        dt = first + i * 10800
+        stamp = datetime.fromtimestamp(dt, tz=timezone.utc)
+        item = _conditions(rng, lat, stamp.hour)
+        item.update({"dt": dt, "dt_txt": stamp.strftime("%Y-%m-%d %H:%M:%S"), "pop": round(rng.random(), 2)})
+        items.append(item)
+
+    return {
+        "cod": "200",
+        "message": 0,
+        "cnt": entries,
+        "list": items,
+        "city": {"name": "Stubville", "coord": {"lat": lat, "lon": lon}, "timezone": int(round(lon / 15)) * 3600},
+    }
+
+
+class StubConfig:
+
+    '''
+    Behaviour and shared state of a stub server: fault injection, payload size and recordings.
+    '''
+
+    def __init__(self, latency="0", tail_rate=0.0, tail_latency="uniform:2,4", error_rate=0.0,
+                 rate_limit=None, forecast_entries=40, pad_bytes=0, replay=None, record=None,
+                 upstream=DEFAULT_UPSTREAM, seed=None):
+        self.latency = parse_latency(latency)
+        self.tail_rate = tail_rate
+        self.tail_latency = parse_latency(tail_latency)
+        self.error_rate = error_rate
+        self.rate_limit = rate_limit
+        self.forecast_entries = forecast_entries
+        self.pad_bytes = pad_bytes
+        self.record_path = record
+        self.upstream = upstream.rstrip("/")
+
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._window_start = time.monotonic()
+        self._window_calls = 0
+
+        # Recorded responses: request key -> payload
+        self.recordings = {}
+        for path in (replay, record):
+            if path and os.path.exists(path):
+                with open(path, "r") as f:
+                    self.recordings.update(json.load(f))
+        self.replaying = bool(replay)
+
+        # Counters served at /stats
+        self.counters = {"requests": 0, "ok": 0, "errors": 0, "throttled": 0,
+                         "replayed": 0, "synthetic": 0, "recorded": 0}
+
+    def count(self, name):
+        with self._lock:
+            self.counters[name] += 1
+
+    def draw_latency(self):
+
+        '''
+        Return the delay (seconds) to inject before the next response.
+        '''
+
+        with self._lock:
+            if self.tail_rate and self._rng.random() < self.tail_rate:
+                return self.tail_latency(self._rng)
+            return self.latency(self._rng)
+
+    def draw_error(self):
+
+        '''
+        Return an injected 5xx status for this request, or None.
+        '''
+
+        with self._lock:
+            if self.error_rate and self._rng.random() < self.error_rate:
+                return self._rng.choice([500, 502, 503])
+            return None
+
+    def throttle(self):
+
+        '''
+        Count a call against the per-minute quota; return seconds until the window resets if over it.
+        '''
+
+        if not self.rate_limit:
+            return None
+        with self._lock:
+            now = time.monotonic()
+            if now - self._window_start >= 60:
+                self._window_start, self._window_calls = now, 0
+            self._window_calls += 1
+            if self._window_calls > self.rate_limit:
+                return max(1, int(60 - (now - self._window_start)))
+            return None
+
+    def save_recording(self, key, payload):
+
+        '''
+        Store a recorded payload and rewrite the recordings file (atomically via a temp file).
+        '''
+
+        with self._lock:
+            self.recordings[key] = payload
+            snapshot = dict(self.recordings)
+
+        tmp_path = self.record_path + ".tmp"
+        try:
+            with open(tmp_path, "w") as f:
+                json.dump(snapshot, f)
+            os.replace(tmp_path, self.record_path)
+        except OSError as e:
+            logging.warning("Could not save recordings to %s: %s", self.record_path, e)
+
+
+class StubHandler(BaseHTTPRequestHandler):
+
+    '''
+    Answers GET requests for the OpenWeatherMap endpoints using the server's StubConfig.
+    '''
+
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def log_message(self, fmt, *args):
+        logging.debug("owm_stub: " + fmt, *args)
+
+    def _send_json(self, status, payload, headers=None):
+        body = payload if isinstance(payload, bytes) else json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        try:
+            self.wfile.write(body)
+        except OSError:
+            # Client gave up (timeout or a hedged duplicate answered first)
+            pass
+
+    def do_HEAD(self):
+        # Connection warm-up (api.warm_up_connections) only needs a quick answer
+        self.send_response(200)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def do_GET(self):
+        config = self.server.config
+        parts = urlsplit(self.path)
+        params = dict(parse_qsl(parts.query))
+
+        if parts.path == "/stats":
+            with config._lock:
+                self._send_json(200, dict(config.counters))
+            return
+        if parts.path not in ENDPOINTS:
+            self._send_json(404, {"cod": "404", "message": "Not found"})
+            return
+
+        config.count("requests")
+        time.sleep(config.draw_latency())
+
+        retry_after = config.throttle()
+        if retry_after is not None:
+            config.count("throttled")
+            self._send_json(429, {"cod": 429, "message": "Your account is temporary blocked due to exceeding "
+                                  "of requests limitation of your subscription type."},
+                            {"Retry-After": str(retry_after)})
+            return
+
+        status = config.draw_error()
+        if status is not None:
+            config.count("errors")
+            self._send_json(status, {"cod": status, "message": "Internal error"})
+            return
+
+        if config.record_path:
+            self._proxy(config, parts.path, params)
+            return
+
+        key = request_key(parts.path, params)
+        if config.replaying and key in config.recordings:
+            config.count("replayed")
+            payload = config.recordings[key]
+        else:
+            try:
+                payload = self._synthesize(config, parts.path, params)
+            except (KeyError, ValueError):
+                self._send_json(400, {"cod": "400", "message": "wrong or missing query parameters"})
+                return
+            config.count("synthetic")
+
+        if config.pad_bytes:
+            payload = _padded(payload, config.pad_bytes)
+        config.count("ok")
+        self._send_json(200, payload)
+
+    def _synthesize(self, config, path, params):
+
+        '''
+        Return a synthetic payload for a known endpoint (KeyError/ValueError on bad parameters).
+        '''
+
+        if path == "/geo/1.0/direct":
+            return synthetic_cities(params["q"], int(params.get("limit", 5)))
+        lat, lon = float(params["lat"]), float(params["lon"])
+        if path == "/data/2.5/weather":
+            return synthetic_weather(lat, lon)
+        return synthetic_forecast(lat, lon, entries=config.forecast_entries)
+
+    def _proxy(self, config, path, params):
+
+        '''
+        Forward the request to the real API, relay its answer, and record it if successful.
+        '''
+
+        url = f"{config.upstream}{path}?{urlencode(params)}"
+        try:
+            with urllib.request.urlopen(url, timeout=10) as response:
+                status, body = response.status, response.read()
+        except urllib.error.HTTPError as e:
+            status, body = e.code, e.read()
+        except (urllib.error.URLError, OSError) as e:
+            self._send_json(502, {"cod": 502, "message": f"Upstream unreachable: {e}"})
+            return
+
+        if status == 200:
+            config.save_recording(request_key(path, params), json.loads(body))
+            config.count("recorded")
+        self._send_json(status, body)
+
+
+def _padded(payload, pad_bytes):
+
+    '''
+    Return payload grown by about pad_bytes, in a field the dashboard ignores.
+    '''
+
+    if isinstance(payload, dict):
+        return dict(payload, _padding="x" * pad_bytes)
+    if payload:
+        return [dict(payload[0], _padding="x" * pad_bytes)] + payload[1:]
+    return payload
+
+
+class StubServer(ThreadingHTTPServer):
+
+    '''
+    Threaded HTTP server answering with StubHandler; the base URL is in self.base_url.
+    '''
+
+    daemon_threads = True
+
+    def __init__(self, config, host="127.0.0.1", port=DEFAULT_PORT):
+        super().__init__((host, port), StubHandler)
+        self.config = config
+        self.base_url = f"http://{host}:{self.server_port}"
+
+
+def start_stub(port=0, **options):
+
+    '''
+    Start a stub server on a background thread and return it.
+    Keyword options are passed to StubConfig; port 0 picks a free port.
+    Call server.shutdown() to stop it.
+    '''
+
+    server = StubServer(StubConfig(**options), port=port)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local stand-in for the OpenWeatherMap API.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--latency", default="0", help="base latency spec, e.g. normal:0.15,0.03")
+    parser.add_argument("--tail-rate", type=float, default=0.0, help="fraction of requests using --tail-latency")
+    parser.add_argument("--tail-latency", default="uniform:2,4", help="latency spec for the slow tail")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests answered with 5xx")
+    parser.add_argument("--rate-limit", type=int, default=None, help="calls per minute before answering 429")
+    parser.add_argument("--forecast-entries", type=int, default=40, help="3-hour entries per forecast")
+    parser.add_argument("--pad-bytes", type=int, default=0, help="extra bytes added to every payload")
+    parser.add_argument("--seed", type=int, default=None, help="seed for latency and fault injection")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--replay", help="serve responses recorded in this file")
+    mode.add_argument("--record", help="proxy to --upstream and record responses into this file")
+    parser.add_argument("--upstream", default=DEFAULT_UPSTREAM, help="real API base URL for --record")
+    args = parser.parse_args()
+
+    config = StubConfig(
+        latency=args.latency, tail_rate=args.tail_rate, tail_latency=args.tail_latency,
+        error_rate=args.error_rate, rate_limit=args.rate_limit,
+        forecast_entries=args.forecast_entries, pad_bytes=args.pad_bytes,
+        replay=args.replay, record=args.record, upstream=args.upstream, seed=args.seed
+    )
+    server = StubServer(config, host=args.host, port=args.port)
+    print(f"OpenWeatherMap stub listening on {server.base_url} (set WEATHER_API_BASE={server.base_url})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,556 @@
+"""
+resilience.py
+
+Concurrency helpers that protect the OpenWeatherMap API layer.
+
+Provides:
+- SingleFlight: Coalesce concurrent identical calls so they share one execution and its result or error.
+- RateLimiter: Token-bucket call budget with priority lanes (interactive > background > prefetch).
+- CircuitBreaker: Fail fast after repeated failures, then probe recovery with a single request.
+- LatencyTracker: Rolling per-endpoint latency window that derives adaptive timeouts and hedge delays.
+"""
+
+import asyncio                        # Non-blocking token waits for asyncio callers
+import threading                      # Locks and events for coordinating worker threads
+import time                           # Monotonic clock for token refills and wait metrics
+import collections                    # Per-lane FIFO queues of waiting callers
+
+
+# Priority lanes for RateLimiter, most urgent first
+PRIORITY_INTERACTIVE = 0     # User is waiting: searches, suggestions, "Get Weather"
+PRIORITY_BACKGROUND = 1      # Auto-refresh and batch fetches
+PRIORITY_PREFETCH = 2        # Speculative work, only worth doing with spare quota
+
+LANE_NAMES = {
+    PRIORITY_INTERACTIVE: "interactive",
+    PRIORITY_BACKGROUND: "background",
+    PRIORITY_PREFETCH: "prefetch",
+}
+
+# CircuitBreaker states
+CLOSED = "closed"            # Healthy: requests flow normally
+OPEN = "open"                # Failing: requests are rejected without touching the network
+HALF_OPEN = "half_open"      # Cooling period over: one probe request decides the next state
+
+
+class _Call:
+
+    '''
+    One in-flight execution shared by every caller that asked for the same key.
+    '''
+
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+
+    '''
+    Run at most one call per key at a time.
+
+    The first caller for a key (the leader) runs the function; callers arriving
+    while it is still running wait for it and receive the same result, or have
+    the same exception raised. Once the call finishes the key is forgotten, so
+    the next caller starts a fresh execution.
+    '''
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+
+        # Counters: executions actually run, and callers that piggybacked on one
+        self.executed = 0
+        self.shared = 0
+
+    def do(self, key, fn):
+
+        '''
+        Return fn(), sharing one execution among concurrent callers with the same key.
+
+        Args:
+            key (hashable): Identity of the request (e.g. URL plus sorted params).
+            fn (callable): Zero-argument function performing the request.
+        '''
+
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.executed += 1
+            else:
+                self.shared += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def in_flight(self):
+
+        '''
+        Return the number of keys currently being executed.
+        '''
+
+        with self._lock:
+            return len(self._calls)
+
+    def stats(self):
+
+        '''
+        Return a dict with executed/shared counters and current in-flight keys.
+        '''
+
+        with self._lock:
+            return {
+                "executed": self.executed,
+                "shared": self.shared,
+                "in_flight": len(self._calls),
+            }
+
+
+class RateLimiter:
+
+    '''
+    Thread-safe token bucket shared by every API call.
+
+    Tokens refill continuously at rate_per_minute up to burst. Callers queue in
+    their priority lane; a token always goes to the oldest caller of the most
+    urgent non-empty lane, so interactive calls overtake queued background ones.
+    Each lane has a maximum wait: a caller that cannot get a token in time is
+    dropped (acquire returns False) instead of spending quota late. By default
+    interactive calls wait as long as needed, background calls up to 10 s, and
+    prefetch calls only run if a token is free right now.
+    '''
+
+    def __init__(self, rate_per_minute=60, burst=10, max_waits=None):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = float(burst)
+        self.max_waits = {
+            PRIORITY_INTERACTIVE: None,
+            PRIORITY_BACKGROUND: 10.0,
+            PRIORITY_PREFETCH: 0.0,
+        }
+        self.max_waits.update(max_waits or {})
+
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._cond = threading.Condition()
+        self._queues = {lane: collections.deque() for lane in LANE_NAMES}
+
+        # Per-lane counters reported by stats()
+        self._metrics = {
+            lane: {"granted": 0, "dropped": 0, "total_wait": 0.0, "max_wait": 0.0}
+            for lane in LANE_NAMES
+        }
+
+        # Seconds each thread has spent in acquire, reported by thread_wait()
+        self._local = threading.local()
+
+    def _refill(self):
+
+        '''
+        Add the tokens accrued since the last refill (caller holds the lock).
+        '''
+
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def _is_next(self, priority, ticket):
+
+        '''
+        Return True if ticket heads the most urgent non-empty lane (caller holds the lock).
+        '''
+
+        for lane in sorted(self._queues):
+            queue = self._queues[lane]
+            if queue:
+                return lane == priority and queue[0] is ticket
+        return False
+
+    def _record(self, priority, waited, granted):
+
+        '''
+        Update the lane's wait-time and grant/drop counters (caller holds the lock).
+        '''
+
+        metrics = self._metrics[priority]
+        metrics["granted" if granted else "dropped"] += 1
+        metrics["total_wait"] += waited
+        metrics["max_wait"] = max(metrics["max_wait"], waited)
+
+    def acquire(self, priority=PRIORITY_INTERACTIVE):
+
+        '''
+        Block until a token is granted to this caller, or its lane's maximum wait runs out.
+
+        Returns:
+            bool: True if a token was consumed, False if the call should be dropped.
+        '''
+
+        max_wait = self.max_waits.get(priority)
+        start = time.monotonic()
+        deadline = None if max_wait is None else start + max_wait
+        ticket = object()
+
+        with self._cond:
+            queue = self._queues[priority]
+            queue.append(ticket)
+            try:
+                while True:
+                    self._refill()
+                    now = time.monotonic()
+
+                    if self._is_next(priority, ticket) and self._tokens >= 1:
+                        self._tokens -= 1
+                        self._record(priority, now - start, granted=True)
+                        return True
+
+                    if deadline is not None and now >= deadline:
+                        self._record(priority, now - start, granted=False)
+                        return False
+
+                    # Sleep until the next token accrues (or until woken when it is our turn)
+                    wait = (1 - self._tokens) / self.rate if self._tokens < 1 else 0.05
+                    if deadline is not None:
+                        wait = min(wait, deadline - now)
+                    self._cond.wait(max(wait, 0.001))
+            finally:
+                queue.remove(ticket)
+                self._cond.notify_all()
+                self._local.waited = self.thread_wait() + time.monotonic() - start
+
+    def thread_wait(self):
+
+        '''
+        Return the total seconds the calling thread has spent waiting in acquire.
+
+        Callers timing their own work subtract the change in this value to leave quota waits out.
+        '''
+
+        return getattr(self._local, "waited", 0.0)
+
+    async def acquire_async(self, priority=PRIORITY_INTERACTIVE):
+
+        '''
+        asyncio version of acquire(): wait for a token without blocking the event loop.
+
+        The token is taken only at the moment it is granted, so a caller that
+        is cancelled or times out while waiting uses no quota. Async callers
+        poll instead of queueing: a token goes to them only while no thread
+        of the same or a more urgent lane is waiting for one.
+
+        Returns:
+            bool: True if a token was consumed, False if the call should be dropped.
+        '''
+
+        max_wait = self.max_waits.get(priority)
+        start = time.monotonic()
+        while True:
+            with self._cond:
+                self._refill()
+                now = time.monotonic()
+                waiting = any(self._queues[lane] for lane in self._queues if lane <= priority)
+
+                if not waiting and self._tokens >= 1:
+                    self._tokens -= 1
+                    self._record(priority, now - start, granted=True)
+                    return True
+
+                if max_wait is not None and now - start >= max_wait:
+                    self._record(priority, now - start, granted=False)
+                    return False
+
+                # Check again when the next token accrues (sooner if threads are ahead of us)
+                wait = (1 - self._tokens) / self.rate if self._tokens < 1 else 0.05
+                if max_wait is not None:
+                    wait = min(wait, start + max_wait - now)
+
+            await asyncio.sleep(max(wait, 0.001))
+
+    def stats(self):
+
+        '''
+        Return available tokens plus queue depth, grants, drops and wait times per lane.
+        '''
+
+        with self._cond:
+            self._refill()
+            lanes = {}
+            for lane, name in LANE_NAMES.items():
+                metrics = self._metrics[lane]
+                handled = metrics["granted"] + metrics["dropped"]
+                lanes[name] = {
+                    "queue_depth": len(self._queues[lane]),
+                    "granted": metrics["granted"],
+                    "dropped": metrics["dropped"],
+                    "avg_wait": metrics["total_wait"] / handled if handled else 0.0,
+                    "max_wait": metrics["max_wait"],
+                }
+            return {"tokens": round(self._tokens, 2), "lanes": lanes}
+
+
+class _Ticket:
+
+    '''
+    Permission to send one request, returned by CircuitBreaker.allow().
+    '''
+
+    __slots__ = ("probe",)
+
+    def __init__(self, probe):
+        self.probe = probe      # True for the single half-open probe
+
+
+# Ticket shared by every request let through while the circuit is closed
+_PASS = _Ticket(probe=False)
+
+
+class CircuitBreaker:
+
+    '''
+    Thread-safe circuit breaker for one endpoint.
+
+    After failure_threshold consecutive failures the circuit opens and allow()
+    returns False for reset_timeout seconds. The first caller after that becomes
+    the half-open probe: its success closes the circuit, its failure reopens it
+    for another reset_timeout. Other callers keep failing fast while the probe runs.
+    allow() hands out a ticket; only the probe's ticket can release the probe
+    slot through cancel(), so a call admitted earlier cannot free it.
+
+    on_state_change(name, old_state, new_state), if given, is called on every
+    transition (outside the lock) so metrics or logging can observe the breaker.
+    '''
+
+    def __init__(self, name, failure_threshold=3, reset_timeout=30.0, on_state_change=None):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.on_state_change = on_state_change
+
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe = None          # Ticket of the half-open probe in flight, if any
+
+        # Requests rejected while open, reported by snapshot()
+        self.rejected = 0
+
+    def allow(self):
+
+        '''
+        Return a ticket (truthy) if a request may go out now, or None to fail fast.
+
+        Pass the ticket to cancel() if the request ends without a verdict.
+        '''
+
+        with self._lock:
+            if self._state == CLOSED:
+                return _PASS
+
+            if self._state == OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+                transition = self._set_state(HALF_OPEN)
+            elif self._state == HALF_OPEN and self._probe is None:
+                transition = None
+            else:
+                self.rejected += 1
+                return None
+
+            # This caller is the single half-open probe
+            ticket = self._probe = _Ticket(probe=True)
+
+        self._notify(transition)
+        return ticket
+
+    def record_success(self):
+
+        '''
+        Record a healthy response: reset the failure count and close the circuit.
+        '''
+
+        with self._lock:
+            self._failures = 0
+            self._probe = None
+            transition = self._set_state(CLOSED)
+        self._notify(transition)
+
+    def record_failure(self):
+
+        '''
+        Record a failed request; open the circuit on threshold or on a failed probe.
+        '''
+
+        with self._lock:
+            self._failures += 1
+            transition = None
+            if self._state == HALF_OPEN or self._failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+                self._probe = None
+                transition = self._set_state(OPEN)
+        self._notify(transition)
+
+    def cancel(self, ticket):
+
+        '''
+        End a request without a verdict (e.g. dropped before sending); frees the probe slot if ticket holds it.
+        '''
+
+        with self._lock:
+            if ticket is not None and ticket is self._probe:
+                self._probe = None
+
+    def snapshot(self):
+
+        '''
+        Return a dict with state, consecutive failures, rejected count and seconds until the next probe.
+        '''
+
+        with self._lock:
+            retry_in = 0.0
+            if self._state == OPEN:
+                retry_in = max(0.0, self.reset_timeout - (time.monotonic() - self._opened_at))
+            return {
+                "state": self._state,
+                "failures": self._failures,
+                "rejected": self.rejected,
+                "retry_in": retry_in,
+            }
+
+    def _set_state(self, new_state):
+
+        '''
+        Change state and return (old, new) if it changed, else None (caller holds the lock).
+        '''
+
+        old_state = self._state
+        if old_state == new_state:
+            return None
+        self._state = new_state
+        return old_state, new_state
+
+    def _notify(self, transition):
+
+        '''
+        Call on_state_change for a transition returned by _set_state.
+        '''
+
+        if transition and self.on_state_change is not None:
+            self.on_state_change(self.name, *transition)
+
+
+class LatencyTracker:
+
+    '''
+    Thread-safe rolling window of recent request latencies for one endpoint.
+
+    Derives an adaptive timeout (multiplier x the observed p99, clamped to
+    [min_timeout, max_timeout]) and a hedge delay (the observed p95). Until
+    min_samples latencies have been recorded, the static max_timeout is used
+    and hedge_delay() returns None so no duplicate requests are sent.
+    '''
+
+    def __init__(self, name, window=200, min_samples=20, min_timeout=1.0, max_timeout=5.0, multiplier=3.0):
+        self.name = name
+        self.min_samples = min_samples
+        self.min_timeout = min_timeout
+        self.max_timeout = max_timeout
+        self.multiplier = multiplier
+
+        self._lock = threading.Lock()
+        self._samples = collections.deque(maxlen=window)
+
+        # Counters reported by snapshot()
+        self.timeouts = 0
+        self.hedged = 0
+        self.hedge_wins = 0
+
+    def record(self, seconds, timed_out=False):
+
+        '''
+        Add one observed latency; a timed-out request is recorded at the timeout it hit.
+        '''
+
+        with self._lock:
+            self._samples.append(seconds)
+            if timed_out:
+                self.timeouts += 1
+
+    def record_hedge(self, won):
+
+        '''
+        Count a hedged duplicate request, and whether it answered before the primary.
+        '''
+
+        with self._lock:
+            self.hedged += 1
+            if won:
+                self.hedge_wins += 1
+
+    def quantile(self, q):
+
+        '''
+        Return the q-quantile (0..1) of the window, or None while it holds fewer than min_samples.
+        '''
+
+        with self._lock:
+            if len(self._samples) < self.min_samples:
+                return None
+            ordered = sorted(self._samples)
+        return ordered[int(q * (len(ordered) - 1))]
+
+    def timeout(self):
+
+        '''
+        Return the per-attempt timeout (seconds) to use for the next request.
+        '''
+
+        p99 = self.quantile(0.99)
+        if p99 is None:
+            return self.max_timeout
+        return min(self.max_timeout, max(self.min_timeout, p99 * self.multiplier))
+
+    def hedge_delay(self):
+
+        '''
+        Return how long to wait for the primary request before hedging (the p95), or None.
+        '''
+
+        return self.quantile(0.95)
+
+    def snapshot(self):
+
+        '''
+        Return a dict with sample count, p50/p95/p99, current timeout and hedge counters.
+        '''
+
+        with self._lock:
+            count = len(self._samples)
+            timeouts, hedged, hedge_wins = self.timeouts, self.hedged, self.hedge_wins
+        return {
+            "samples": count,
+            "p50": self.quantile(0.50),
+            "p95": self.quantile(0.95),
+            "p99": self.quantile(0.99),
+            "timeout": self.timeout(),
+            "timeouts": timeouts,
+            "hedged": hedged,
+            "hedge_wins": hedge_wins,
+        }
@@ -2,8 +2,16 @@
 utils.py
 
 General utility functions for string manipulation and other helpers as needed.
+
+Includes the render-time formatters for WeatherReading / ForecastDay fields
+(format_wind, format_clock, format_visibility_km, format_value) and for
+stored epoch timestamps (format_timestamp); missing
+values render as "N/A".
 """
 
+from datetime import datetime, timezone    # For rendering epoch times in a city's local time
+
+
 def title_case(s):
 
     '''
@@ -15,4 +23,77 @@ def title_case(s):
     Finally rejoins the words with single spaces.
     '''
 
-    return ' '.join([w if w.isupper() else w.capitalize() for w in s.split()])
\ No newline at end of file
+    return ' '.join([w if w.isupper() else w.capitalize() for w in s.split()])
+
+
+def format_age(seconds):
+
+    '''
+    Describe how old a piece of data is, e.g. "just now", "12 min ago", "3 h ago".
+
+    Used to label stale weather and forecast data while fresh data is fetched.
+    '''
+
+    if seconds < 60:
+        return "just now"
+    if seconds < 3600:
+        return f"{int(seconds // 60)} min ago"
+    if seconds < 86400:
+        return f"{int(seconds // 3600)} h ago"
+    return f"{int(seconds // 86400)} d ago"
+
+
+def format_value(value, suffix=""):
+
+    '''
+    Render an optional value with a unit suffix, e.g. 1013 -> "1013 hPa", None -> "N/A".
+    '''
+
+    if value is None:
+        return "N/A"
+    return f"{value}{suffix}"
+
+
+def format_wind(speed, deg):
+
+    '''
+    Render wind speed (m/s) and direction (degrees) as e.g. "5.10 m/s, 270°".
+    '''
+
+    if speed is None:
+        return "N/A"
+    deg_str = f"{deg:.0f}°" if deg is not None else "N/A"
+    return f"{speed:.2f} m/s, {deg_str}"
+
+
+def format_clock(epoch, tz_offset=0):
+
+    '''
+    Render a UTC epoch time as "HH:MM" in the local time of a place tz_offset seconds east of UTC.
+    '''
+
+    if epoch is None:
+        return "N/A"
+    return datetime.fromtimestamp(epoch + tz_offset, tz=timezone.utc).strftime("%H:%M")
+
+
+def format_timestamp(epoch):
+
+    '''
+    Render a stored UTC epoch timestamp as "YYYY-MM-DD HH:MM:SS" in the machine's local time.
+    '''
+
+    if epoch is None:
+        return "N/A"
+    return datetime.fromtimestamp(epoch).strftime("%Y-%m-%d %H:%M:%S")
+
+
+def format_visibility_km(metres):
+
+    '''
+    Render a visibility in metres as kilometres with one decimal, e.g. 10000 -> "10.0".
+    '''
+
+    if metres is None:
+        return "N/A"
+    return f"{metres / 1000:.1f}"